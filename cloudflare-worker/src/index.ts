@@ -3,8 +3,15 @@ interface Env {
   EXTENSION_OBJECT_KEY?: string;
   CONFIG_OBJECT_KEY?: string;
   FALLBACK_CONFIG_JSON?: string;
+  ASSET_PREFIX?: string;
+  DECK_PREFIX?: string;
 }
 
+const ASSET_ROUTE = "/assets/";
+const DECK_ROUTE = "/decks/";
+const DECK_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation";
+const CONFIG_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=3600";
+
 function json(data: unknown, status = 200, cacheControl = "public, max-age=60") {
   return new Response(JSON.stringify(data), {
     status,
@@ -20,6 +27,30 @@ function notFound(message: string) {
   return json({ error: message }, 404, "no-store");
 }
 
+function matchesEtag(request: Request, etag: string) {
+  const header = request.headers.get("If-None-Match");
+  if (!header) {
+    return false;
+  }
+  return header.split(",").some((tag) => {
+    const value = tag.trim();
+    return value === "*" || value === etag || value === `W/${etag}`;
+  });
+}
+
+function notModified(etag: string, cacheControl: string) {
+  return new Response(null, {
+    status: 304,
+    headers: { ETag: etag, "Cache-Control": cacheControl },
+  });
+}
+
+async function bodyEtag(body: string) {
+  const digest = await crypto.subtle.digest("SHA-256", new TextEncoder().encode(body));
+  const hex = [...new Uint8Array(digest)].map((b) => b.toString(16).padStart(2, "0")).join("");
+  return `"${hex.slice(0, 32)}"`;
+}
+
 async function readConfigFromR2(env: Env) {
   const key = env.CONFIG_OBJECT_KEY || "config/config.json";
   const object = await env.ASSETS_BUCKET.get(key);
@@ -35,6 +66,79 @@ async function readConfigFromR2(env: Env) {
   return JSON.parse(body);
 }
 
+async function handleConfig(request: Request, env: Env): Promise<Response> {
+  const config = await readConfigFromR2(env);
+  const body = JSON.stringify(config);
+  const etag = await bodyEtag(body);
+
+  if (matchesEtag(request, etag)) {
+    return notModified(etag, CONFIG_CACHE_CONTROL);
+  }
+
+  const response = json(config, 200, CONFIG_CACHE_CONTROL);
+  response.headers.set("ETag", etag);
+  return response;
+}
+
+async function handleAsset(request: Request, env: Env, key: string): Promise<Response> {
+  // Only objects under the branding prefix are readable; no path tricks
+  const prefix = env.ASSET_PREFIX || "branding/";
+  if (!key.startsWith(prefix) || key.includes("..")) {
+    return notFound("Asset not found");
+  }
+
+  const object = await env.ASSETS_BUCKET.get(key, { onlyIf: request.headers });
+  if (!object) {
+    return notFound("Asset not found");
+  }
+
+  const cacheControl = "public, max-age=3600, stale-while-revalidate=86400";
+  // Without a body the If-None-Match precondition matched
+  if (!("body" in object)) {
+    return notModified(object.httpEtag, cacheControl);
+  }
+
+  const headers = new Headers();
+  object.writeHttpMetadata(headers);
+  headers.set("ETag", object.httpEtag);
+  headers.set("Cache-Control", cacheControl);
+  headers.set("X-Content-Type-Options", "nosniff");
+
+  return new Response(object.body, { headers });
+}
+
+async function handleDeck(request: Request, env: Env, name: string): Promise<Response> {
+  // Published decks (deckgen.publish) live under the deck prefix, possibly
+  // nested (decks/reports/2026-W41/u1.pptx); no empty, "." or ".." segments
+  const segments = name.split("/");
+  if (segments.some((segment) => !segment || segment === "." || segment === "..")) {
+    return notFound("Deck not found");
+  }
+  const key = (env.DECK_PREFIX || "decks/") + name;
+  const filename = segments[segments.length - 1];
+
+  const object = await env.ASSETS_BUCKET.get(key, { onlyIf: request.headers });
+  if (!object) {
+    return notFound("Deck not found");
+  }
+
+  // Decks are republished under the same name, so always revalidate
+  const cacheControl = "public, no-cache";
+  if (!("body" in object)) {
+    return notModified(object.httpEtag, cacheControl);
+  }
+
+  const headers = new Headers();
+  object.writeHttpMetadata(headers);
+  headers.set("Content-Type", headers.get("Content-Type") || DECK_CONTENT_TYPE);
+  headers.set("Content-Disposition", `attachment; filename="${filename.replace(/"/g, "")}"`);
+  headers.set("ETag", object.httpEtag);
+  headers.set("Cache-Control", cacheControl);
+  headers.set("X-Content-Type-Options", "nosniff");
+
+  return new Response(object.body, { headers });
+}
+
 async function handleDownload(env: Env): Promise<Response> {
   const key = env.EXTENSION_OBJECT_KEY || "extension.zip";
   const object = await env.ASSETS_BUCKET.get(key);
@@ -65,10 +169,29 @@ export default {
       return handleDownload(env);
     }
 
+    if (url.pathname.startsWith(ASSET_ROUTE)) {
+      let key: string;
+      try {
+        key = decodeURIComponent(url.pathname.slice(ASSET_ROUTE.length));
+      } catch {
+        return notFound("Asset not found");
+      }
+      return handleAsset(request, env, key);
+    }
+
+    if (url.pathname.startsWith(DECK_ROUTE)) {
+      let name: string;
+      try {
+        name = decodeURIComponent(url.pathname.slice(DECK_ROUTE.length));
+      } catch {
+        return notFound("Deck not found");
+      }
+      return handleDeck(request, env, name);
+    }
+
     if (url.pathname === "/config") {
       try {
-        const config = await readConfigFromR2(env);
-        return json(config, 200, "public, max-age=300, stale-while-revalidate=3600");
+        return await handleConfig(request, env);
       } catch {
         return json(
           {
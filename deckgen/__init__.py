@@ -0,0 +1,6 @@
+"""
+deckgen – building blocks for FlowPulse PowerPoint generation.
+
+``generate_ppt.py`` builds the project deck; the modules here hold the shared
+theme and shape helpers plus the per-user report and batch pipelines.
+"""
@@ -0,0 +1,340 @@
+"""
+Content-addressed cache of slide images and rendered chart PNGs.
+
+    cache = assets.default_cache()
+    logo = cache.image("extension/icons/icon128.png")      # Asset, read once
+    spark = assets.sparkline([62, 71, 58, 80], color=ACCENT_BLUE)
+    helpers.add_image(slide, Inches(1), Inches(1), Inches(0.6), None, logo)
+
+    python -m deckgen.assets                   # entries, size, cap
+    python -m deckgen.assets --clear
+
+``slide.shapes.add_picture()`` reads the file, SHA-1 hashes it, decodes it
+with Pillow twice (for pixel size and dpi) and scans every part of the
+package for a duplicate, for every picture of every deck. Here each image
+is stored once under ``ASSET_CACHE/objects/ab/<sha256>.<ext>`` next to a
+JSON sidecar holding what the pptx image part needs (content type,
+extension, pixel size, dpi, file name), so later decks and later processes
+get the bytes and metadata without decoding anything. File paths map to
+digests through an index keyed by path, size and mtime, so an unchanged
+file is not even re-read. ``helpers.add_image()`` then adds one image part
+per package per digest and only relates each slide to it.
+
+``AssetCache.rendered(key, render)`` maps a hash of the *input data* to the
+digest of the rendered bytes, so a chart whose data did not change is never
+re-rendered. Objects are evicted least-recently-used (by mtime, refreshed
+when an object is first used in a process) once the store grows past
+``max_bytes`` (``$DECKGEN_ASSET_CACHE_MB``, default 256).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from collections import OrderedDict, namedtuple
+
+from pptx.parts.image import Image as _ImageInfo
+from pptx.util import Emu
+
+from deckgen.theme import ACCENT_BLUE
+
+ASSET_CACHE = os.environ.get("DECKGEN_ASSET_CACHE", os.path.join(".deckcache", "assets"))
+MAX_BYTES = int(os.environ.get("DECKGEN_ASSET_CACHE_MB", 256)) << 20
+MEMORY_BYTES = 64 << 20
+
+# Evict down to this share of the cap so eviction does not run on every put
+_EVICT_TO = 0.8
+_EMU_PER_INCH = 914400
+
+Asset = namedtuple("Asset", "digest blob content_type ext size dpi filename")
+Asset.__doc__ = """Image bytes plus the metadata of its pptx image part."""
+
+
+def native_size(asset):
+    """``(cx, cy)`` in EMU at the image's dpi, as ``add_picture()`` sizes it."""
+    (width, height), (horz, vert) = asset.size, asset.dpi
+    return Emu(int(_EMU_PER_INCH * width / horz)), Emu(int(_EMU_PER_INCH * height / vert))
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _write_json(path, obj):
+    _write(path, json.dumps(obj, separators=(",", ":")).encode())
+
+
+class AssetCache:
+    """SHA-256 keyed image store on disk with an in-process LRU in front."""
+
+    def __init__(self, root=ASSET_CACHE, max_bytes=MAX_BYTES, memory_bytes=MEMORY_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.stats = {"hits": 0, "misses": 0, "renders": 0, "evictions": 0}
+        self._memory = OrderedDict()    # digest -> Asset
+        self._memory_size = 0
+        self._paths = {}                # (path, size, mtime_ns) -> digest
+        self._renders = {}              # render key -> digest
+        self._disk_size = None          # bytes under objects/, scanned on first put
+
+    # ── Layout ──
+
+    def _object(self, digest, ext):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.{ext}")
+
+    def _meta(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.json")
+
+    def _index(self, kind, key):
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.root, kind, name[:2], f"{name}.json")
+
+    # ── Lookup ──
+
+    def get(self, digest):
+        """The cached ``Asset`` for ``digest``, or ``None``."""
+        asset = self._memory.get(digest)
+        if asset is not None:
+            self._memory.move_to_end(digest)
+            self.stats["hits"] += 1
+            return asset
+        meta = _read_json(self._meta(digest))
+        if meta is None:
+            return None
+        path = self._object(digest, meta["ext"])
+        try:
+            with open(path, "rb") as fh:
+                blob = fh.read()
+            # First use in this process: mark it recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        asset = Asset(digest, blob, meta["content_type"], meta["ext"], tuple(meta["size"]),
+                      tuple(meta["dpi"]), meta["filename"])
+        self._remember(asset)
+        self.stats["hits"] += 1
+        return asset
+
+    def put(self, blob, filename=None):
+        """Store ``blob`` (any format python-pptx accepts) and return its ``Asset``."""
+        digest = hashlib.sha256(blob).hexdigest()
+        asset = self.get(digest)
+        if asset is not None:
+            return asset
+        self.stats["misses"] += 1
+        info = _ImageInfo(blob, filename)
+        asset = Asset(digest, bytes(blob), info.content_type, info.ext, tuple(info.size),
+                      tuple(info.dpi), filename or f"image.{info.ext}")
+        # Object first: a sidecar on disk means its bytes are complete
+        _write(self._object(digest, asset.ext), asset.blob)
+        _write_json(self._meta(digest), {
+            "content_type": asset.content_type, "ext": asset.ext, "size": asset.size,
+            "dpi": asset.dpi, "filename": asset.filename,
+        })
+        self._remember(asset)
+        self._grow(len(blob))
+        return asset
+
+    def image(self, source):
+        """``Asset`` for a path, raw bytes, a binary file object or an ``Asset``."""
+        if isinstance(source, Asset):
+            return source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return self.put(bytes(source))
+        if hasattr(source, "read"):
+            return self.put(source.read(), os.path.basename(getattr(source, "name", "")) or None)
+        path = os.path.abspath(os.fspath(source))
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        digest = self._paths.get(key)
+        if digest is None:
+            entry = _read_json(self._index("paths", path))
+            if entry and (entry["size"], entry["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                digest = entry["digest"]
+        asset = self.get(digest) if digest else None
+        if asset is None:
+            with open(path, "rb") as fh:
+                asset = self.put(fh.read(), os.path.basename(path))
+            _write_json(self._index("paths", path), {
+                "size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": asset.digest,
+            })
+        self._paths[key] = asset.digest
+        return asset
+
+    def rendered(self, key, render):
+        """``Asset`` for ``render()``'s bytes, rendered only if ``key`` is new.
+
+        ``key`` must be ``repr``-stable and capture everything the output
+        depends on (data, size, colors, renderer version).
+        """
+        key = repr(key)
+        digest = self._renders.get(key)
+        if digest is None:
+            entry = _read_json(self._index("renders", key))
+            digest = entry and entry["digest"]
+        asset = self.get(digest) if digest else None
+        if asset is None:
+            self.stats["renders"] += 1
+            asset = self.put(render())
+            _write_json(self._index("renders", key), {"digest": asset.digest})
+        self._renders[key] = asset.digest
+        return asset
+
+    # ── Eviction ──
+
+    def _remember(self, asset):
+        self._memory[asset.digest] = asset
+        self._memory_size += len(asset.blob)
+        while self._memory_size > self.memory_bytes and len(self._memory) > 1:
+            _, old = self._memory.popitem(last=False)
+            self._memory_size -= len(old.blob)
+
+    def _objects(self):
+        """``(mtime, size, path, sidecar)`` of every stored object."""
+        top = os.path.join(self.root, "objects")
+        if not os.path.isdir(top):
+            return []
+        found = []
+        for shard in os.scandir(top):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                name, ext = os.path.splitext(entry.name)
+                if ext in (".json", ".tmp"):
+                    continue
+                st = entry.stat()
+                found.append((st.st_mtime, st.st_size, entry.path,
+                              os.path.join(shard.path, f"{name}.json")))
+        return found
+
+    def _grow(self, size):
+        if self._disk_size is None:
+            self._disk_size = sum(entry[1] for entry in self._objects())
+        else:
+            self._disk_size += size
+        if self._disk_size > self.max_bytes:
+            self.evict()
+
+    def evict(self, max_bytes=None):
+        """Delete least-recently-used objects until the store fits ``max_bytes * 0.8``."""
+        limit = (self.max_bytes if max_bytes is None else max_bytes) * _EVICT_TO
+        objects = sorted(self._objects())
+        total = sum(entry[1] for entry in objects)
+        for _, size, path, sidecar in objects:
+            if total <= limit:
+                break
+            for stale in (sidecar, path):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            digest = os.path.splitext(os.path.basename(path))[0]
+            old = self._memory.pop(digest, None)
+            if old is not None:
+                self._memory_size -= len(old.blob)
+            total -= size
+            self.stats["evictions"] += 1
+        # Path and render entries pointing at evicted objects miss on get()
+        self._disk_size = total
+        return total
+
+    def usage(self):
+        objects = self._objects()
+        return len(objects), sum(entry[1] for entry in objects)
+
+    def clear(self):
+        for _, _, path, sidecar in self._objects():
+            for stale in (sidecar, path):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+        self._memory.clear()
+        self._memory_size = 0
+        self._paths.clear()
+        self._renders.clear()
+        self._disk_size = 0
+
+
+_default = None
+
+
+def default_cache():
+    """The process-wide ``AssetCache`` under ``ASSET_CACHE``."""
+    global _default
+    if _default is None:
+        _default = AssetCache()
+    return _default
+
+
+# ── Rendered charts ───────────────────────────────────────────────────────────
+
+# Bump when the drawing code changes so stale renders are not reused
+_SPARKLINE_VERSION = 1
+
+
+def render_sparkline(values, size=(480, 120), color=ACCENT_BLUE, width=4):
+    """PNG bytes of a transparent polyline through ``values`` (Pillow)."""
+    from PIL import Image, ImageDraw
+
+    w, h = size
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    values = [float(v) for v in values]
+    if len(values) > 1:
+        lo, hi = min(values), max(values)
+        span = (hi - lo) or 1.0
+        pad = width
+        step = (w - 2 * pad) / (len(values) - 1)
+        points = [(pad + i * step, h - pad - (v - lo) / span * (h - 2 * pad))
+                  for i, v in enumerate(values)]
+        ImageDraw.Draw(image).line(points, fill=(*color, 255), width=width, joint="curve")
+    out = io.BytesIO()
+    image.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+def sparkline(values, size=(480, 120), color=ACCENT_BLUE, width=4, cache=None):
+    """Cached ``render_sparkline()``: the same values are rendered once."""
+    values = tuple(float(v) for v in values)
+    key = ("sparkline", _SPARKLINE_VERSION, values, tuple(size), tuple(color), width)
+    cache = cache or default_cache()
+    return cache.rendered(key, lambda: render_sparkline(values, size, color, width))
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clear", action="store_true", help="delete every cached object")
+    parser.add_argument("--evict", action="store_true", help="evict down to the size cap now")
+    args = parser.parse_args(argv)
+
+    cache = default_cache()
+    if args.clear:
+        cache.clear()
+        print(f"🧹 Cleared {cache.root}")
+    elif args.evict:
+        cache.evict()
+        print(f"🧹 Evicted {cache.stats['evictions']} objects")
+    count, size = cache.usage()
+    print(f"📦 {count} assets, {size / (1 << 20):.1f} MB of {cache.max_bytes >> 20} MB in {cache.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
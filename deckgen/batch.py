@@ -0,0 +1,204 @@
+"""
+Batch rendering of per-user weekly report decks across a process pool.
+
+    python -m deckgen.batch export.jsonl -o reports/ -j 8 --chunksize 32
+    python -m deckgen.batch activity_logs.parquet --activity-logs -o reports/
+    python -m deckgen.batch export.jsonl --config-url https://assets.flowpulse.app
+    python -m deckgen.batch export.jsonl --optimize     # + shrink every deck (deckgen.optimize)
+    python -m deckgen.batch export.jsonl --locale de    # German reports (deckgen.i18n)
+
+Each worker imports python-pptx and reads the default template once in its
+initializer, then renders whole chunks of users so that pickling overhead is
+amortised. Workers write their decks directly and only send back timings.
+With ``--activity-logs`` the input is a raw ``activityLogs`` dump that is
+first aggregated into days by ``deckgen.activity``. With ``--config-url``
+the report branding is fetched from the Worker (``deckgen.remote``) while
+the export is loaded, once for the whole batch, and handed to every worker.
+With ``--optimize`` each worker runs its decks through ``deckgen.optimize``
+before writing them.
+"""
+
+import argparse
+import io
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from deckgen import remote, tracing
+from deckgen.stream import save
+from deckgen.activity import load_activity
+from deckgen.i18n import LocaleError, load_catalog
+from deckgen.optimize import format_stats, optimize_package
+from deckgen.report import load_export, week_window, build_report
+
+# How every deck of a batch is rendered; see render_batch()
+RenderOptions = namedtuple("RenderOptions", "clone master optimize locale",
+                           defaults=(True, False, False, None))
+
+# One deck: ``history`` is the trend slide's days, or None for no trend slide
+Job = namedtuple("Job", "uid week output_path history options")
+
+_template = None
+_branding = None
+
+
+def _init_worker(branding=None):
+    """Warm imports and cache the template bytes for every deck in this process."""
+    global _template, _branding
+    _branding = branding
+    from pptx import Presentation  # noqa: F401 – import cost paid once per worker
+    import pptx
+    path = os.path.join(os.path.dirname(pptx.__file__), "templates", "default.pptx")
+    with open(path, "rb") as fh:
+        _template = fh.read()
+
+
+def render_user(job):
+    """Render one ``Job``.
+
+    Returns ``(uid, seconds, stats)``; ``stats`` are the ``deckgen.optimize``
+    stats, or ``None`` without ``optimize``.
+    """
+    uid, week, output_path, history, options = job
+    t0 = time.perf_counter()
+    stats = None
+    with tracing.span(f"report {uid}", "deck"):
+        prs = build_report(uid, week, template=_template, clone=options.clone, history=history,
+                           branding=_branding, master=options.master, catalog=load_catalog(options.locale))
+        if not options.optimize:
+            with tracing.span("prs.save", "save"):
+                save(prs, output_path)
+        else:
+            buf = io.BytesIO()
+            with tracing.span("prs.save", "save"):
+                save(prs, buf)
+            with tracing.span("optimize", "save"):
+                blob, stats = optimize_package(buf.getvalue())
+            tmp = f"{output_path}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(blob)
+            os.replace(tmp, output_path)
+    return uid, time.perf_counter() - t0, stats
+
+
+def plan_jobs(export_path, out_dir, week_ending=None, trend=False, activity_logs=False, options=RenderOptions()):
+    """One ``Job`` per user in ``export_path`` with data in the report week."""
+    users = load_activity(export_path) if activity_logs else load_export(export_path)
+    jobs = []
+    for uid in sorted(users):
+        week = week_window(users[uid], week_ending)
+        if week:
+            # The trend slide only charts days up to the report week
+            history = [d for d in users[uid] if d["date"] <= week[-1]["date"]] if trend else None
+            jobs.append(Job(uid, week, os.path.join(out_dir, f"{uid}.pptx"), history, options))
+    return jobs
+
+
+def render_batch(export_path, out_dir, workers=None, chunksize=16, *, week_ending=None, trend=False,
+                 activity_logs=False, config_url=None, options=RenderOptions()):
+    """Render one report per user in ``export_path`` into ``out_dir``.
+
+    ``workers=1`` renders in-process (no pool), which is handy for debugging
+    and as the serial baseline. ``trend=True`` adds the chart slide over
+    each user's full history. ``activity_logs=True`` reads raw logs instead
+    of ``dailyStats``. ``config_url`` is the Worker to take the branding
+    from; if it cannot be reached and nothing is cached, the built-in
+    branding is used. ``options`` (``RenderOptions``) apply to every deck:
+    ``clone=False`` rebuilds static slides and chrome in every deck instead
+    of copying them, ``master=True`` puts the chrome on a themed master
+    (``deckgen.master``), ``optimize=True`` shrinks every deck
+    (``deckgen.optimize``) and ``locale`` translates them (``deckgen.i18n``).
+    Returns a summary dict with throughput.
+    """
+    # Fetch in the background while the export is parsed
+    branding = remote.prefetch(config_url) if config_url else None
+    os.makedirs(out_dir, exist_ok=True)
+    load_catalog(options.locale)  # fail before any rendering on an unknown locale
+    jobs = plan_jobs(export_path, out_dir, week_ending, trend, activity_logs, options)
+    workers = workers or os.cpu_count() or 1
+    fetch = None
+    if branding is not None:
+        try:
+            branding, fetch = branding.result()
+        except remote.FetchError as exc:
+            branding, fetch = None, {"error": str(exc)}
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        _init_worker(branding)
+        results = [render_user(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(branding,)) as pool:
+            results = list(pool.map(render_user, jobs, chunksize=max(1, chunksize)))
+    elapsed = time.perf_counter() - t0
+
+    optimized = [stats for _, _, stats in results if stats]
+    return {
+        "fetch": fetch,
+        "decks": len(results),
+        "workers": workers,
+        "seconds": elapsed,
+        "decks_per_sec": len(results) / elapsed if elapsed else 0.0,
+        "render_seconds": sum(secs for _, secs, _ in results),
+        "optimized": {
+            "before": sum(s["before"] for s in optimized),
+            "after": sum(s["after"] for s in optimized),
+            "seconds": sum(s["seconds"] for s in optimized),
+        } if optimized else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render weekly report decks for every user in an export.")
+    parser.add_argument("export", help="JSONL export of dailyStats / dailyRealtime documents")
+    parser.add_argument("--activity-logs", action="store_true",
+                        help="the input is a raw activityLogs dump (.jsonl or .parquet) to aggregate first")
+    parser.add_argument("-o", "--out-dir", default="reports", help="directory for the generated decks")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=16, help="users handed to a worker at a time")
+    parser.add_argument("--week-ending", default=None, help="last day of the report week (YYYY-MM-DD)")
+    parser.add_argument("--no-clone", dest="clone", action="store_false",
+                        help="rebuild static slides and chrome in every deck instead of cloning them")
+    parser.add_argument("--trend", action="store_true",
+                        help="add a slide charting each user's focus history")
+    parser.add_argument("--config-url", default=remote.CONFIG_URL, metavar="URL",
+                        help="Worker to fetch the report branding from (default: $DECKGEN_CONFIG_URL)")
+    parser.add_argument("--master", action="store_true",
+                        help="draw background, top bar and footer on a FlowPulse theme and master")
+    parser.add_argument("--optimize", action="store_true",
+                        help="shrink every deck: drop unused parts, dedupe media, recompress")
+    parser.add_argument("--locale", default=None, help="translate the reports (e.g. de; see deckgen.i18n)")
+    parser.add_argument("--profile", default=None, metavar="TRACE",
+                        help="render serially and write a Chrome trace of every slide and helper call")
+    args = parser.parse_args(argv)
+    try:
+        load_catalog(args.locale)
+    except LocaleError as exc:
+        parser.error(str(exc))
+
+    options = RenderOptions(args.clone, args.master, args.optimize, args.locale)
+    kwargs = dict(week_ending=args.week_ending, trend=args.trend, activity_logs=args.activity_logs,
+                  config_url=args.config_url, options=options)
+    if args.profile:
+        with tracing.profiling() as prof:
+            summary = render_batch(args.export, args.out_dir, 1, args.chunksize, **kwargs)
+        prof.write_trace(args.profile)
+        print(prof.format_summary())
+    else:
+        summary = render_batch(args.export, args.out_dir, args.workers, args.chunksize, **kwargs)
+    fetch = summary["fetch"]
+    if fetch and "error" in fetch:
+        print(f"⚠️  Branding unavailable, using the built-in one: {fetch['error']}")
+    elif fetch:
+        print("🎨 Branding: " + ", ".join(f"{k} {v}" for k, v in fetch.items()))
+    print(f"✅ {summary['decks']} decks rendered to {args.out_dir} "
+          f"with {summary['workers']} worker(s) in {summary['seconds']:.2f}s")
+    print(f"   {summary['decks_per_sec']:.1f} decks/sec")
+    if summary["optimized"]:
+        print(f"🗜️  Optimized: {format_stats(summary['optimized'])}")
+
+
+if __name__ == "__main__":
+    main()
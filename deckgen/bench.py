@@ -0,0 +1,385 @@
+"""
+Benchmarks for the deck generator, with results stored as JSON.
+
+    python -m deckgen.bench -o bench/HEAD.json            # run everything
+    python -m deckgen.bench -k slide. --quick             # subset, skip 10k-slide decks
+    python -m deckgen.bench --compare bench/base.json bench/HEAD.json
+
+Each benchmark is a setup function returning the zero-argument callable to
+time; setup runs once per repeat so every repeat starts from fresh state.
+Benchmarks run in a forked child process, so the recorded peak RSS covers
+that benchmark alone (``peak_rss_mb`` is the growth over the child's RSS at
+start-up). Times are seconds per call.
+
+``--compare`` prints the per-benchmark ratio of median times and exits with
+status 1 when any benchmark got slower than ``--threshold``.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pptx
+from pptx.util import Inches
+
+from deckgen import assets, helpers, fastxml, layout, preview
+from deckgen.patch import patch_deck
+from deckgen.theme import BG_CARD, BORDER_COLOR, ACCENT_BLUE, TEXT_MUTED
+from deckgen.spec import deck_pages, render_slide, render_deck
+from deckgen.stream import DeckWriter, SpillWriter
+
+SCALES = (100, 1_000, 10_000)
+
+_benchmarks = {}
+
+
+def benchmark(name, number=1, repeat=5):
+    """Register ``fn`` (a setup returning the callable to time) as ``name``."""
+    def register(fn):
+        _benchmarks[name] = (fn, number, repeat)
+        return fn
+    return register
+
+
+class _NullSink:
+    """Unseekable binary sink that only counts bytes."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def _blank_slide():
+    prs = helpers.new_presentation()
+    return prs, helpers.add_blank_slide(prs)
+
+
+def _project():
+    import generate_ppt
+    return generate_ppt.DECK, generate_ppt.deck_data()
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+_LINES = [("●  Detect active tab and track time per domain", TEXT_MUTED)] * 6
+
+_HELPER_CALLS = {
+    "add_text_box": lambda m, s: m.add_text_box(
+        s, Inches(1), Inches(1), Inches(4), Inches(0.5), "Dashboard displays weekly trend charts",
+        font_size=15),
+    "add_multiline_box": lambda m, s: m.add_multiline_box(
+        s, Inches(1), Inches(1), Inches(5), Inches(3), _LINES, font_size=14),
+    "add_shape": lambda m, s: m.add_shape(
+        s, Inches(1), Inches(1), Inches(3), Inches(2), BG_CARD, BORDER_COLOR, 0.05),
+    "add_icon_circle": lambda m, s: m.add_icon_circle(s, Inches(1), Inches(1), Inches(0.5), ACCENT_BLUE, "3", 12),
+    "slide_number_footer": lambda m, s: m.slide_number_footer(s, 3, 15),
+}
+
+
+def _register_helpers():
+    for module in (helpers, fastxml):
+        for name, call in _HELPER_CALLS.items():
+            def setup(module=module, call=call):
+                _, slide = _blank_slide()
+                return lambda: call(module, slide)
+            benchmark(f"{module.__name__.split('.')[-1]}.{name}", number=50)(setup)
+
+
+_register_helpers()
+
+
+# ── Text fitting ──────────────────────────────────────────────────────────────
+
+_DOMAINS = [f"{'analytics.' * (i % 4)}domain-{i}.example.com" for i in range(1_000)]
+
+
+def _fit_domains():
+    for domain in _DOMAINS:
+        layout.fit_text(domain, Inches(2.3), Inches(0.35), 13, min_size=9)
+
+
+@benchmark("layout.fit_text.cold")
+def _bench_fit_cold():
+    layout.clear_caches()
+    return _fit_domains
+
+
+@benchmark("layout.fit_text.warm", number=10)
+def _bench_fit_warm():
+    _fit_domains()
+    return _fit_domains
+
+
+# ── Images ────────────────────────────────────────────────────────────────────
+
+_PICTURES = 6
+_picture_dir = None
+
+
+def _picture_file():
+    """A 1920x1080 JPEG in a temporary directory (kept for the process)."""
+    from PIL import Image
+    global _picture_dir
+    _picture_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(_picture_dir.name, "screenshot.jpg")
+    Image.effect_noise((1920, 1080), 64).convert("RGB").save(path, quality=80)
+    return path
+
+
+@benchmark("image.add_picture", number=5)
+def _bench_add_picture():
+    path = _picture_file()
+    _, slide = _blank_slide()
+    return lambda: [slide.shapes.add_picture(path, Inches(1), Inches(1), Inches(3))
+                    for _ in range(_PICTURES)]
+
+
+@benchmark("image.add_image", number=5)
+def _bench_add_image():
+    path = _picture_file()
+    assets._default = assets.AssetCache(os.path.join(_picture_dir.name, "cache"))
+    _, slide = _blank_slide()
+    helpers.add_image(slide, Inches(1), Inches(1), Inches(3), None, path)
+    return lambda: [helpers.add_image(slide, Inches(1), Inches(1), Inches(3), None, path)
+                    for _ in range(_PICTURES)]
+
+
+# ── Project deck ──────────────────────────────────────────────────────────────
+
+def _project_pages():
+    deck, data = _project()
+    total, pages = deck_pages(deck, data)
+    return total, list(pages)
+
+
+def _register_slides():
+    total, pages = _project_pages()
+    for index, (compiled, _) in enumerate(pages):
+        def setup(index=index):
+            compiled, slide_data = _project_pages()[1][index]
+            prs = helpers.new_presentation()
+            return lambda: render_slide(prs, compiled, slide_data, index + 1, total)
+        benchmark(f"slide.{index + 1:02d}_{compiled.name}", number=10)(setup)
+
+
+_register_slides()
+
+
+@benchmark("deck.project.render")
+def _bench_project_render():
+    deck, data = _project()
+    return lambda: render_deck(deck, data)
+
+
+@benchmark("deck.project.preview", number=5)
+def _bench_project_preview():
+    deck, data = _project()
+    return lambda: preview.deck_html(deck, data)
+
+
+@benchmark("deck.project.save", number=5)
+def _bench_project_save():
+    deck, data = _project()
+    prs = render_deck(deck, data)
+    return lambda: prs.save(_NullSink())
+
+
+# ── Synthetic decks ───────────────────────────────────────────────────────────
+
+def _synthetic(count, master=False, spill=False):
+    """Stream ``count`` slides cycling through the project deck's slides."""
+    _, pages = _project_pages()
+    writer_class = SpillWriter if spill else DeckWriter
+
+    def run():
+        with writer_class(_NullSink(), master=master) as writer:
+            for i in range(count):
+                spec, slide_data = pages[i % len(pages)]
+                writer.flush(render_slide(writer.prs, spec, slide_data, i + 1, count))
+    return run
+
+
+for _count in SCALES:
+    benchmark(f"deck.synthetic.{_count}", repeat=3 if _count < 10_000 else 1)(
+        lambda count=_count: _synthetic(count))
+
+benchmark("deck.synthetic.1000.master", repeat=3)(lambda: _synthetic(1000, master=True))
+
+for _count in SCALES[1:]:
+    benchmark(f"deck.synthetic.{_count}.spill", repeat=3 if _count < 10_000 else 1)(
+        lambda count=_count: _synthetic(count, spill=True))
+
+
+# ── Patching ──────────────────────────────────────────────────────────────────
+
+_patch_dir = None
+
+
+@benchmark("deck.patch.500", repeat=3)
+def _bench_patch():
+    """Change one requirement line of a 500-slide project deck on disk."""
+    global _patch_dir
+    deck, data = _project()
+    frs = data["functional"]["frs"]
+    total, _ = deck_pages(deck, data)
+    other = total - -(-len(frs) // 10)
+    data["functional"]["frs"] = [frs[i % len(frs)] for i in range((500 - other) * 10)]
+    _patch_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(_patch_dir.name, "deck.pptx")
+    cache = os.path.join(_patch_dir.name, "cache")
+    patch_deck(deck, data, path, cache_dir=cache)
+    code, _, color = frs[0]
+    data["functional"]["frs"][2500] = (code, "Dashboard exports weekly reports as PDF", color)
+    return lambda: patch_deck(deck, data, path, cache_dir=cache)
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_one(name, conn):
+    setup, number, repeat = _benchmarks[name]
+    base = _rss_mb()
+    times = []
+    for _ in range(repeat):
+        fn = setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    conn.send({
+        "seconds": statistics.median(times),
+        "min": min(times),
+        "max": max(times),
+        "number": number,
+        "repeat": repeat,
+        "peak_rss_mb": round(_rss_mb() - base, 1),
+    })
+    conn.close()
+
+
+def run_benchmark(name):
+    """Run one benchmark in a forked child; returns its result dict."""
+    ctx = multiprocessing.get_context("fork")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_one, args=(name, child))
+    proc.start()
+    child.close()
+    try:
+        result = parent.recv()
+    except EOFError:
+        result = {"error": f"benchmark process exited with {proc.exitcode}"}
+    proc.join()
+    return result
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_all(pattern=None, quick=False, log=sys.stderr):
+    names = sorted(_benchmarks)
+    if pattern:
+        names = [n for n in names if re.search(pattern, n)]
+    if quick:
+        largest = f"deck.synthetic.{SCALES[-1]}"
+        names = [n for n in names if n != largest and not n.startswith(largest + ".")]
+    results = {}
+    for name in names:
+        result = run_benchmark(name)
+        results[name] = result
+        if "error" in result:
+            print(f"  {name:<40} {result['error']}", file=log)
+        else:
+            print(f"  {name:<40} {result['seconds'] * 1000:10.3f} ms  {result['peak_rss_mb']:8.1f} MB",
+                  file=log)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "python_pptx": pptx.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(old, new, threshold=1.10, log=sys.stdout):
+    """Print median-time ratios ``new/old``; returns names slower than ``threshold``."""
+    regressions = []
+    for name in sorted(set(old["results"]) & set(new["results"])):
+        a, b = old["results"][name], new["results"][name]
+        if "seconds" not in a or "seconds" not in b or not a["seconds"]:
+            continue
+        ratio = b["seconds"] / a["seconds"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  ⚠️  slower"
+        print(f"  {name:<40} {a['seconds'] * 1000:10.3f} -> {b['seconds'] * 1000:10.3f} ms"
+              f"  x{ratio:5.2f}{flag}", file=log)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark deck generation and store results as JSON.")
+    parser.add_argument("-o", "--output", default="bench-results.json", help="where to write the results")
+    parser.add_argument("-k", dest="pattern", default=None, help="only run benchmarks matching this regex")
+    parser.add_argument("--quick", action="store_true",
+                        help=f"skip the {SCALES[-1]:,}-slide synthetic decks")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="slowdown ratio reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(sorted(_benchmarks)))
+        return 0
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as fh:
+            old = json.load(fh)
+        with open(args.compare[1], encoding="utf-8") as fh:
+            new = json.load(fh)
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) slower than x{args.threshold}")
+            return 1
+        print("✅ no regressions")
+        return 0
+
+    report = run_all(args.pattern, args.quick)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+    print(f"✅ {len(report['results'])} benchmarks written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
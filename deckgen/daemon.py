@@ -0,0 +1,416 @@
+"""
+Long-running render daemon that keeps python-pptx, the template and the
+compiled decks warm and renders jobs over localhost HTTP or a Unix socket.
+
+    python -m deckgen.daemon serve --port 8765 -j 2 --queue 16
+    python -m deckgen.daemon serve --socket /tmp/deckgen.sock
+    python -m deckgen.daemon render job.json -o report.pptx --port 8765
+
+Protocol (HTTP/1.1 on either transport):
+
+    POST /render   {"deck": "report", "uid": "...", "days": [...], "week_ending": null, "trend": false}
+                   {"deck": "project", "format": "html", "locale": "de"}
+                   -> 200 .pptx bytes | 400 bad job | 503 queue full (Retry-After) | 504 timed out
+    GET  /health   -> {"running": n, "queued": n, "completed": n, "rejected": n, ...}
+
+``days`` are day dicts as produced by ``report.load_export()``; with
+``"trend": true`` every day up to the report week is charted on an extra
+slide. ``"locale"`` translates either deck (``deckgen.i18n``).
+``"format": "html"`` returns a single-page preview and
+``"format": "svg"`` one slide (``"slide": n``, default 1) as a thumbnail,
+drawn from the spec by ``deckgen.preview`` in a few milliseconds instead of
+the .pptx. Jobs run in a pool of ``-j`` worker processes that import python-pptx,
+read the template and render every registered deck once at start-up, so the
+compiled specs, static-slide clones and text templates are hot for the first
+real request.
+At most ``-j`` jobs render at once and at most ``--queue`` more wait; beyond
+that the daemon answers 503 immediately instead of letting latency grow. A
+job that is not done within ``--timeout`` is answered with 504 but keeps its
+slot until its worker is free again.
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from deckgen import batch, preview
+from deckgen.i18n import LocaleError, load_catalog
+from deckgen.spec import localize
+from deckgen.report import REPORT_DECK, REPORT_TREND_DECK, _empty_day, report_data, week_window
+from deckgen.stream import write_deck
+
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+FORMATS = {
+    "pptx": PPTX_TYPE,
+    "html": "text/html; charset=utf-8",
+    "svg": "image/svg+xml",
+}
+MAX_BODY = 8 * 1024 * 1024
+NUMBER_FIELDS = ("focusScore", "productiveMinutes", "distractionMinutes", "totalMinutes")
+
+
+class JobError(ValueError):
+    """The job payload is malformed or names an unknown deck."""
+
+
+# ── Jobs ──────────────────────────────────────────────────────────────────────
+
+def _catalog(job):
+    try:
+        return load_catalog(job.get("locale"))
+    except LocaleError as exc:
+        raise JobError(str(exc)) from None
+
+
+def _check_date(value, what):
+    try:
+        date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise JobError(f"{what} must be an ISO date (YYYY-MM-DD), got {value!r}") from None
+
+
+def _check_day(day):
+    _check_date(day["date"], "days[].date")
+    for key in NUMBER_FIELDS:
+        value = day[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise JobError(f"days[].{key} must be a number, got {value!r} on {day['date']}")
+    if day["peakHour"] is not None and (isinstance(day["peakHour"], bool)
+                                        or not isinstance(day["peakHour"], (int, float))):
+        raise JobError(f"days[].peakHour must be an hour or null, got {day['peakHour']!r}")
+    if not isinstance(day["topDomain"], str):
+        raise JobError(f"days[].topDomain must be a string, got {day['topDomain']!r}")
+
+
+def _report_job(job):
+    catalog = _catalog(job)
+    try:
+        uid = str(job["uid"])
+        days = [dict(_empty_day(d["date"]), **d) for d in job["days"]]
+    except (KeyError, TypeError) as exc:
+        raise JobError(f"report job needs uid and days[].date: {exc}") from None
+    # Bad values would otherwise only fail deep inside report_data(), as a 500
+    for day in days:
+        _check_day(day)
+    if job.get("week_ending") is not None:
+        _check_date(job["week_ending"], "week_ending")
+    days.sort(key=lambda d: d["date"])
+    week = week_window(days, job.get("week_ending"))
+    if not week:
+        raise JobError("report job has no days")
+    if job.get("trend"):
+        return localize(REPORT_TREND_DECK, catalog), report_data(uid, week, days, catalog=catalog)
+    return localize(REPORT_DECK, catalog), report_data(uid, week, catalog=catalog)
+
+
+def _project_job(job):
+    import generate_ppt
+    catalog = _catalog(job)
+    return localize(generate_ppt.DECK, catalog), generate_ppt.deck_data(catalog=catalog)
+
+
+DECKS = {
+    "report": _report_job,
+    "project": _project_job,
+}
+
+_WARMUP_JOBS = (
+    {"deck": "report", "uid": "warmup", "trend": True,
+     "days": [{"date": "2026-01-01", "focusScore": 50, "totalMinutes": 1}]},
+    {"deck": "project"},
+)
+
+
+def render_job(job):
+    """Render one job dict to .pptx bytes (runs in a worker process)."""
+    if not isinstance(job, dict) or job.get("deck") not in DECKS:
+        raise JobError(f"unknown deck: {job.get('deck') if isinstance(job, dict) else job!r}")
+    fmt = job.get("format", "pptx")
+    if fmt not in FORMATS:
+        raise JobError(f"unknown format: {fmt!r}; expected one of {sorted(FORMATS)}")
+    deck, data = DECKS[job["deck"]](job)
+    if fmt == "html":
+        return preview.deck_html(deck, data).encode()
+    if fmt == "svg":
+        svgs = preview.deck_svgs(deck, data)
+        num = job.get("slide", 1)
+        if not isinstance(num, int) or not 1 <= num <= len(svgs):
+            raise JobError(f"slide must be 1..{len(svgs)}")
+        return svgs[num - 1].encode()
+    buf = io.BytesIO()
+    write_deck(deck, data, buf, template=batch._template)
+    return buf.getvalue()
+
+
+def _init_worker():
+    batch._init_worker()
+    for job in _WARMUP_JOBS:
+        try:
+            render_job(job)
+        except Exception:
+            # A deck that cannot warm up (e.g. generate_ppt not importable
+            # from this cwd) still fails loudly when it is requested
+            pass
+
+
+# ── Server ────────────────────────────────────────────────────────────────────
+
+class RenderService:
+    """Worker pool with a bounded number of running + queued jobs."""
+
+    def __init__(self, workers=1, queue_size=16, timeout=60):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._lock = threading.Lock()
+        self.stats = {"in_flight": 0, "completed": 0, "failed": 0, "rejected": 0, "timed_out": 0,
+                      "render_seconds": 0.0}
+
+    def warm(self):
+        """Block until every worker has started and run its warm-up renders."""
+        futures = [self._pool.submit(os.getpid) for _ in range(self.workers)]
+        for f in futures:
+            f.result()
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self.stats[key] += delta
+
+    def _release(self, future=None):
+        self._count("in_flight", -1)
+        self._slots.release()
+
+    def submit(self, job):
+        """Render ``job``; returns bytes, or ``None`` if the queue is full.
+
+        Raises ``TimeoutError`` after ``timeout`` seconds; the job's slot is
+        only released once the job has actually finished (or was cancelled
+        before it started), so timeouts cannot push more work into the pool
+        than ``workers + queue_size``.
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            return None
+        self._count("in_flight")
+        t0 = time.perf_counter()
+        try:
+            future = self._pool.submit(render_job, job)
+        except Exception:
+            self._release()
+            self._count("failed")
+            raise
+        future.add_done_callback(self._release)
+        try:
+            blob = future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            self._count("timed_out")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("render_seconds", time.perf_counter() - t0)
+        self._count("completed")
+        return blob
+
+    def health(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["render_seconds"] = round(stats["render_seconds"], 3)
+        stats["running"] = min(stats["in_flight"], self.workers)
+        stats["queued"] = max(0, stats["in_flight"] - self.workers)
+        stats.update(workers=self.workers, queue_size=self.queue_size)
+        return stats
+
+    def shutdown(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "deckgen"
+
+    def address_string(self):
+        # client_address is "" on Unix sockets
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, body, content_type="application/json", headers=()):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.server.service.health())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/render":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # The body cannot be found, so neither can the next request
+            self.close_connection = True
+            self._send(400, {"error": "invalid Content-Length"})
+            return
+        if length > MAX_BODY:
+            self.close_connection = True
+            self._send(413, {"error": f"job larger than {MAX_BODY} bytes"})
+            return
+        try:
+            job = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as exc:
+            self._send(400, {"error": f"invalid JSON: {exc}"})
+            return
+        try:
+            blob = self.server.service.submit(job)
+        except JobError as exc:
+            self._send(400, {"error": str(exc)})
+            return
+        except TimeoutError:
+            self._send(504, {"error": f"render took longer than {self.server.service.timeout}s"})
+            return
+        except Exception as exc:
+            self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        if blob is None:
+            self._send(503, {"error": "render queue full"}, headers=[("Retry-After", "1")])
+            return
+        self._send(200, blob, FORMATS[job.get("format", "pptx")])
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, port=None, socket_path=None, host="127.0.0.1", verbose=False):
+    """Bind the HTTP front end on ``host:port`` or on a Unix ``socket_path``."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixServer(socket_path, _Handler)
+    else:
+        server = _TCPServer((host, port), _Handler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=60):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def request(method, path, body=None, port=None, socket_path=None, host="127.0.0.1", timeout=60):
+    """Send one request to a daemon; returns ``(status, headers, body)``."""
+    if socket_path:
+        conn = _UnixHTTPConnection(socket_path, timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), resp.read()
+    finally:
+        conn.close()
+
+
+def render_remote(job, **kwargs):
+    """Render ``job`` on a running daemon; returns .pptx (or ``format``) bytes."""
+    status, _, body = request("POST", "/render", json.dumps(job).encode(), **kwargs)
+    if status != 200:
+        raise RuntimeError(f"render failed ({status}): {body.decode(errors='replace')}")
+    return body
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm deck render daemon over localhost HTTP or a Unix socket.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "render"):
+        p = sub.add_parser(name)
+        where = p.add_mutually_exclusive_group()
+        where.add_argument("--port", type=int, default=8765, help="localhost TCP port (default: %(default)s)")
+        where.add_argument("--socket", dest="socket_path", default=None, help="Unix socket path")
+        if name == "serve":
+            p.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                           help="concurrent renders (default: CPU count)")
+            p.add_argument("--queue", type=int, default=16, help="jobs allowed to wait before 503 (default: 16)")
+            p.add_argument("--timeout", type=float, default=60, help="per-job render timeout in seconds")
+            p.add_argument("-v", "--verbose", action="store_true", help="log every request")
+        else:
+            p.add_argument("job", help="job JSON file, or - for stdin")
+            p.add_argument("-o", "--output", required=True, help="where to write the .pptx")
+    args = parser.parse_args(argv)
+
+    where = {"socket_path": args.socket_path} if args.socket_path else {"port": args.port}
+    if args.command == "render":
+        fh = sys.stdin if args.job == "-" else open(args.job, encoding="utf-8")
+        with fh:
+            job = json.load(fh)
+        t0 = time.perf_counter()
+        blob = render_remote(job, **where)
+        with open(args.output, "wb") as out:
+            out.write(blob)
+        print(f"✅ {args.output} ({len(blob)} bytes) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return
+
+    service = RenderService(args.workers, args.queue, args.timeout)
+    service.warm()
+    server = make_server(service, verbose=args.verbose, **where)
+    print(f"🚀 deckgen daemon on {args.socket_path or f'http://127.0.0.1:{args.port}'} "
+          f"({args.workers} worker(s), queue {args.queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket_path and os.path.exists(args.socket_path):
+            os.unlink(args.socket_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Single-pass parser for the ``━━━``-delimited sections of ``document.txt``.
+
+Sections look like::
+
+    ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    6. FUNCTIONAL REQUIREMENTS
+    ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+      FR-01  User can sign in securely via Google Login
+
+The file is read line by line and every body line is handed straight to the
+current section's line parser, so memory stays flat and the cost is linear
+even for multi-megabyte documents. Sections without a parser are only
+recorded in the table of contents.
+
+``parse_document()`` returns::
+
+    {
+        "sections": [(number, title), ...],
+        "frs":      [(code, desc), ...],
+        "nfrs":     [(code, title, desc), ...],
+        "phases":   [(number, title, [task, ...]), ...],
+        "criteria": [text, ...],
+    }
+"""
+
+import os
+import re
+import sys
+import time
+
+RULE_CHAR = "━"
+
+_HEADING = re.compile(r"^\s*(\d+)\.\s+(.+?)\s*$")
+_FR = re.compile(r"^\s*(FR-\d+)\s+(.+?)\s*$")
+_NFR = re.compile(r"^\s*(NFR-\d+)\s+(.+?)\s+[–—-]\s+(.+?)\s*$")
+_PHASE = re.compile(r"^\s*PHASE\s+(\d+)\s+[–—-]\s+(.+?)\s*$")
+_TASK = re.compile(r"^\s*□\s+(.+?)\s*$")
+_CRITERION = re.compile(r"^\s*✓\s+(.+?)\s*$")
+
+_FIRST_LETTER = re.compile(r"[a-z]")
+_SMALL_WORDS = {"and", "or", "of", "the", "for", "to", "in", "via"}
+
+
+def title_case(text):
+    """``"BACKEND LOGIC (CLOUD FUNCTIONS)"`` -> ``"Backend Logic (Cloud Functions)"``."""
+    words = []
+    for i, word in enumerate(text.lower().split()):
+        if not (i and word in _SMALL_WORDS):
+            word = "-".join(
+                _FIRST_LETTER.sub(lambda m: m.group().upper(), part, count=1)
+                for part in word.split("-")
+            )
+        words.append(word)
+    return " ".join(words)
+
+
+def _is_rule(line):
+    stripped = line.strip()
+    return len(stripped) > 3 and stripped[0] == RULE_CHAR and stripped.strip(RULE_CHAR) == ""
+
+
+# ── Section line parsers ──────────────────────────────────────────────────────
+
+def _parse_frs(doc, line):
+    m = _FR.match(line)
+    if m:
+        doc["frs"].append(m.groups())
+
+
+def _parse_nfrs(doc, line):
+    m = _NFR.match(line)
+    if m:
+        doc["nfrs"].append(m.groups())
+
+
+def _parse_phases(doc, line):
+    m = _TASK.match(line)
+    if m:
+        if doc["phases"]:
+            doc["phases"][-1][2].append(m.group(1))
+        return
+    m = _PHASE.match(line)
+    if m:
+        doc["phases"].append((int(m.group(1)), title_case(m.group(2)), []))
+
+
+def _parse_criteria(doc, line):
+    m = _CRITERION.match(line)
+    if m:
+        doc["criteria"].append(m.group(1))
+
+
+SECTION_PARSERS = {
+    "FUNCTIONAL REQUIREMENTS": _parse_frs,
+    "NON-FUNCTIONAL REQUIREMENTS": _parse_nfrs,
+    "DEVELOPMENT PHASES": _parse_phases,
+    "COMPLETION CRITERIA": _parse_criteria,
+}
+
+
+# ── Parser ────────────────────────────────────────────────────────────────────
+
+def parse_lines(lines):
+    """Parse an iterable of lines (e.g. an open file) in a single pass."""
+    doc = {"sections": [], "frs": [], "nfrs": [], "phases": [], "criteria": []}
+    parser = None
+    # Heading state: 0 = body, 1 = after opening rule, 2 = after heading line
+    state = 0
+    for line in lines:
+        if line.lstrip()[:1] == RULE_CHAR and _is_rule(line):
+            state = 1 if state != 2 else 0
+            continue
+        if state == 1:
+            if not line.strip():
+                continue
+            m = _HEADING.match(line)
+            if m:
+                number, title = int(m.group(1)), m.group(2)
+                doc["sections"].append((number, title))
+                parser = SECTION_PARSERS.get(title)
+                state = 2
+            else:
+                state = 0
+            continue
+        if parser is not None:
+            parser(doc, line)
+    return doc
+
+
+def parse_document(path):
+    """Parse ``path``; see the module docstring for the result."""
+    with open(path, encoding="utf-8") as fh:
+        return parse_lines(fh)
+
+
+# ── Watch mode ────────────────────────────────────────────────────────────────
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(path, on_change, interval=0.5):
+    """Call ``on_change(parse_document(path))`` now and whenever ``path`` changes.
+
+    Polls the file's mtime and size every ``interval`` seconds (portable, and
+    cheap for a single file). Errors from parsing or ``on_change`` are
+    reported and the watch continues; stop it with Ctrl-C.
+    """
+    last = None
+    while True:
+        stamp = _stamp(path)
+        if stamp is not None and stamp != last:
+            last = stamp
+            try:
+                on_change(parse_document(path))
+            except Exception as exc:
+                print(f"⚠️  {path}: {exc}", file=sys.stderr)
+        time.sleep(interval)
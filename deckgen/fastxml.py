@@ -0,0 +1,183 @@
+"""
+Template-based emitters with the same signatures as ``deckgen.helpers``.
+
+The helpers set font size, colour, bold, typeface, alignment and spacing one
+python-pptx property at a time, and every setter walks and mutates the XML.
+Here the first shape of each style is still built by the helper; its ``p:sp``
+element is cached as the template for that style, and later shapes are a
+deep copy with only the shape id/name, position/size and run text rewritten.
+The XML is identical to what the helpers produce.
+
+Text that python-pptx splits into several runs (line breaks, vertical tabs,
+other control characters) or that is empty always goes through the helper.
+"""
+
+from copy import deepcopy
+
+from pptx.oxml.ns import qn
+from pptx.shapes.autoshape import Shape
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+
+from deckgen import helpers
+from deckgen.theme import ACCENT_BLUE, TEXT_WHITE, TEXT_MUTED
+
+_TEMPLATE_LIMIT = 4096
+_templates = {}
+
+_LEAF_SHAPES = {qn(t) for t in ("p:sp", "p:pic", "p:cxnSp", "p:graphicFrame")}
+
+
+def clear_templates():
+    _templates.clear()
+
+
+def _plain(text):
+    """True if python-pptx would emit ``text`` as exactly one ``a:r``."""
+    return isinstance(text, str) and text != "" and all(c >= " " or c == "\t" for c in text)
+
+
+def _store(key, template):
+    if len(_templates) >= _TEMPLATE_LIMIT:
+        _templates.clear()
+    _templates[key] = template
+
+
+def _remember(key, shape):
+    _store(key, (deepcopy(shape._element), shape.name.rsplit(" ", 1)[0]))
+
+
+def next_shape_id(shapes):
+    """``shapes._next_shape_id`` without its per-call ``//@id`` document scan.
+
+    Every shape on a generated slide is appended with the next id, so the
+    last one holds the maximum; anything else falls back to the full scan.
+    """
+    last = shapes._spTree[-1]
+    if last.tag in _LEAF_SHAPES:
+        return int(last[0][0].get("id")) + 1
+    return shapes._next_shape_id
+
+
+def _stamp(slide, template, left, top, width, height):
+    """Append a copy of ``template`` to ``slide`` at the given position."""
+    element, basename = template
+    sp = deepcopy(element)
+    shapes = slide.shapes
+    shape_id = next_shape_id(shapes)
+    cNvPr = sp[0][0]
+    cNvPr.set("id", str(shape_id))
+    cNvPr.set("name", f"{basename} {shape_id - 1}")
+    off, ext = sp[1][0]
+    off.set("x", str(int(left)))
+    off.set("y", str(int(top)))
+    ext.set("cx", str(int(width)))
+    ext.set("cy", str(int(height)))
+    shapes._spTree.append(sp)
+    return sp
+
+
+def _shape(slide, sp):
+    # Stamped elements are never placeholders, so skip the factory's p:ph xpath
+    return Shape(sp, slide.shapes)
+
+
+# ── Text ──────────────────────────────────────────────────────────────────────
+
+def add_text_box(slide, left, top, width, height, text, font_size=18,
+                 color=TEXT_WHITE, bold=False, alignment=PP_ALIGN.LEFT,
+                 font_name="Calibri", line_spacing=1.2):
+    plain = _plain(text)
+    key = ("text", font_size, color, bold, alignment, font_name, line_spacing)
+    template = _templates.get(key) if plain else None
+    if template is None:
+        shape = helpers.add_text_box(slide, left, top, width, height, text, font_size,
+                                     color, bold, alignment, font_name, line_spacing)
+        if plain:
+            _remember(key, shape)
+        return shape
+    sp = _stamp(slide, template, left, top, width, height)
+    # txBody / a:p / a:r / a:t
+    sp[2][-1][-1][0].text = text
+    return _shape(slide, sp)
+
+
+def _line_style(item, color, font_size):
+    if isinstance(item, str):
+        return item, color, False, font_size
+    return (
+        item[0],
+        item[1] if len(item) > 1 else color,
+        item[2] if len(item) > 2 else False,
+        item[3] if len(item) > 3 else font_size,
+    )
+
+
+def add_multiline_box(slide, left, top, width, height, lines, font_size=16,
+                      color=TEXT_WHITE, font_name="Calibri", line_spacing=1.5,
+                      alignment=PP_ALIGN.LEFT):
+    """lines = list of (text, color, bold, font_size_override)"""
+    styles = [_line_style(item, color, font_size) for item in lines]
+    keys = [("line", clr, bld, fs, font_name, line_spacing, alignment) for _, clr, bld, fs in styles]
+    plain = bool(styles) and all(_plain(txt) for txt, _, _, _ in styles)
+    box = _templates.get(("box",)) if plain else None
+    paragraphs = [_templates.get(k) for k in keys] if box is not None else [None]
+    if None in paragraphs:
+        shape = helpers.add_multiline_box(slide, left, top, width, height, lines, font_size,
+                                          color, font_name, line_spacing, alignment)
+        if plain:
+            # Cache the empty box and each paragraph style separately so any
+            # mix of already-seen line styles can be stamped later
+            box = deepcopy(shape._element)
+            txBody = box[2]
+            for key, p in zip(keys, list(txBody.iterchildren(txBody[-1].tag))):
+                txBody.remove(p)
+                _store(key, (p, None))
+            _store(("box",), (box, shape.name.rsplit(" ", 1)[0]))
+        return shape
+    sp = _stamp(slide, box, left, top, width, height)
+    txBody = sp[2]
+    for (txt, _, _, _), (p, _) in zip(styles, paragraphs):
+        p = deepcopy(p)
+        # a:p / a:r / a:t
+        p[-1][0].text = txt
+        txBody.append(p)
+    return _shape(slide, sp)
+
+
+def slide_number_footer(slide, num, total):
+    return add_text_box(slide, Inches(12.2), Inches(7.05), Inches(1), Inches(0.4),
+                        f"{num}/{total}", font_size=10, color=TEXT_MUTED,
+                        alignment=PP_ALIGN.RIGHT)
+
+
+# ── Shapes ────────────────────────────────────────────────────────────────────
+
+def add_shape(slide, left, top, width, height, fill_color, border_color=None, radius=None):
+    key = ("shape", fill_color, border_color, radius)
+    template = _templates.get(key)
+    if template is None:
+        shape = helpers.add_shape(slide, left, top, width, height, fill_color, border_color, radius)
+        _remember(key, shape)
+        return shape
+    return _shape(slide, _stamp(slide, template, left, top, width, height))
+
+
+def add_accent_line(slide, left, top, width, color=ACCENT_BLUE, thickness=3):
+    key = ("accent", color, thickness)
+    template = _templates.get(key)
+    if template is None:
+        shape = helpers.add_accent_line(slide, left, top, width, color, thickness)
+        _remember(key, shape)
+        return shape
+    return _shape(slide, _stamp(slide, template, left, top, width, Pt(thickness)))
+
+
+def add_icon_circle(slide, left, top, size, color, label="", label_size=20):
+    key = ("circle", color, label, label_size)
+    template = _templates.get(key)
+    if template is None:
+        shape = helpers.add_icon_circle(slide, left, top, size, color, label, label_size)
+        _remember(key, shape)
+        return shape
+    return _shape(slide, _stamp(slide, template, left, top, size, size))
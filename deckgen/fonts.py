@@ -0,0 +1,373 @@
+"""
+Per-font glyph-advance tables read from local TrueType/OpenType files.
+
+    table = fonts.font_table("Calibri", bold=True)
+    table.em_width("Weekly Focus Report")      # width in ems; x font size = points
+
+    python -m deckgen.fonts                    # list the families found
+    python -m deckgen.fonts --rebuild Calibri  # re-read a family's files
+
+Font files are looked up in ``$DECKGEN_FONT_PATH`` (``os.pathsep``-separated)
+and the usual system and user font directories. Only the ``name``, ``head``,
+``hhea``, ``hmtx`` and ``cmap`` tables are read, with a small ``struct``-based
+reader, so no font library or rasterizer is needed. Each table is built once
+per font file and kept as JSON under ``FONT_CACHE``, keyed by the file's path,
+size and mtime; the directory scan is cached the same way.
+
+Families that are not installed (or characters a font has no glyph for, such
+as emoji in Calibri) fall back to approximate advances by character class, so
+measurement never fails -- it is only less exact.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import unicodedata
+
+FONT_CACHE = os.environ.get("DECKGEN_FONT_CACHE", os.path.join(".deckcache", "fonts"))
+
+FONT_DIRS = (
+    "~/.fonts",
+    "~/.local/share/fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/Library/Fonts",
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+)
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+# Metric-compatible substitutes tried when a family itself is not installed
+ALIASES = {
+    "Calibri": ("Carlito",),
+    "Arial": ("Liberation Sans", "Arimo"),
+    "Times New Roman": ("Liberation Serif", "Tinos"),
+    "Courier New": ("Liberation Mono", "Cousine"),
+    "Cambria": ("Caladea",),
+}
+
+_PLAIN_STYLES = ("Regular", "Bold", "Normal", "Roman", "Book")
+
+_tables = {}
+_index = None
+
+
+# ── sfnt reader ───────────────────────────────────────────────────────────────
+
+def _directory(data):
+    """Table tag -> (offset, length) for the first font in ``data``."""
+    base = 0
+    if data[:4] == b"ttcf":
+        base = struct.unpack_from(">L", data, 12)[0]
+    num_tables = struct.unpack_from(">H", data, base + 4)[0]
+    tables = {}
+    for i in range(num_tables):
+        tag, _, offset, length = struct.unpack_from(">4sLLL", data, base + 12 + 16 * i)
+        tables[tag.decode("latin-1")] = (offset, length)
+    return tables
+
+
+def _names(data, tables):
+    """``(family, subfamily)`` from the ``name`` table, preferring typographic names."""
+    offset, _ = tables["name"]
+    _, count, strings = struct.unpack_from(">HHH", data, offset)
+    found = {}
+    for i in range(count):
+        platform, encoding, language, name_id, length, str_off = struct.unpack_from(
+            ">6H", data, offset + 6 + 12 * i)
+        if name_id not in (1, 2, 16, 17) or name_id in found:
+            continue
+        raw = data[offset + strings + str_off:offset + strings + str_off + length]
+        if platform == 3 or platform == 0:
+            found[name_id] = raw.decode("utf-16-be", errors="replace")
+        elif platform == 1 and language == 0:
+            found[name_id] = raw.decode("latin-1")
+    return found.get(16) or found.get(1), found.get(17) or found.get(2) or "Regular"
+
+
+def _style(data, tables):
+    """``(bold, italic)`` from ``head.macStyle``."""
+    mac_style = struct.unpack_from(">H", data, tables["head"][0] + 44)[0]
+    return bool(mac_style & 1), bool(mac_style & 2)
+
+
+def _cmap(data, tables):
+    """Codepoint -> glyph id from the best Unicode subtable (format 12 or 4)."""
+    offset, _ = tables["cmap"]
+    count = struct.unpack_from(">H", data, offset + 2)[0]
+    subtables = {}
+    for i in range(count):
+        platform, encoding, sub = struct.unpack_from(">HHL", data, offset + 4 + 8 * i)
+        fmt = struct.unpack_from(">H", data, offset + sub)[0]
+        subtables.setdefault((platform, encoding, fmt), offset + sub)
+    for key in ((3, 10, 12), (0, 4, 12), (0, 6, 12), (3, 1, 4), (0, 3, 4), (0, 1, 4), (0, 0, 4)):
+        if key in subtables:
+            return (_cmap12 if key[2] == 12 else _cmap4)(data, subtables[key])
+    return {}
+
+
+def _cmap4(data, pos):
+    seg_count = struct.unpack_from(">H", data, pos + 6)[0] // 2
+    ends = struct.unpack_from(f">{seg_count}H", data, pos + 14)
+    starts = struct.unpack_from(f">{seg_count}H", data, pos + 16 + 2 * seg_count)
+    deltas = struct.unpack_from(f">{seg_count}h", data, pos + 16 + 4 * seg_count)
+    range_pos = pos + 16 + 6 * seg_count
+    range_offsets = struct.unpack_from(f">{seg_count}H", data, range_pos)
+    mapping = {}
+    for i in range(seg_count):
+        start, end, delta, ro = starts[i], ends[i], deltas[i], range_offsets[i]
+        for c in range(start, min(end, 0xFFFE) + 1):
+            if ro == 0:
+                glyph = (c + delta) & 0xFFFF
+            else:
+                glyph = struct.unpack_from(">H", data, range_pos + 2 * i + ro + 2 * (c - start))[0]
+                if glyph:
+                    glyph = (glyph + delta) & 0xFFFF
+            if glyph:
+                mapping[c] = glyph
+    return mapping
+
+
+def _cmap12(data, pos):
+    groups = struct.unpack_from(">L", data, pos + 12)[0]
+    mapping = {}
+    for i in range(groups):
+        start, end, glyph = struct.unpack_from(">LLL", data, pos + 16 + 12 * i)
+        for c in range(start, end + 1):
+            mapping[c] = glyph + c - start
+    return mapping
+
+
+def _advances(data, tables):
+    """Advance width of every glyph id, in font units."""
+    num_glyphs = struct.unpack_from(">H", data, tables["maxp"][0] + 4)[0]
+    num_metrics = struct.unpack_from(">H", data, tables["hhea"][0] + 34)[0]
+    metrics = struct.unpack_from(f">{2 * num_metrics}H", data, tables["hmtx"][0])
+    advances = list(metrics[::2])
+    advances.extend([advances[-1]] * max(0, num_glyphs - num_metrics))
+    return advances
+
+
+def read_font(path):
+    """Parse one font file into a JSON-able table dict."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    tables = _directory(data)
+    family, subfamily = _names(data, tables)
+    bold, italic = _style(data, tables)
+    upem = struct.unpack_from(">H", data, tables["head"][0] + 18)[0]
+    ascent, descent, line_gap = struct.unpack_from(">hhh", data, tables["hhea"][0] + 4)
+    glyph_advances = _advances(data, tables)
+    advances = {
+        cp: glyph_advances[glyph]
+        for cp, glyph in _cmap(data, tables).items() if glyph < len(glyph_advances)
+    }
+    return {
+        "path": path,
+        "family": family,
+        "subfamily": subfamily,
+        "bold": bold,
+        "italic": italic,
+        "upem": upem,
+        "ascent": ascent,
+        "descent": descent,
+        "line_gap": line_gap,
+        "advances": advances,
+    }
+
+
+# ── Approximate advances ──────────────────────────────────────────────────────
+# Roughly Calibri's proportions, in ems; used for missing fonts and glyphs.
+
+_NARROW = set(" .,:;'|!ijltfr()[]`\"")
+_WIDE = set("mwMW@%")
+
+
+def approx_em(ch):
+    if ch in _NARROW:
+        return 0.25
+    if ch in _WIDE:
+        return 0.82
+    if ch.isdigit():
+        return 0.507
+    if ch.isupper():
+        return 0.58
+    if ch.isascii():
+        return 0.48
+    if unicodedata.combining(ch) or unicodedata.category(ch) in ("Mn", "Cf"):
+        return 0.0
+    if unicodedata.east_asian_width(ch) in ("W", "F") or ord(ch) >= 0x1F000:
+        return 1.0
+    return 0.55
+
+
+class FontTable:
+    """Glyph advances of one font face, in ems."""
+    __slots__ = ("family", "bold", "path", "ems", "line_height")
+
+    def __init__(self, family, bold, path=None, advances=None, upem=1000, ascent=750,
+                 descent=-250, line_gap=0):
+        self.family = family
+        self.bold = bold
+        self.path = path
+        self.ems = {chr(int(cp)): adv / upem for cp, adv in (advances or {}).items()}
+        self.line_height = (ascent - descent + line_gap) / upem
+
+    @property
+    def approximate(self):
+        return self.path is None
+
+    def em_width(self, text):
+        ems = self.ems
+        total = 0.0
+        for ch in text:
+            em = ems.get(ch)
+            if em is None:
+                em = ems[ch] = approx_em(ch)
+            total += em
+        return total
+
+    def __repr__(self):
+        source = self.path or "approximate"
+        return f"<FontTable {self.family}{' Bold' if self.bold else ''} ({source})>"
+
+
+# ── Discovery and cache ───────────────────────────────────────────────────────
+
+def font_paths():
+    dirs = [d for d in os.environ.get("DECKGEN_FONT_PATH", "").split(os.pathsep) if d]
+    dirs.extend(FONT_DIRS)
+    seen = set()
+    for root in dirs:
+        root = os.path.expanduser(root)
+        for dirpath, _, files in os.walk(root):
+            for name in sorted(files):
+                path = os.path.join(dirpath, name)
+                if name.lower().endswith(FONT_EXTENSIONS) and path not in seen:
+                    seen.add(path)
+                    yield path
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_json(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(obj, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _table_path(path, stamp):
+    key = hashlib.sha256(repr((os.path.abspath(path), stamp)).encode()).hexdigest()
+    return os.path.join(FONT_CACHE, f"{key[:16]}.json")
+
+
+def _cached_font(path, stamp, rebuild=False):
+    cache_path = _table_path(path, stamp)
+    table = None if rebuild else _read_json(cache_path)
+    if table is None:
+        table = read_font(path)
+        _write_json(cache_path, table)
+    return table
+
+
+def font_index(rebuild=False):
+    """``{(family, bold): path}`` for every readable upright face found."""
+    global _index
+    if _index is not None and not rebuild:
+        return _index
+    index_path = os.path.join(FONT_CACHE, "index.json")
+    old = {} if rebuild else (_read_json(index_path) or {})
+    entries = {}
+    for path in font_paths():
+        try:
+            stamp = list(_stamp(path))
+        except OSError:
+            continue
+        entry = old.get(path)
+        if entry is None or entry[0] != stamp or len(entry) != 5:
+            try:
+                table = _cached_font(path, stamp, rebuild)
+            except (KeyError, struct.error, OSError):
+                # Not an sfnt we can read (bitmap-only, CFF2 quirks, ...)
+                table = {"family": None, "subfamily": None, "bold": False, "italic": False}
+            entry = [stamp, table["family"], table["subfamily"], table["bold"], table["italic"]]
+        entries[path] = entry
+    if entries != old:
+        _write_json(index_path, entries)
+    _index = {}
+    # Plain "Regular"/"Bold" faces win over Light, Medium, Condensed, ...
+    ranked = sorted(entries.items(), key=lambda e: (e[1][2] not in _PLAIN_STYLES, e[0]))
+    for path, (_, family, subfamily, bold, italic) in ranked:
+        if family and not italic:
+            _index.setdefault((family.lower(), bold), path)
+    return _index
+
+
+def font_table(family, bold=False):
+    """The ``FontTable`` for ``family``; approximate if it is not installed."""
+    key = (family, bold)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+    index = font_index()
+    path = None
+    for name in (family,) + ALIASES.get(family, ()):
+        # A missing bold face renders as synthetic bold of the regular one
+        path = index.get((name.lower(), bold)) or index.get((name.lower(), False))
+        if path:
+            break
+    if path is None:
+        table = FontTable(family, bold)
+    else:
+        data = _cached_font(path, list(_stamp(path)))
+        table = FontTable(family, bold, path, data["advances"], data["upem"],
+                          data["ascent"], data["descent"], data["line_gap"])
+    _tables[key] = table
+    return table
+
+
+def clear_tables():
+    global _index
+    _tables.clear()
+    _index = None
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List fonts available for text measurement.")
+    parser.add_argument("families", nargs="*", help="only show these families")
+    parser.add_argument("--rebuild", action="store_true", help="re-read font files instead of the cache")
+    args = parser.parse_args(argv)
+    index = font_index(rebuild=args.rebuild)
+    if args.families:
+        for family in args.families:
+            for bold in (False, True):
+                label = family + (" Bold" if bold else "")
+                print(f"  {label:<30} {font_table(family, bold)}")
+        return
+    for (family, bold), path in sorted(index.items()):
+        label = family + (" (bold)" if bold else "")
+        print(f"  {label:<30} {path}")
+    print(f"✅ {len(index)} faces, tables cached in {FONT_CACHE}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Shape and text helpers used to build FlowPulse slides.
+
+These used to live as closures inside ``create_presentation()``; they are
+module-level so that other generators (per-user reports, batch workers) can
+share them without re-defining them for every deck.
+"""
+
+import io
+import re
+import weakref
+import zipfile
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+from pptx.parts.image import ImagePart
+from pptx.parts.slide import SlidePart
+from pptx.shapes.picture import Picture
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+
+from deckgen.assets import default_cache, native_size
+from deckgen.theme import (
+    BG_DARK, ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK,
+    TEXT_WHITE, TEXT_MUTED, BORDER_COLOR, SLIDE_WIDTH, SLIDE_HEIGHT,
+)
+
+BLANK_LAYOUT = 6   # index of the blank layout in the default template
+CHART_COLORS = (ACCENT_BLUE, ACCENT_GREEN, ACCENT_PINK, ACCENT_AMBER)
+
+
+def new_presentation(template=None):
+    """Create an empty 16:9 presentation.
+
+    ``template`` may be a path or the raw bytes of a .pptx; passing bytes lets
+    callers that build many decks read the template from disk only once.
+    """
+    if isinstance(template, (bytes, bytearray)):
+        template = io.BytesIO(template)
+    prs = Presentation(template)
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    return prs
+
+
+# presentation part -> [next slide id, slide count]
+_slide_state = weakref.WeakKeyDictionary()
+
+
+def _append_slide_part(prs, new_part, layout=None):
+    """Add ``new_part(partname, package, layout_part)`` as the next slide."""
+    if layout is None:
+        layout = prs.slide_layouts[BLANK_LAYOUT]
+    part = prs.part
+    sldIdLst = part._element.get_or_add_sldIdLst()
+    state = _slide_state.get(part)
+    if state is None:
+        state = _slide_state[part] = [sldIdLst._next_id, len(sldIdLst)]
+    next_id, count = state
+    partname = PackURI(f"/ppt/slides/slide{count + 1}.xml")
+    slide_part = new_part(partname, part.package, layout.part)
+    rId = part.rels._add_relationship(RT.SLIDE, slide_part)
+    sldIdLst._add_sldId(id=next_id, rId=rId)
+    state[0], state[1] = next_id + 1, count + 1
+    return slide_part, layout
+
+
+def add_blank_slide(prs, layout=None):
+    """Append a slide on ``layout`` (default: the blank layout) in constant time.
+
+    ``prs.slides.add_slide()`` rescans the deck on every call: ``relate_to``
+    walks all of the presentation's relationships looking for a duplicate,
+    and the new slide id is the max over an xpath of every ``p:sldId``. That
+    makes an n-slide deck O(n²) (1,000 slides took 11 s). A brand-new slide
+    part cannot already be related, so the relationship is added directly,
+    and the next id and slide count are tracked per presentation here.
+    """
+    slide_part, layout = _append_slide_part(prs, SlidePart.new, layout)
+    slide = slide_part.slide
+    slide.shapes.clone_layout_placeholders(layout)
+    return slide
+
+
+def add_slide_blob(prs, blob, layout=None):
+    """Append a slide on ``layout`` whose XML was serialised elsewhere.
+
+    The part keeps ``blob`` as-is and is never parsed, so it is only valid
+    for slide XML whose one relationship is its layout (``rId1``), e.g. a
+    slide rendered in another process. Returns the part.
+    """
+    def new_part(partname, package, layout_part):
+        part = Part(partname, CT.PML_SLIDE, package, blob)
+        part.relate_to(layout_part, RT.SLIDE_LAYOUT)
+        return part
+
+    return _append_slide_part(prs, new_part, layout)[0]
+
+
+def add_bg(slide, color=BG_DARK):
+    bg = slide.background
+    fill = bg.fill
+    fill.solid()
+    fill.fore_color.rgb = color
+
+
+def add_shape(slide, left, top, width, height, fill_color, border_color=None, radius=None):
+    shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height)
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = fill_color
+    if border_color:
+        shape.line.color.rgb = border_color
+        shape.line.width = Pt(1)
+    else:
+        shape.line.fill.background()
+    # Set corner radius
+    if radius:
+        shape.adjustments[0] = radius
+    else:
+        shape.adjustments[0] = 0.02
+    return shape
+
+
+def add_text_box(slide, left, top, width, height, text, font_size=18,
+                 color=TEXT_WHITE, bold=False, alignment=PP_ALIGN.LEFT,
+                 font_name="Calibri", line_spacing=1.2):
+    txBox = slide.shapes.add_textbox(left, top, width, height)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(font_size)
+    p.font.color.rgb = color
+    p.font.bold = bold
+    p.font.name = font_name
+    p.alignment = alignment
+    p.space_after = Pt(0)
+    p.space_before = Pt(0)
+    if line_spacing != 1.0:
+        p.line_spacing = Pt(font_size * line_spacing)
+    return txBox
+
+
+def add_multiline_box(slide, left, top, width, height, lines, font_size=16,
+                      color=TEXT_WHITE, font_name="Calibri", line_spacing=1.5,
+                      alignment=PP_ALIGN.LEFT):
+    """lines = list of (text, color, bold, font_size_override)"""
+    txBox = slide.shapes.add_textbox(left, top, width, height)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    for i, item in enumerate(lines):
+        if isinstance(item, str):
+            txt, clr, bld, fs = item, color, False, font_size
+        else:
+            txt = item[0]
+            clr = item[1] if len(item) > 1 else color
+            bld = item[2] if len(item) > 2 else False
+            fs  = item[3] if len(item) > 3 else font_size
+        if i == 0:
+            p = tf.paragraphs[0]
+        else:
+            p = tf.add_paragraph()
+        p.text = txt
+        p.font.size = Pt(fs)
+        p.font.color.rgb = clr
+        p.font.bold = bld
+        p.font.name = font_name
+        p.alignment = alignment
+        p.space_after = Pt(2)
+        p.line_spacing = Pt(fs * line_spacing)
+    return txBox
+
+
+def add_accent_line(slide, left, top, width, color=ACCENT_BLUE, thickness=3):
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, Pt(thickness))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = color
+    shape.line.fill.background()
+    return shape
+
+
+def add_icon_circle(slide, left, top, size, color, label="", label_size=20):
+    shape = slide.shapes.add_shape(MSO_SHAPE.OVAL, left, top, size, size)
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = color
+    shape.line.fill.background()
+    if label:
+        tf = shape.text_frame
+        tf.word_wrap = False
+        p = tf.paragraphs[0]
+        p.text = label
+        p.font.size = Pt(label_size)
+        p.font.color.rgb = TEXT_WHITE
+        p.font.bold = True
+        p.font.name = "Calibri"
+        p.alignment = PP_ALIGN.CENTER
+        tf.paragraphs[0].space_before = Pt(0)
+        tf.paragraphs[0].space_after = Pt(0)
+    return shape
+
+
+def slide_number_footer(slide, num, total):
+    return add_text_box(slide, Inches(12.2), Inches(7.05), Inches(1), Inches(0.4),
+                 f"{num}/{total}", font_size=10, color=TEXT_MUTED,
+                 alignment=PP_ALIGN.RIGHT)
+
+
+_WORKBOOK_DATES = re.compile(rb"(<dcterms:(created|modified)\b[^>]*>)[^<]*(</dcterms:\2>)")
+
+
+def _reproducible_xlsx(blob):
+    """The chart's embedded workbook with fixed dates (XlsxWriter stamps the
+    current time into ``docProps/core.xml``), so chart decks are reproducible."""
+    from deckgen.stream import _zip_info
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(blob)) as src, zipfile.ZipFile(out, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == "docProps/core.xml":
+                data = _WORKBOOK_DATES.sub(rb"\g<1>1980-01-01T00:00:00Z\g<3>", data)
+            dst.writestr(_zip_info(info.filename), data)
+    return out.getvalue()
+
+
+def add_line_chart(slide, left, top, width, height, chart, colors=CHART_COLORS,
+                   number_format="0", font_size=10, date_format="d mmm"):
+    """Native line chart on the dark theme.
+
+    ``chart`` is ``(categories, ((series_name, values), ...))`` as returned
+    by ``timeseries.chart_series()``; date categories get a date axis.
+    """
+    categories, series = chart
+    data = CategoryChartData(number_format=number_format)
+    data.categories = categories
+    if categories and hasattr(categories[0], "toordinal"):
+        data.categories.number_format = date_format
+    for name, values in series:
+        data.add_series(name, values)
+    frame = slide.shapes.add_chart(XL_CHART_TYPE.LINE, left, top, width, height, data)
+    chart = frame.chart
+    workbook = chart.part.chart_workbook
+    workbook.update_from_xlsx_blob(_reproducible_xlsx(workbook.xlsx_part.blob))
+    # Transparent chart and plot area so the slide background shows through
+    chart._chartSpace.chart.addnext(parse_xml(
+        f'<c:spPr {nsdecls("c", "a")}><a:noFill/><a:ln><a:noFill/></a:ln></c:spPr>'))
+    chart.font.size = Pt(font_size)
+    chart.font.color.rgb = TEXT_MUTED
+    chart.font.name = "Calibri"
+    chart.has_legend = len(series) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.TOP
+        chart.legend.include_in_layout = False
+    value_axis = chart.value_axis
+    value_axis.major_gridlines.format.line.color.rgb = BORDER_COLOR
+    value_axis.format.line.fill.background()
+    value_axis.tick_labels.number_format = number_format
+    value_axis.tick_labels.number_format_is_linked = False
+    chart.category_axis.format.line.color.rgb = BORDER_COLOR
+    for plot_series, color in zip(chart.plots[0].series, colors):
+        plot_series.format.line.color.rgb = color
+        plot_series.format.line.width = Pt(2)
+    return frame
+
+
+# package -> {asset digest: image part}
+_image_parts = weakref.WeakKeyDictionary()
+
+
+def add_image(slide, left, top, width, height, image):
+    """Picture of ``image`` via the asset cache; sized like ``add_picture()``.
+
+    ``image`` is an ``assets.Asset`` or anything ``AssetCache.image()``
+    takes (a path, bytes or a binary file object).
+
+    With only ``width`` or ``height`` the other follows the aspect ratio;
+    with neither the image's native size at its dpi is used. The image part
+    is created once per package and digest, so no file is read, hashed,
+    decoded or searched for among the package's parts here.
+    """
+    asset = default_cache().image(image)
+    package = slide.part.package
+    parts = _image_parts.get(package)
+    if parts is None:
+        parts = _image_parts[package] = {}
+    part = parts.get(asset.digest)
+    if part is None:
+        part = parts[asset.digest] = ImagePart(
+            package.next_image_partname(asset.ext), asset.content_type, package,
+            asset.blob, asset.filename)
+    rId = slide.part.relate_to(part, RT.IMAGE)
+    native_cx, native_cy = native_size(asset)
+    if width and not height:
+        height = int(round(native_cy * (width / native_cx)))
+    elif height and not width:
+        width = int(round(native_cx * (height / native_cy)))
+    elif not (width and height):
+        width, height = native_cx, native_cy
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    pic = shapes._spTree.add_pic(shape_id, f"Picture {shape_id - 1}", part.desc, rId,
+                                 left, top, width, height)
+    # Never a placeholder, so skip the shape factory's p:ph xpath
+    return Picture(pic, shapes)
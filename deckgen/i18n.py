@@ -0,0 +1,149 @@
+"""
+Message catalogs for localized decks.
+
+    python generate_ppt.py --locale de                  # FlowPulse_2.0_Presentation.pptx in German
+    python generate_ppt.py --locale en,de,es            # one deck per locale: ...Presentation.de.pptx
+    python -m deckgen.batch export.jsonl --locale de
+    python -m deckgen.i18n                              # coverage of every catalog
+
+    catalog = load_catalog("de")
+    catalog("Thank You")                                # "Vielen Dank"
+    catalog("User {uid}").format(uid=uid)
+
+A catalog is ``locales/<locale>.json`` next to this module: a flat object
+from the English source text to its translation, as in gettext, so English
+needs no catalog and a missing entry falls back to the source text. A
+region falls back to its language (``de-AT`` -> ``de``).
+
+Decks are localized in two places: ``spec.localize(deck, catalog)``
+translates the texts written into a spec (headings, labels, ``Format``
+patterns) and turns on shrink-to-fit for translated and data-bound text
+boxes, so a longer translation is fitted into the same card; data builders such as
+``report_data()`` and ``generate_ppt.deck_data()`` pass their strings
+through the catalog. Geometry, shapes, fitted chrome and assets are
+compiled once per spec element and shared by every locale.
+"""
+
+import json
+import os
+import sys
+from functools import lru_cache
+
+SOURCE_LOCALE = "en"
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+
+
+class LocaleError(LookupError):
+    """There is no catalog for the requested locale."""
+
+
+class Catalog:
+    """Translations for one locale; calling it translates one source string.
+
+    Source strings that are looked up but not translated are collected in
+    ``missing``; strings without letters (``"✓"``, ``"→"``) never are.
+    """
+
+    def __init__(self, locale, messages=None):
+        self.locale = locale
+        self.messages = dict(messages or {})
+        self.missing = set()
+        self._key = (locale, tuple(sorted(self.messages.items())))
+
+    def __call__(self, text):
+        if not isinstance(text, str):
+            return text
+        translated = self.messages.get(text)
+        if translated is None:
+            if self.messages and any(c.isalpha() for c in text):
+                self.missing.add(text)
+            return text
+        return translated
+
+    @property
+    def is_source(self):
+        return not self.messages
+
+    def __eq__(self, other):
+        return isinstance(other, Catalog) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"Catalog({self.locale!r}, {len(self.messages)} messages)"
+
+
+SOURCE = Catalog(SOURCE_LOCALE)
+
+
+def available_locales(directory=LOCALE_DIR):
+    """Locales with a catalog, plus the source locale, sorted."""
+    names = os.listdir(directory) if os.path.isdir(directory) else []
+    return sorted({SOURCE_LOCALE} | {n[:-5] for n in names if n.endswith(".json")})
+
+
+@lru_cache(maxsize=None)
+def load_catalog(locale=None, directory=LOCALE_DIR):
+    """The catalog for ``locale`` (``None`` or ``"en"``: the source texts); cached."""
+    if not locale or locale == SOURCE_LOCALE:
+        return SOURCE
+    for name in dict.fromkeys((locale, locale.replace("_", "-").split("-")[0])):
+        path = os.path.join(directory, f"{name}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                return Catalog(locale, json.load(fh))
+    raise LocaleError(f"no catalog for locale {locale!r} (have: {', '.join(available_locales(directory))})")
+
+
+def parse_locales(value):
+    """``"en,de"`` -> ``["en", "de"]``; ``"all"`` -> every available locale."""
+    if value == "all":
+        return available_locales()
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def localized_path(path, locale):
+    """``deck.pptx`` -> ``deck.de.pptx``."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{locale}{ext}"
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    """Render every deck in every locale in memory and report untranslated strings."""
+    import argparse
+    import io
+
+    import generate_ppt
+    from deckgen.report import build_report
+    from deckgen.spec import localize, render_deck
+
+    parser = argparse.ArgumentParser(description="Check message catalog coverage of the decks.")
+    parser.add_argument("locales", nargs="*", help="locales to check (default: every catalog)")
+    args = parser.parse_args(argv)
+
+    week = [{"date": f"2026-10-{d:02d}", "totalMinutes": 60, "productiveMinutes": 40,
+             "distractionMinutes": 20, "focusScore": 70, "topDomain": "github.com"} for d in range(5, 12)]
+    status = 0
+    for locale in args.locales or [l for l in available_locales() if l != SOURCE_LOCALE]:
+        try:
+            catalog = load_catalog(locale)
+        except LocaleError as exc:
+            print(f"❌ {exc}", file=sys.stderr)
+            return 1
+        render_deck(localize(generate_ppt.DECK, catalog), generate_ppt.deck_data(catalog=catalog))
+        build_report("u1", week, history=week, catalog=catalog).save(io.BytesIO())
+        if catalog.missing:
+            status = 1
+            print(f"⚠️  {locale}: {len(catalog.missing)} untranslated")
+            for text in sorted(catalog.missing):
+                print(f"   {json.dumps(text, ensure_ascii=False)}")
+        else:
+            print(f"✅ {locale}: {len(catalog.messages)} messages, all deck texts translated")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
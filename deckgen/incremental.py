@@ -0,0 +1,215 @@
+"""
+Incremental deck rebuilds keyed by per-slide content hashes.
+
+Every slide is hashed from everything that determines its XML: the slide
+spec, the data bound into it, its position / the deck length (footer) and
+the renderer itself (the ``deckgen`` sources and the python-pptx version).
+Rendered slide XML and rels are kept in an on-disk cache under that hash, so
+a rebuild only renders slides whose hash changed and copies the rest into
+the new package.
+
+A deck-level hash over all slide hashes is recorded next to the cache for
+each output path. When it matches and the output file is unchanged since it
+was written, the rebuild is a no-op and the file is not touched. With
+``optimize`` the deck goes through ``deckgen.optimize`` before it replaces
+the output, so the recorded state is that of the optimized file.
+
+The record also lists the slide hashes the build used. After a build, the
+slides its previous build used that no recorded deck uses any more are
+deleted, so the cache holds the current slides of each output rather than
+every version ever rendered.
+"""
+
+import hashlib
+import json
+import os
+
+import pptx
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from deckgen.master import layout_for
+from deckgen.optimize import optimize_file
+from deckgen.spec import deck_pages, render_slide
+from deckgen.stream import DeckWriter
+
+CACHE_DIR = ".deckcache"
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_renderer_hash = None
+
+
+def renderer_hash():
+    """Hash of the deckgen sources and python-pptx version; salts every key."""
+    global _renderer_hash
+    if _renderer_hash is None:
+        digest = hashlib.sha256(pptx.__version__.encode())
+        for name in sorted(os.listdir(_PACKAGE_DIR)):
+            if name.endswith(".py"):
+                with open(os.path.join(_PACKAGE_DIR, name), "rb") as fh:
+                    digest.update(name.encode() + b"\0" + fh.read())
+        _renderer_hash = digest.hexdigest()
+    return _renderer_hash
+
+
+def slide_hash(spec, data, num, total, salt=""):
+    """Content hash of one slide's inputs (spec and data reprs are deterministic)."""
+    key = repr((renderer_hash(), salt, spec, data, num, total))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _template_salt(template):
+    if template is None:
+        return ""
+    if isinstance(template, (bytes, bytearray)):
+        return hashlib.sha256(template).hexdigest()
+    with open(template, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+class SlideCache:
+    """Rendered slide XML + rels on disk, sharded by the first hash byte."""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def _path(self, key, ext):
+        return os.path.join(self.root, "slides", key[:2], f"{key}.{ext}")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key, "xml"))
+
+    def get(self, key):
+        try:
+            with open(self._path(key, "xml"), "rb") as fh:
+                blob = fh.read()
+            with open(self._path(key, "rels"), "rb") as fh:
+                rels = fh.read()
+        except FileNotFoundError:
+            return None
+        return blob, rels
+
+    def discard(self, key):
+        # XML first: without it the entry is a miss, whatever is left
+        for ext in ("xml", "rels"):
+            try:
+                os.remove(self._path(key, ext))
+            except FileNotFoundError:
+                pass
+
+    def put(self, key, blob, rels):
+        os.makedirs(os.path.dirname(self._path(key, "xml")), exist_ok=True)
+        # rels first so a reader never finds the XML without its rels
+        for ext, data in (("rels", rels), ("xml", blob)):
+            path = self._path(key, ext)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+
+    def _manifest_path(self, output_path):
+        name = hashlib.sha256(os.path.abspath(output_path).encode()).hexdigest()
+        return os.path.join(self.root, "decks", f"{name}.json")
+
+    def deck_state(self, output_path):
+        try:
+            with open(self._manifest_path(output_path), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def record_deck(self, output_path, deck_key, keys=()):
+        st = os.stat(output_path)
+        path = self._manifest_path(output_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"deck": deck_key, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                       "keys": sorted(set(keys))}, fh)
+        os.replace(tmp, path)
+
+    def prune(self, keys):
+        """Delete the slides among ``keys`` that no recorded deck uses; returns how many."""
+        candidates = set(keys)
+        # Deck records of incremental builds and of deckgen.patch
+        for records in (os.path.join(self.root, "decks"), os.path.join(self.root, "patch")):
+            for name in os.listdir(records) if candidates and os.path.isdir(records) else ():
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(records, name), encoding="utf-8") as fh:
+                        candidates.difference_update(json.load(fh).get("keys", ()))
+                except (OSError, ValueError):
+                    return 0            # cannot tell what is in use: keep everything
+        for key in candidates:
+            self.discard(key)
+        return len(candidates)
+
+
+def _up_to_date(cache, output_path, deck_key):
+    state = cache.deck_state(output_path)
+    if state is None or state.get("deck") != deck_key:
+        return False
+    try:
+        st = os.stat(output_path)
+    except FileNotFoundError:
+        return False
+    return st.st_size == state.get("size") and st.st_mtime_ns == state.get("mtime_ns")
+
+
+def _cacheable(part):
+    # Cached XML is only valid in a new package if it points at nothing but
+    # its layout; slides with media would need those parts copied as well
+    return all(rel.reltype == RT.SLIDE_LAYOUT for rel in part.rels.values())
+
+
+def build_incremental(deck, data, output, cache_dir=CACHE_DIR, template=None, clone=True, master=False,
+                      optimize=False):
+    """Write ``deck`` to ``output``, rendering only slides whose hash changed.
+
+    ``output`` is a path or a binary file object; the no-op check,
+    ``optimize`` and cache eviction only apply to paths. ``master`` is passed
+    on to ``DeckWriter``. Returns a summary dict; with ``optimize`` its
+    ``"optimized"`` entry holds the ``deckgen.optimize`` stats.
+    """
+    cache = SlideCache(cache_dir)
+    total, pages = deck_pages(deck, data)
+    pages = list(pages)
+    salt = _template_salt(template) + (":master" if master else "")
+    keys = [
+        slide_hash(compiled.spec, slide_data, num, total, salt)
+        for num, (compiled, slide_data) in enumerate(pages, start=1)
+    ]
+    deck_key = hashlib.sha256(("".join(keys) + (":optimized" if optimize else "")).encode()).hexdigest()
+    summary = {"slides": total, "rendered": 0, "reused": 0, "unchanged": False, "evicted": 0}
+
+    is_path = isinstance(output, (str, os.PathLike))
+    if is_path and _up_to_date(cache, output, deck_key):
+        summary.update(reused=total, unchanged=True)
+        return summary
+    previous = (cache.deck_state(output) or {}) if is_path else {}
+
+    # DeckWriter writes a path through a temp file and replaces it atomically
+    with DeckWriter(output, template, master) as writer:
+        for num, ((spec, slide_data), key) in enumerate(zip(pages, keys), start=1):
+            cached = cache.get(key)
+            if cached is not None:
+                # The new slide's own rels: themed layouts are numbered in the
+                # order this build first uses them, which may have changed
+                slide = writer.add_slide(layout_for(writer.prs, spec, total))
+                writer.flush(slide, cached[0])
+                summary["reused"] += 1
+                continue
+            slide = render_slide(writer.prs, spec, slide_data, num, total, clone)
+            part = slide.part
+            blob, rels = part.blob, part.rels.xml
+            if _cacheable(part):
+                cache.put(key, blob, rels)
+            writer.flush(slide, blob, rels)
+            summary["rendered"] += 1
+
+    if is_path:
+        if optimize:
+            summary["optimized"] = optimize_file(output)
+        cache.record_deck(output, deck_key, keys)
+        summary["evicted"] = cache.prune(set(previous.get("keys", ())) - set(keys))
+    return summary
@@ -0,0 +1,211 @@
+"""
+Text measurement, wrapping and shrink-to-fit for the fixed-size text boxes.
+
+    width = layout.text_width("docs.google.com", "Calibri", 13)        # points
+    lines = layout.wrap(text, Inches(2.3), "Calibri", 13)
+    size = layout.fit_text(text, Inches(2.3), Inches(0.35), 13, min_size=9)
+
+Widths come from ``deckgen.fonts`` advance tables, so nothing is rasterized.
+Wrapping is greedy at spaces, as PowerPoint does with ``word_wrap`` on, and a
+word wider than the line is broken between characters. Box sizes are the
+shape's extents in EMU; the default text-frame insets are subtracted here.
+
+Every function is memoized on its arguments: a deck binds the same strings
+into the same boxes over and over (and a batch of reports does so thousands
+of times), so after the first deck almost every fit is a dict lookup.
+Fitted sizes move in half-point steps so they also reuse ``fastxml``
+templates.
+"""
+
+import math
+from functools import lru_cache
+
+from pptx.util import Inches, Pt
+
+from deckgen.fonts import font_table
+
+MIN_FONT_SIZE = 8
+SIZE_STEP = 0.5
+
+# python-pptx text boxes keep PowerPoint's default insets
+INSET_X = Inches(0.1)
+INSET_Y = Inches(0.05)
+PARAGRAPH_SPACE_AFTER = 2    # points; ``add_multiline_box`` sets Pt(2)
+
+# Slack for rounding in the advance tables; a box that is exactly full fits
+_TOLERANCE = 0.5
+
+_CACHE = 1 << 16
+
+
+@lru_cache(maxsize=_CACHE)
+def _em_width(text, font_name, bold):
+    return font_table(font_name, bold).em_width(text)
+
+
+@lru_cache(maxsize=_CACHE)
+def text_width(text, font_name="Calibri", size=18, bold=False):
+    """Advance width of one line of ``text`` in points."""
+    return _em_width(text, font_name, bold) * size
+
+
+def clear_caches():
+    for fn in (_em_width, text_width, wrap_points, fit_text, _fit_lines):
+        fn.cache_clear()
+
+
+def line_height(size, line_spacing=1.2, font_name="Calibri", bold=False):
+    """Baseline-to-baseline distance in points, as the helpers set it."""
+    if line_spacing != 1.0:
+        return size * line_spacing
+    # Single spacing: the font's own ascent + descent + gap
+    return size * font_table(font_name, bold).line_height
+
+
+def _split_word(word, width, font_name, size, bold):
+    table = font_table(font_name, bold)
+    pieces, current, current_w = [], "", 0.0
+    for ch in word:
+        ch_w = table.em_width(ch) * size
+        if current and current_w + ch_w > width:
+            pieces.append(current)
+            current, current_w = ch, ch_w
+        else:
+            current += ch
+            current_w += ch_w
+    pieces.append(current)
+    return pieces
+
+
+@lru_cache(maxsize=_CACHE)
+def wrap_points(text, width, font_name="Calibri", size=18, bold=False):
+    """Wrap ``text`` into lines no wider than ``width`` points."""
+    lines = []
+    space = text_width(" ", font_name, size, bold)
+    for paragraph in text.replace("\v", "\n").split("\n"):
+        current, current_w = "", 0.0
+        for word in paragraph.split(" "):
+            word_w = text_width(word, font_name, size, bold)
+            if current and current_w + space + word_w <= width + _TOLERANCE:
+                current += " " + word
+                current_w += space + word_w
+                continue
+            if current:
+                lines.append(current)
+            if word_w > width + _TOLERANCE:
+                *full, word = _split_word(word, width, font_name, size, bold)
+                lines.extend(full)
+                word_w = text_width(word, font_name, size, bold)
+            current, current_w = word, word_w
+        lines.append(current)
+    return tuple(lines)
+
+
+def wrap(text, box_width, font_name="Calibri", size=18, bold=False):
+    """Lines ``text`` wraps to in a text box ``box_width`` EMU wide."""
+    return wrap_points(text, _inner(box_width, INSET_X), font_name, size, bold)
+
+
+def _inner(length, inset):
+    return max(0.0, (int(length) - 2 * inset) / Pt(1))
+
+
+def _fits_text(text, width, height, size, font_name, bold, line_spacing):
+    lines = wrap_points(text, width, font_name, size, bold)
+    return len(lines) * line_height(size, line_spacing, font_name, bold) <= height + _TOLERANCE
+
+
+def _largest(fits, font_size, min_size):
+    """Largest size in ``SIZE_STEP`` steps in ``[min_size, font_size]`` that fits."""
+    if font_size <= min_size or fits(font_size):
+        return font_size
+    # Binary search over min_size, min_size + step, ... below font_size
+    best, lo, hi = min_size, 0, math.ceil((font_size - min_size) / SIZE_STEP) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        size = min_size + mid * SIZE_STEP
+        if fits(size):
+            best, lo = size, mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+@lru_cache(maxsize=_CACHE)
+def fit_text(text, width, height, font_size, font_name="Calibri", bold=False,
+             line_spacing=1.2, min_size=MIN_FONT_SIZE):
+    """Font size at which ``text`` fits a ``width`` x ``height`` EMU text box.
+
+    Returns ``font_size`` when it already fits, otherwise the largest size
+    down to ``min_size`` (in ``SIZE_STEP`` steps) at which the wrapped text
+    is no taller than the box. At ``min_size`` the text may still overflow.
+    """
+    if not text:
+        return font_size
+    w, h = _inner(width, INSET_X), _inner(height, INSET_Y)
+    return _largest(lambda size: _fits_text(text, w, h, size, font_name, bold, line_spacing),
+                    font_size, min_size)
+
+
+def _normalize(lines, font_size):
+    """``add_multiline_box`` items as ``(text, color, bold, size)`` tuples."""
+    out = []
+    for item in lines:
+        if isinstance(item, str):
+            out.append((item, None, False, font_size))
+        else:
+            out.append((
+                item[0],
+                item[1] if len(item) > 1 else None,
+                item[2] if len(item) > 2 else False,
+                item[3] if len(item) > 3 else None,
+            ))
+    return tuple(out)
+
+
+def _lines_height(lines, width, font_size, scale, font_name, line_spacing):
+    total = 0.0
+    for text, _, bold, size in lines:
+        size = _scaled(size or font_size, scale)
+        rows = len(wrap_points(text, width, font_name, size, bold))
+        total += rows * size * line_spacing + PARAGRAPH_SPACE_AFTER
+    return total
+
+
+def _scaled(size, scale):
+    return max(SIZE_STEP, round(size * scale / SIZE_STEP) * SIZE_STEP)
+
+
+@lru_cache(maxsize=_CACHE)
+def _fit_lines(lines, width, height, font_size, font_name, line_spacing, min_size):
+    w, h = _inner(width, INSET_X), _inner(height, INSET_Y)
+    size = _largest(
+        lambda size: _lines_height(lines, w, font_size, size / font_size, font_name, line_spacing)
+        <= h + _TOLERANCE,
+        font_size, min_size,
+    )
+    return size / font_size
+
+
+def fit_lines(lines, width, height, font_size=16, font_name="Calibri", line_spacing=1.5,
+              min_size=MIN_FONT_SIZE):
+    """Shrink ``add_multiline_box`` content to fit a ``width`` x ``height`` EMU box.
+
+    Returns ``(font_size, lines)``: every paragraph, including ones with their
+    own size override, is scaled by the same factor so the hierarchy is kept.
+    ``min_size`` bounds the base ``font_size``.
+    """
+    if not lines:
+        return font_size, lines
+    normal = _normalize(lines, font_size)
+    scale = _fit_lines(normal, int(width), int(height), font_size, font_name, line_spacing, min_size)
+    if scale == 1:
+        return font_size, lines
+    fitted = []
+    for item, (_, _, _, size) in zip(lines, normal):
+        if isinstance(item, str):
+            item = (item,)
+        item = tuple(item)
+        fitted.append(item[:3] + (_scaled(size or font_size, scale),) + item[4:]
+                      if len(item) > 3 else item)
+    return _scaled(font_size, scale), fitted
@@ -0,0 +1,390 @@
+"""
+Manifest-driven report runs that resume where a killed run stopped.
+
+    python -m deckgen.manifest jobs.jsonl --export export.jsonl -j 8
+    python -m deckgen.manifest jobs.jsonl --export logs.parquet --activity-logs --optimize
+    python -m deckgen.manifest jobs.jsonl --export export.jsonl --restart   # ignore the checkpoint
+
+The manifest is JSONL, one report per line::
+
+    {"uid": "u42", "from": "2026-10-01", "to": "2026-10-31", "output": "reports/u42-oct.pptx"}
+    {"uid": "u43", "to": "2026-10-11", "template": "brand.pptx", "trend": true, "locale": "de"}
+
+``to`` defaults to the user's latest day and ``from`` to the ``REPORT_DAYS``
+days ending at ``to`` (the daily breakdown pages through longer ranges);
+``output`` defaults to ``<out-dir>/<uid>.pptx``; ``template`` is a .pptx to
+start from instead of python-pptx's default one; ``trend`` adds the chart
+slide over the user's history up to ``to``; ``locale`` translates the deck
+(``deckgen.i18n``).
+
+Jobs run in chunks of ``--chunksize`` on a pool of ``-j`` workers
+(``deckgen.batch``'s, so templates and branding are loaded once per process).
+Every finished job is appended to the checkpoint (``<manifest>.done`` by
+default), a JSONL log with its timing, size or error. On start, jobs logged
+as done whose output still exists are skipped, so re-running the same
+command after a crash or ``kill`` picks up the rest. Job ids hash the
+manifest entry and the options together with everything the deck is
+rendered from: the user's days in the export, the template's bytes, the
+locale's catalog and the branding. An edited entry, a newer export with
+more days for a user or a changed template is rendered again; users whose
+inputs did not change are still skipped.
+Decks are written to a temp file and renamed, and logged only afterwards:
+a deck that is in the log is complete.
+
+A failing job (unknown user, bad date, broken template) is logged with its
+error and the run goes on; failed jobs are retried on the next run. If a
+worker process dies, the jobs it had not finished are logged as failed too.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+
+from deckgen import batch, remote
+from deckgen.activity import load_activity
+from deckgen.i18n import LocaleError, load_catalog
+from deckgen.optimize import optimize_package
+from deckgen.report import REPORT_DAYS, build_report, date_window, load_export
+from deckgen.stream import save
+
+_templates = {}
+
+
+class ManifestError(ValueError):
+    """A manifest line is not a JSON object with a ``uid``."""
+
+
+def load_manifest(path):
+    """The manifest's entries as dicts, in file order."""
+    entries = []
+    with open(path, encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as exc:
+                raise ManifestError(f"{path}:{lineno}: {exc}") from None
+            if not isinstance(entry, dict) or "uid" not in entry:
+                raise ManifestError(f"{path}:{lineno}: expected an object with a uid")
+            entries.append(entry)
+    return entries
+
+
+def job_id(entry, **options):
+    """Stable id of one manifest entry rendered with ``options``."""
+    key = json.dumps([entry, options], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _digest(value):
+    key = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _file_digest(path):
+    """Digest of a template's bytes; ``None`` if it cannot be read (the job fails then)."""
+    try:
+        with open(path, "rb") as fh:
+            return hashlib.sha256(fh.read()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def _catalog_digest(locale):
+    try:
+        return _digest(sorted(load_catalog(locale).messages.items()))
+    except LocaleError:
+        return None
+
+
+def _branding_digest(branding):
+    if branding is None:
+        return None
+    logo = branding["logo"]
+    return _digest([branding["version"], branding["title"], logo.digest if logo else None, branding["theme"]])
+
+
+# ── Checkpoint ────────────────────────────────────────────────────────────────
+
+class Checkpoint:
+    """Append-only JSONL log of finished jobs.
+
+    ``done`` maps the id of every job that succeeded to its record. Each
+    record is flushed as it is written, so only the line being written when
+    the process is killed can be lost; a torn last line is ignored.
+    """
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        self.done = {}
+        if restart and os.path.exists(path):
+            os.remove(path)
+        torn = False
+        if os.path.exists(path):
+            with open(path, "rb") as fh:
+                for line in fh:
+                    torn = not line.endswith(b"\n")
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "error" in record:
+                        self.done.pop(record["id"], None)
+                    else:
+                        self.done[record["id"]] = record
+        self._fh = open(path, "a", encoding="utf-8")
+        if torn:
+            self._fh.write("\n")
+
+    def record(self, result):
+        self._fh.write(json.dumps(result, separators=(",", ":")) + "\n")
+        self._fh.flush()
+        if "error" in result:
+            self.done.pop(result["id"], None)
+        else:
+            self.done[result["id"]] = result
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── Jobs ──────────────────────────────────────────────────────────────────────
+
+def _template_bytes(path):
+    """The template's bytes, read once per worker; ``None`` is the default template."""
+    if path is None:
+        return batch._template
+    if path not in _templates:
+        with open(path, "rb") as fh:
+            _templates[path] = fh.read()
+    return _templates[path]
+
+
+def _render(job):
+    days = job["days"]
+    if not days:
+        raise LookupError(f"no activity for user {job['uid']} in the export")
+    end = date.fromisoformat(job["to"] or days[-1]["date"])
+    start = date.fromisoformat(job["from"]) if job["from"] else end - timedelta(days=REPORT_DAYS - 1)
+    if start > end:
+        raise ValueError(f"empty date range {start} – {end}")
+    window = date_window(days, start.isoformat(), end.isoformat())
+    history = [d for d in days if d["date"] <= window[-1]["date"]] if job["trend"] else None
+    prs = build_report(job["uid"], window, template=_template_bytes(job["template"]), history=history,
+                       branding=batch._branding, master=job["master"], catalog=load_catalog(job["locale"]))
+    buf = io.BytesIO()
+    save(prs, buf)
+    blob = buf.getvalue()
+    if job["optimize"]:
+        blob, _ = optimize_package(blob)
+
+    output = job["output"]
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp = f"{output}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(blob)
+        os.replace(tmp, output)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return len(blob)
+
+
+def run_job(job):
+    """Render one job; returns its checkpoint record (``bytes`` or ``error``, and ``seconds``)."""
+    t0 = time.perf_counter()
+    result = {"id": job["id"], "uid": job["uid"], "output": job["output"]}
+    try:
+        result["bytes"] = _render(job)
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["seconds"] = round(time.perf_counter() - t0, 4)
+    return result
+
+
+def run_chunk(jobs):
+    return [run_job(job) for job in jobs]
+
+
+def plan_jobs(entries, users, out_dir="reports", master=False, optimize=False, branding=None):
+    """One job dict per manifest entry, with the user's days attached.
+
+    The id covers the entry, the options and the resolved inputs (see the
+    module docstring); templates and catalogs are hashed once per run.
+    """
+    templates, catalogs = {}, {}
+    brand = _branding_digest(branding)
+    jobs = []
+    for entry in entries:
+        uid = str(entry["uid"])
+        template, locale = entry.get("template"), entry.get("locale")
+        if template is not None and template not in templates:
+            templates[template] = _file_digest(template)
+        if locale not in catalogs:
+            catalogs[locale] = _catalog_digest(locale)
+        jobs.append({
+            "id": job_id(entry, master=master, optimize=optimize, days=_digest(users.get(uid)),
+                         template=templates.get(template), catalog=catalogs[locale], branding=brand),
+            "uid": uid,
+            "from": entry.get("from"),
+            "to": entry.get("to"),
+            "template": entry.get("template"),
+            "trend": bool(entry.get("trend")),
+            "locale": entry.get("locale"),
+            "output": entry.get("output") or os.path.join(out_dir, f"{uid}.pptx"),
+            "master": master,
+            "optimize": optimize,
+            "days": users.get(uid),
+        })
+    return jobs
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def run_manifest(manifest_path, export_path, checkpoint=None, workers=None, chunksize=8, out_dir="reports",
+                 activity_logs=False, config_url=None, master=False, optimize=False, restart=False,
+                 progress=None):
+    """Render every job in ``manifest_path`` not already done according to ``checkpoint``.
+
+    ``checkpoint`` defaults to ``<manifest>.done``; ``restart=True`` discards
+    it first. ``progress`` is called with each job's record as it finishes.
+    The other options are ``deckgen.batch.render_batch``'s. Returns a
+    summary dict.
+    """
+    branding = remote.prefetch(config_url) if config_url else None
+    entries = load_manifest(manifest_path)
+    users = load_activity(export_path) if activity_logs else load_export(export_path)
+    fetch = None
+    if branding is not None:
+        try:
+            branding, fetch = branding.result()
+        except remote.FetchError as exc:
+            branding, fetch = None, {"error": str(exc)}
+
+    results = []
+    with Checkpoint(checkpoint or f"{manifest_path}.done", restart) as ckpt:
+        jobs = plan_jobs(entries, users, out_dir, master, optimize, branding)
+        todo = [j for j in jobs if not (j["id"] in ckpt.done and os.path.exists(j["output"]))]
+        chunks = [todo[i:i + max(1, chunksize)] for i in range(0, len(todo), max(1, chunksize))]
+        workers = workers or os.cpu_count() or 1
+
+        def finish(records):
+            for record in records:
+                ckpt.record(record)
+                results.append(record)
+                if progress:
+                    progress(record)
+
+        t0 = time.perf_counter()
+        if workers == 1:
+            batch._init_worker(branding)
+            for chunk in chunks:
+                finish(run_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=batch._init_worker,
+                                     initargs=(branding,)) as pool:
+                futures = {pool.submit(run_chunk, chunk): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    try:
+                        finish(future.result())
+                    except BrokenProcessPool as exc:
+                        finish({"id": j["id"], "uid": j["uid"], "output": j["output"],
+                                "error": f"worker died: {exc}", "seconds": 0.0} for j in futures[future])
+        elapsed = time.perf_counter() - t0
+
+    ok = [r for r in results if "error" not in r]
+    times = sorted(r["seconds"] for r in ok)
+    slowest = max(ok, key=lambda r: r["seconds"], default=None)
+    return {
+        "fetch": fetch,
+        "jobs": len(jobs),
+        "skipped": len(jobs) - len(todo),
+        "rendered": len(ok),
+        "failed": [r for r in results if "error" in r],
+        "workers": workers,
+        "seconds": elapsed,
+        "decks_per_sec": len(ok) / elapsed if elapsed else 0.0,
+        "bytes": sum(r["bytes"] for r in ok),
+        "p50": _percentile(times, 0.5),
+        "p95": _percentile(times, 0.95),
+        "slowest": slowest,
+    }
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the report decks listed in a job manifest, resumably.")
+    parser.add_argument("manifest", help="JSONL manifest: uid, from, to, template, output, trend, locale per line")
+    parser.add_argument("--export", required=True, help="JSONL export of dailyStats / dailyRealtime documents")
+    parser.add_argument("--activity-logs", action="store_true",
+                        help="the export is a raw activityLogs dump (.jsonl or .parquet) to aggregate first")
+    parser.add_argument("--checkpoint", default=None, metavar="PATH",
+                        help="log of finished jobs to resume from (default: <manifest>.done)")
+    parser.add_argument("--restart", action="store_true", help="discard the checkpoint and render every job")
+    parser.add_argument("-o", "--out-dir", default="reports", help="directory for jobs without an output path")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=8, help="jobs handed to a worker at a time")
+    parser.add_argument("--config-url", default=remote.CONFIG_URL, metavar="URL",
+                        help="Worker to fetch the report branding from (default: $DECKGEN_CONFIG_URL)")
+    parser.add_argument("--master", action="store_true",
+                        help="draw background, top bar and footer on a FlowPulse theme and master")
+    parser.add_argument("--optimize", action="store_true",
+                        help="shrink every deck: drop unused parts, dedupe media, recompress")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every job as it finishes")
+    args = parser.parse_args(argv)
+
+    def progress(record):
+        if "error" in record:
+            print(f"❌ {record['uid']}: {record['error']}", file=sys.stderr)
+        elif args.verbose:
+            print(f"   {record['uid']}: {record['output']}  {record['bytes']:,} bytes  "
+                  f"{record['seconds'] * 1000:.0f} ms")
+
+    try:
+        summary = run_manifest(args.manifest, args.export, args.checkpoint, args.workers, args.chunksize,
+                               args.out_dir, args.activity_logs, args.config_url, args.master, args.optimize,
+                               args.restart, progress)
+    except (ManifestError, OSError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    fetch = summary["fetch"]
+    if fetch and "error" in fetch:
+        print(f"⚠️  Branding unavailable, using the built-in one: {fetch['error']}")
+    elif fetch:
+        print("🎨 Branding: " + ", ".join(f"{k} {v}" for k, v in fetch.items()))
+    failed = summary["failed"]
+    print(f"{'⚠️ ' if failed else '✅'} {summary['rendered']} of {summary['jobs']} jobs rendered "
+          f"with {summary['workers']} worker(s) in {summary['seconds']:.2f}s "
+          f"({summary['skipped']} done in an earlier run, {len(failed)} failed)")
+    if summary["rendered"]:
+        slowest = summary["slowest"]
+        print(f"   {summary['decks_per_sec']:.1f} decks/sec, {summary['bytes'] / (1 << 20):.1f} MB; "
+              f"per job p50 {summary['p50'] * 1000:.0f} ms, p95 {summary['p95'] * 1000:.0f} ms, "
+              f"slowest {slowest['uid']} {slowest['seconds'] * 1000:.0f} ms")
+    if failed:
+        print("   failed jobs are retried on the next run")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+FlowPulse theme, slide master and layouts: slide chrome drawn once per deck.
+
+    prs = render_deck(DECK, data, master=True)
+    write_deck(DECK, data, "deck.pptx", master=True)
+    python generate_ppt.py --master
+
+By default every slide carries its own chrome: an explicit ``p:bg``, the top
+accent bar and the ``n/total`` footer, and every colour is a literal
+``a:srgbClr``; the package also ships the eleven layouts of python-pptx's
+default template, none of which is used. With ``master=True``:
+
+* the theme's colour scheme is the FlowPulse palette (``SCHEME``) and the
+  master maps the dark colours to the background (``bg1`` = ``BG_DARK``,
+  ``tx1`` = ``TEXT_WHITE``) and draws the background;
+* every stock layout is removed; a layout is added per distinct chrome
+  (background, top bar, footer) when the first slide needing it is rendered,
+  so only layouts in use are written;
+* the footer lives on the layout as a text box with a slide-number field
+  and the deck total, so slides render without background or footer;
+* palette colours on slides become ``a:schemeClr`` references (``to_scheme()``).
+
+Charts keep literal colours; colours outside the palette (e.g. rebranded
+accents from ``spec.recolor()``) stay literal too.
+"""
+
+import weakref
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import nsdecls, qn
+from pptx.parts.slide import SlideLayoutPart
+from pptx.shapes.shapetree import SlideShapes
+
+from deckgen import helpers
+from deckgen.theme import (
+    BG_DARK, BG_CARD, ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK,
+    TEXT_WHITE, TEXT_MUTED, BORDER_COLOR, SLIDE_WIDTH, TOP_BAR_HEIGHT,
+)
+
+THEME_NAME = "FlowPulse"
+
+# Theme colour slot -> palette colour
+THEME_COLORS = {
+    "dk1": BG_DARK,
+    "lt1": TEXT_WHITE,
+    "dk2": BG_CARD,
+    "lt2": TEXT_MUTED,
+    "accent1": ACCENT_BLUE,
+    "accent2": ACCENT_GREEN,
+    "accent3": ACCENT_AMBER,
+    "accent4": ACCENT_PINK,
+    "accent5": BORDER_COLOR,
+}
+
+# Dark theme: backgrounds are the dark slots, text the light ones
+CLR_MAP = {"bg1": "dk1", "tx1": "lt1", "bg2": "dk2", "tx2": "lt2"}
+
+# Palette colour -> the scheme colour slides refer to it by
+SCHEME = {
+    color: {v: k for k, v in CLR_MAP.items()}.get(slot, slot)
+    for slot, color in THEME_COLORS.items()
+}
+_BY_HEX = {str(color): name for color, name in SCHEME.items()}
+
+# Fixed so that the same deck always serialises to the same bytes
+_SLIDENUM_FIELD_ID = "{6F4E2C1A-3B5D-4E7F-9A1B-2C3D4E5F6A7B}"
+
+_LAYOUT_XML = (
+    f'<p:sldLayout {nsdecls("a", "r", "p")} preserve="1"><p:cSld name="{{name}}"><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/><a:chOff x="0" y="0"/>'
+    '<a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr></p:spTree></p:cSld>'
+    '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>'
+)
+
+# presentation part -> {"layouts": {chrome key: layout}, "next_id": int}
+_decks = weakref.WeakKeyDictionary()
+
+
+def to_scheme(element):
+    """Rewrite palette ``a:srgbClr`` colours under ``element`` as ``a:schemeClr``."""
+    scheme_tag = qn("a:schemeClr")
+    for clr in element.iter(qn("a:srgbClr")):
+        name = _BY_HEX.get(clr.get("val"))
+        if name is not None:
+            clr.tag = scheme_tag
+            clr.set("val", name)
+
+
+def _theme_xml(blob):
+    theme = etree.fromstring(blob)
+    theme.set("name", THEME_NAME)
+    scheme = theme.find(f"{qn('a:themeElements')}/{qn('a:clrScheme')}")
+    scheme.set("name", THEME_NAME)
+    for slot, color in THEME_COLORS.items():
+        el = scheme.find(qn(f"a:{slot}"))
+        el[:] = [etree.Element(qn("a:srgbClr"), val=str(color))]
+    return etree.tostring(theme, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def apply_master(prs):
+    """Install the FlowPulse theme and master on ``prs`` and drop its layouts.
+
+    Afterwards slides must be added on a layout from ``layout_for()``.
+    """
+    master = prs.slide_master
+    theme = master.part.part_related_by(RT.THEME)
+    theme._blob = _theme_xml(theme.blob)
+    clr_map = master._element.find(qn("p:clrMap"))
+    for name, slot in CLR_MAP.items():
+        clr_map.set(name, slot)
+    helpers.add_bg(master, BG_DARK)
+    to_scheme(master._element.cSld.bg)
+
+    ids = [int(el.get("id")) for el in prs.part._element.sldMasterIdLst]
+    layout_ids = master._element.get_or_add_sldLayoutIdLst()
+    for el in list(layout_ids):
+        ids.append(int(el.get("id")))
+        layout_ids.remove(el)
+        master.part.drop_rel(el.rId)
+    _decks[prs.part] = {"layouts": {}, "next_id": max(ids) + 1}
+    return prs
+
+
+class _Canvas:
+    """Just enough of a slide for the shape helpers to draw on a layout."""
+
+    def __init__(self, layout):
+        self.shapes = SlideShapes(layout._element.cSld.spTree, layout)
+        self.background = layout.background
+
+
+def _footer(canvas, total):
+    shape = helpers.slide_number_footer(canvas, "‹#›", total)
+    p = shape.text_frame.paragraphs[0]._p
+    run = p.r_lst[0]
+    # "‹#›/total" -> slide-number field + "/total"
+    field = etree.Element(qn("a:fld"), id=_SLIDENUM_FIELD_ID, type="slidenum")
+    run.addprevious(field)
+    etree.SubElement(field, qn("a:t")).text = "‹#›"
+    run.t.text = f"/{total}"
+
+
+def _new_layout(prs, state, key):
+    bg, top_bar, total = key
+    master = prs.slide_master
+    package = prs.part.package
+    partname = package.next_partname("/ppt/slideLayouts/slideLayout%d.xml")
+    name = f"{THEME_NAME} {len(state['layouts']) + 1}"
+    part = SlideLayoutPart.load(partname, CT.PML_SLIDE_LAYOUT, package,
+                                _LAYOUT_XML.replace("{name}", name).encode())
+    part.relate_to(master.part, RT.SLIDE_MASTER)
+    rId = master.part.relate_to(part, RT.SLIDE_LAYOUT)
+    layout_id = master._element.get_or_add_sldLayoutIdLst()._add_sldLayoutId()
+    layout_id.set("id", str(state["next_id"]))
+    layout_id.set(qn("r:id"), rId)
+    state["next_id"] += 1
+
+    layout = part.slide_layout
+    canvas = _Canvas(layout)
+    if bg is not None and bg != BG_DARK:
+        helpers.add_bg(canvas, bg)
+    if top_bar is not None:
+        helpers.add_shape(canvas, 0, 0, SLIDE_WIDTH, TOP_BAR_HEIGHT, top_bar)
+    if total is not None:
+        _footer(canvas, total)
+    to_scheme(layout._element.cSld)
+    return layout
+
+
+def layout_for(prs, compiled, total):
+    """The layout carrying ``compiled``'s chrome, or ``None`` if ``prs`` is not themed."""
+    state = _decks.get(prs.part)
+    if state is None:
+        return None
+    key = (compiled.bg, compiled.top_bar, total if compiled.footer else None)
+    layout = state["layouts"].get(key)
+    if layout is None:
+        layout = state["layouts"][key] = _new_layout(prs, state, key)
+    return layout
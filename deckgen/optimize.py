@@ -0,0 +1,328 @@
+"""
+Size optimizer for finished decks: the same slides in fewer bytes.
+
+    python -m deckgen.optimize deck.pptx                    # in place
+    python -m deckgen.optimize deck.pptx -o small.pptx
+    python -m deckgen.optimize reports/*.pptx
+    python generate_ppt.py --optimize                       # build, then optimize
+    python -m deckgen.batch export.jsonl --optimize
+
+    stats = optimize_file("deck.pptx")
+    stats["before"], stats["after"], stats["seconds"]
+
+It works on the package, so any .pptx can go through it however it was
+written, and it changes nothing that is drawn:
+
+* template leftovers are dropped: python-pptx's default template ships a
+  thumbnail (a picture of an empty slide) and printer settings;
+* slide layouts that no slide uses are dropped, and so are slide masters
+  none of whose layouts are used (a master keeps at least one layout), with
+  every part only they referred to;
+* identical media are stored once and every relationship points at that copy;
+* a slide text body whose paragraphs all carry the same ``a:pPr``
+  (spacing, alignment and the ``a:defRPr`` font, which is how ``helpers``
+  styles text) gets it once, as the level-1 style of its ``a:lstStyle``;
+  placeholders, layouts and masters are not touched, since their list
+  styles take part in inheritance;
+* parts are compressed by type: XML at deflate level 9, images and
+  embedded workbooks (already compressed) stored as they are.
+
+Identical decorative shapes (accent bars, icon circles) cannot be shared
+between slides in a .pptx; ``--master`` moves the per-slide chrome onto
+layouts instead, and the two combine. Output is reproducible like
+``deckgen.stream``'s.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sys
+import time
+import zipfile
+from copy import deepcopy
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.oxml.ns import qn
+
+from deckgen.stream import _zip_info
+
+DEFLATE_LEVEL = 9
+# Formats that are compressed already; deflating them again buys nothing
+STORED_EXTENSIONS = frozenset(("png", "jpg", "jpeg", "gif", "tif", "tiff", "wdp",
+                               "xlsx", "docx", "zip", "mp3", "m4a", "mp4"))
+LEFTOVERS = (RT.THUMBNAIL, RT.PRINTER_SETTINGS)
+
+_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_CT = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+_MEDIA = "/ppt/media/"
+# Layouts and masters are left alone: their list styles are what slide
+# placeholders inherit, so moving properties there changes rendering
+_TEXT_PARTS = ("/ppt/slides/",)
+_PLACEHOLDER = f"{qn('p:nvSpPr')}/{qn('p:nvPr')}/{qn('p:ph')}"
+
+
+def _xml(element):
+    # As python-pptx serialises parts
+    return etree.tostring(element, encoding="UTF-8", standalone=True)
+
+
+class _Package:
+    """A .pptx as ``{partname: bytes}`` plus parsed, editable rels."""
+
+    def __init__(self, blob):
+        with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+            self.order = zf.namelist()
+            self.members = {name: zf.read(name) for name in self.order}
+        self._rels = {}
+        self._trees = {}
+
+    def rels(self, partname):
+        """The ``Relationships`` element of ``partname`` (``"/"`` for the package), or ``None``."""
+        if partname not in self._rels:
+            name = PACKAGE_URI.rels_uri.membername if partname == "/" else PackURI(partname).rels_uri.membername
+            blob = self.members.get(name)
+            self._rels[partname] = None if blob is None else etree.fromstring(blob)
+        return self._rels[partname]
+
+    def tree(self, partname):
+        """Parsed, editable XML of ``partname``; written back on ``save()``."""
+        if partname not in self._trees:
+            self._trees[partname] = etree.fromstring(self.members[partname[1:]])
+        return self._trees[partname]
+
+    def targets(self, partname, reltype=None):
+        """``(rel, target partname)`` for the internal relationships of ``partname``."""
+        rels = self.rels(partname)
+        if rels is None:
+            return
+        base = "/" if partname == "/" else PackURI(partname).baseURI
+        for rel in rels.iter(_RELS):
+            if rel.get("TargetMode") == "External" or (reltype and rel.get("Type") != reltype):
+                continue
+            yield rel, PackURI.from_rel_ref(base, rel.get("Target"))
+
+    def drop_rel(self, partname, rel, list_tag=None):
+        """Remove ``rel``; with ``list_tag``, also the list entry in the part's XML that names it."""
+        rel.getparent().remove(rel)
+        if list_tag is not None:
+            rId = rel.get("Id")
+            for entry in self.tree(partname).iter(qn(list_tag)):
+                if entry.get(qn("r:id")) == rId:
+                    entry.getparent().remove(entry)
+
+    def reachable(self):
+        """Partnames reachable from the package relationships."""
+        seen = set()
+        stack = ["/"]
+        while stack:
+            for _, target in self.targets(stack.pop()):
+                if target not in seen and target[1:] in self.members:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def save(self, keep):
+        """The package as zip bytes, with only the parts in ``keep`` and their rels."""
+        members = {CONTENT_TYPES_URI.membername: self._content_types(keep)}
+        for partname in keep:
+            tree = self._trees.get(partname)
+            members[partname[1:]] = self.members[partname[1:]] if tree is None else _xml(tree)
+        for partname, rels in self._rels.items():
+            if rels is not None and (partname == "/" or partname in keep):
+                name = PACKAGE_URI.rels_uri.membername if partname == "/" else PackURI(partname).rels_uri.membername
+                members[name] = _xml(rels)
+        for partname in ["/"] + sorted(keep):
+            name = PACKAGE_URI.rels_uri.membername if partname == "/" else PackURI(partname).rels_uri.membername
+            if name in self.members and name not in members:
+                members[name] = self.members[name]
+
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in [n for n in self.order if n in members] + [n for n in members if n not in self.order]:
+                info = _zip_info(name)
+                if name.rsplit(".", 1)[-1].lower() in STORED_EXTENSIONS:
+                    zf.writestr(info, members[name], zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(info, members[name], zipfile.ZIP_DEFLATED, DEFLATE_LEVEL)
+        return out.getvalue()
+
+    def _content_types(self, keep):
+        types = etree.fromstring(self.members[CONTENT_TYPES_URI.membername])
+        extensions = {p.rsplit(".", 1)[-1].lower() for p in keep}
+        for el in list(types):
+            if el.tag == f"{_CT}Override" and el.get("PartName") not in keep:
+                types.remove(el)
+            elif el.tag == f"{_CT}Default" and el.get("Extension").lower() not in extensions | {"rels", "xml"}:
+                types.remove(el)
+        return _xml(types)
+
+
+# ── Passes ────────────────────────────────────────────────────────────────────
+
+def _drop_leftovers(package, presentation):
+    dropped = 0
+    for partname in ("/", presentation):
+        for rel, _ in list(package.targets(partname)):
+            if rel.get("Type") in LEFTOVERS:
+                package.drop_rel(partname, rel)
+                dropped += 1
+    return dropped
+
+
+def _drop_unused_layouts(package, presentation):
+    used = {layout
+            for _, slide in package.targets(presentation, RT.SLIDE)
+            for _, layout in package.targets(slide, RT.SLIDE_LAYOUT)}
+    masters = list(package.targets(presentation, RT.SLIDE_MASTER))
+    dropped = 0
+    for rel, master in masters:
+        layouts = list(package.targets(master, RT.SLIDE_LAYOUT))
+        in_use = [(r, layout) for r, layout in layouts if layout in used]
+        if not in_use and len(masters) > 1:
+            package.drop_rel(presentation, rel, "p:sldMasterId")
+            masters.remove((rel, master))
+            dropped += 1 + len(layouts)
+            continue
+        keep = in_use or layouts[:1]
+        for layout_rel, layout in layouts:
+            if (layout_rel, layout) not in keep:
+                package.drop_rel(master, layout_rel, "p:sldLayoutId")
+                dropped += 1
+    return dropped
+
+
+def _dedupe_media(package, parts):
+    first = {}
+    duplicates = {}
+    for partname in sorted(p for p in parts if p.startswith(_MEDIA)):
+        digest = hashlib.sha256(package.members[partname[1:]]).digest()
+        duplicates[partname] = first.setdefault(digest, partname)
+    duplicates = {p: canonical for p, canonical in duplicates.items() if p != canonical}
+    if duplicates:
+        for source in ["/"] + sorted(parts):
+            base = "/" if source == "/" else PackURI(source).baseURI
+            for rel, target in package.targets(source):
+                if target in duplicates:
+                    rel.set("Target", PackURI(duplicates[target]).relative_ref(base))
+    return len(duplicates)
+
+
+def hoist_paragraph_styles(root):
+    """Move an ``a:pPr`` shared by every paragraph of a text body into its ``a:lstStyle``.
+
+    Only bodies with two or more paragraphs, all at level 0 with the same
+    properties, and an empty list style qualify; placeholders never do.
+    Returns how many bodies changed.
+    """
+    hoisted = 0
+    for body in root.iter(qn("p:txBody")):
+        if body.getparent().find(_PLACEHOLDER) is not None:
+            continue
+        paragraphs = body.findall(qn("a:p"))
+        lst_style = body.find(qn("a:lstStyle"))
+        if len(paragraphs) < 2 or lst_style is None or len(lst_style):
+            continue
+        props = [p.find(qn("a:pPr")) for p in paragraphs]
+        if any(pPr is None or pPr.get("lvl", "0") != "0" for pPr in props):
+            continue
+        if len({etree.tostring(pPr) for pPr in props}) != 1:
+            continue
+        level = deepcopy(props[0])
+        level.tag = qn("a:lvl1pPr")
+        level.attrib.pop("lvl", None)
+        lst_style.append(level)
+        for p, pPr in zip(paragraphs, props):
+            p.remove(pPr)
+        hoisted += 1
+    return hoisted
+
+
+# ── API ───────────────────────────────────────────────────────────────────────
+
+def optimize_package(blob):
+    """Optimize the .pptx bytes ``blob``; returns ``(bytes, stats)``.
+
+    ``stats`` has ``before`` / ``after`` (bytes), ``seconds`` and what each
+    pass did: ``leftovers`` and ``layouts`` (relationships dropped),
+    ``removed`` (parts), ``deduplicated`` (media) and ``hoisted`` (text bodies).
+    """
+    t0 = time.perf_counter()
+    package = _Package(blob)
+    presentation = next(t for rel, t in package.targets("/") if rel.get("Type") == RT.OFFICE_DOCUMENT)
+    stats = {
+        "before": len(blob),
+        "leftovers": _drop_leftovers(package, presentation),
+        "layouts": _drop_unused_layouts(package, presentation),
+    }
+    parts = package.reachable()
+    stats["deduplicated"] = _dedupe_media(package, parts)
+    if stats["deduplicated"]:
+        parts = package.reachable()
+
+    hoisted = 0
+    for partname in sorted(parts):
+        if partname.startswith(_TEXT_PARTS) and partname.endswith(".xml"):
+            count = hoist_paragraph_styles(package.tree(partname))
+            if not count:
+                del package._trees[partname]
+            hoisted += count
+    stats["hoisted"] = hoisted
+
+    before_parts = {"/" + n for n in package.order if not n.endswith(".rels")} - {"/" + CONTENT_TYPES_URI.membername}
+    stats["removed"] = len(before_parts - parts)
+    out = package.save(parts)
+    stats["after"] = len(out)
+    stats["seconds"] = time.perf_counter() - t0
+    return out, stats
+
+
+def optimize_file(path, output=None):
+    """Optimize the deck at ``path`` into ``output`` (default: in place, atomically)."""
+    with open(path, "rb") as fh:
+        blob, stats = optimize_package(fh.read())
+    output = output or path
+    tmp = f"{output}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(blob)
+    os.replace(tmp, output)
+    return stats
+
+
+def format_stats(stats):
+    """``58,376 -> 41,012 bytes (-29.7%) in 31 ms``."""
+    saved = 1 - stats["after"] / stats["before"] if stats["before"] else 0.0
+    return (f"{stats['before']:,} -> {stats['after']:,} bytes (-{saved:.1%}) "
+            f"in {stats['seconds'] * 1000:.0f} ms")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shrink generated decks without changing what they show.")
+    parser.add_argument("decks", nargs="+", help=".pptx files to optimize (in place unless -o is given)")
+    parser.add_argument("-o", "--output", help="output path (only with a single deck)")
+    args = parser.parse_args(argv)
+    if args.output and len(args.decks) > 1:
+        parser.error("-o needs a single deck")
+
+    before = after = 0
+    for path in args.decks:
+        try:
+            stats = optimize_file(path, args.output)
+        except (OSError, zipfile.BadZipFile, KeyError, StopIteration) as exc:
+            print(f"❌ {path}: {exc or type(exc).__name__}", file=sys.stderr)
+            return 1
+        before += stats["before"]
+        after += stats["after"]
+        print(f"🗜️  {path}: {format_stats(stats)}  ({stats['removed']} parts removed, "
+              f"{stats['deduplicated']} media deduplicated, {stats['hoisted']} text bodies restyled)")
+    if len(args.decks) > 1:
+        print(f"✅ {len(args.decks)} decks: {before:,} -> {after:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
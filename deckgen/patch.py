@@ -0,0 +1,405 @@
+"""
+Patch a finished deck in place instead of regenerating it.
+
+    python generate_ppt.py --patch              # update ./FlowPulse_2.0_Presentation.pptx
+    summary = patch_deck(DECK, data, "deck.pptx")
+
+Every slide deckgen renders is named ``<id>#<digest>`` (its ``p:cSld``
+name, see ``spec.slide_name()``): the id is the spec slide's name plus the
+page of a paginated slide, the digest hashes the slide's spec, data,
+position and deck length. ``patch_deck()`` reads those names from the
+existing package – the first few hundred bytes of each slide entry – and
+renders only the slides whose digest changed. The new package is written
+next to the old one and replaces it: every other entry is copied over as
+its stored, compressed bytes, so slides edited by hand in PowerPoint, and
+anything added to the deck there, are kept as they are.
+
+A changed slide is merged rather than overwritten when the rendering
+deckgen last wrote for it is in the cache (``.deckcache/slides``, filled
+by every patch and rebuild, and by ``record_build()`` after a normal
+build): only the background and the shapes (matched by the ``#<n>`` key
+deckgen puts in their names, ``spec.shape_key()``) whose generated XML
+changed are replaced, new ones added and dropped ones removed, so hand
+edits to the rest of that slide survive too. Without it (a deck built
+elsewhere, or with the cache cleared) the slide is replaced whole. Shapes
+added by hand are never replaced or removed, and new shapes get ids past
+the slide's highest, so they cannot collide with one.
+
+A deck without slide names, slides added or removed (a paginated list
+gaining a page), or slides with charts or pictures cannot be patched. If
+the file is still exactly what deckgen last wrote (its SHA-256 is kept in
+the cache) or there is no file yet, ``patch_deck()`` rebuilds the whole
+deck and says why; otherwise rebuilding would throw hand edits away, so
+it raises ``PatchError`` unless called with ``force=True`` (``--force``).
+Patching follows content: after a change to the template or to deckgen
+itself, build the deck from scratch once.
+"""
+
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import struct
+import zipfile
+import zlib
+from copy import deepcopy
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.oxml.ns import qn
+
+from deckgen.helpers import new_presentation
+from deckgen.incremental import CACHE_DIR, SlideCache
+from deckgen.master import apply_master
+from deckgen.spec import SHAPE_TAGS, deck_pages, render_slide, shape_key, slide_name
+from deckgen.stream import _central_record, _end_records, _zip_info, write_deck
+
+_SLIDE = re.compile(r"ppt/slides/slide\d+\.xml$")
+_NAME = re.compile(rb'<p:cSld name="([^"]*)"')
+_LAYOUT_NAME = re.compile(rb'<p:cSld name="[^"]*"')
+_HEAD = 1024                        # bytes of slide XML that hold the p:cSld start tag
+_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_NS = {"p": "http://schemas.openxmlformats.org/presentationml/2006/main"}
+
+
+class PatchError(Exception):
+    """The deck cannot be patched in place."""
+
+
+def _base_key(name):
+    # The slide XML deckgen wrote for this slide name, as the merge base
+    return hashlib.sha256(f"patch:{name}".encode()).hexdigest()
+
+
+def _rels_member(member):
+    head, tail = posixpath.split(member)
+    return f"{head}/_rels/{tail}.rels"
+
+
+# ── Reading the deck ──────────────────────────────────────────────────────────
+
+def _raw(blob, info):
+    """The stored (compressed) bytes of zip entry ``info`` in ``blob``."""
+    header = struct.unpack(zipfile.structFileHeader,
+                           blob[info.header_offset:info.header_offset + zipfile.sizeFileHeader])
+    start = (info.header_offset + zipfile.sizeFileHeader + header[zipfile._FH_FILENAME_LENGTH]
+             + header[zipfile._FH_EXTRA_FIELD_LENGTH])
+    return memoryview(blob)[start:start + info.compress_size]
+
+
+def _head(blob, info):
+    """The first ``_HEAD`` bytes of entry ``info``, inflating no more than that."""
+    raw = _raw(blob, info)
+    if info.compress_type == zipfile.ZIP_STORED:
+        return bytes(raw[:_HEAD])
+    return zlib.decompressobj(-15).decompress(raw, _HEAD)
+
+
+def _slide_names(zf, blob):
+    """``{slide id: (zip member, slide name)}`` of every deckgen slide in ``zf``
+    (opened on ``blob``). Slides without a deckgen name (added in PowerPoint)
+    are left out.
+    """
+    slides = {}
+    for info in zf.infolist():
+        if not _SLIDE.match(info.filename):
+            continue
+        head = _head(blob, info)
+        match = _NAME.search(head)
+        if match is None and b"<p:cSld" not in head:
+            match = _NAME.search(zf.read(info))
+        if match is None:
+            continue
+        name = match.group(1).decode()
+        slide_id = name.partition("#")[0]
+        if slide_id in slides:
+            raise PatchError(f"slide {slide_id!r} is in the deck twice")
+        slides[slide_id] = (info.filename, name)
+    return slides
+
+
+def _layout_blob(blob):
+    # Layouts are compared without their name; a themed one is numbered by first use
+    return _LAYOUT_NAME.sub(b"<p:cSld", blob)
+
+
+def _relink(zf, member, layout):
+    """New rels for slide ``member`` pointing at the deck's copy of ``layout``
+    (the new rendering's layout XML), or ``None`` when they already do."""
+    rels_member = _rels_member(member)
+    rels = etree.fromstring(zf.read(rels_member))
+    rel = next(r for r in rels.iter(_RELS) if r.get("Type") == RT.SLIDE_LAYOUT)
+    layout = _layout_blob(layout)
+    current = posixpath.normpath(posixpath.join(posixpath.dirname(member), rel.get("Target")))
+    if _layout_blob(zf.read(current)) == layout:
+        return None
+    for name in zf.namelist():
+        if name.startswith("ppt/slideLayouts/slideLayout") and name.endswith(".xml"):
+            if _layout_blob(zf.read(name)) == layout:
+                rel.set("Target", posixpath.relpath(name, posixpath.dirname(member)))
+                return serialize_part_xml(rels)
+    raise PatchError(f"the deck has no layout for the new chrome of {member}")
+
+
+# ── Merging ───────────────────────────────────────────────────────────────────
+
+def _pieces(root):
+    """``(cSld, {key: element})``: the background (``"bg"``) and the shapes
+    deckgen drew, by ``spec.shape_key()``. Shapes added by hand have no key;
+    of two with one key (a shape duplicated by hand) the first is deckgen's."""
+    cSld = root.find(qn("p:cSld"))
+    pieces = {}
+    bg = cSld.find(qn("p:bg"))
+    if bg is not None:
+        pieces["bg"] = bg
+    for el in cSld.find(qn("p:spTree")):
+        if el.tag in SHAPE_TAGS:
+            key = shape_key(el)
+            if key is not None:
+                pieces.setdefault(key, el)
+    return cSld, pieces
+
+
+def _max_id(root):
+    return max((int(v) for v in root.xpath("//p:cNvPr/@id", namespaces=_NS) if v.isdigit()), default=1)
+
+
+def merge_slide(ours, theirs, base=None):
+    """The deck's slide ``ours`` updated with what changed from ``base`` to ``theirs``.
+
+    ``base`` is the slide XML deckgen last wrote, ``theirs`` the new
+    rendering and ``ours`` the slide in the deck, perhaps edited by hand.
+    Pieces that differ between ``base`` and ``theirs`` are replaced in (or
+    added to, or removed from) ``ours``; everything else in ``ours`` is
+    kept, and shapes that are not in ``base`` (added by hand) are never
+    touched. Replacements keep the shape id they replace, added shapes get
+    ids past the slide's highest. With no ``base`` the result is
+    ``theirs``. Returns ``(blob, pieces changed)``.
+    """
+    new_cSld, new = _pieces(etree.fromstring(theirs))
+    if base is None:
+        return theirs, len(new)
+    _, old = _pieces(etree.fromstring(base))
+    changed = [k for k, el in new.items() if k not in old or etree.tostring(old[k]) != etree.tostring(el)]
+    dropped = [k for k in old if k not in new]
+    if ours == base:
+        return theirs, len(changed) + len(dropped)
+
+    root = etree.fromstring(ours)
+    cSld, mine = _pieces(root)
+    # Only what deckgen wrote last time is deckgen's; a keyed shape that was
+    # not in the base came from somewhere else
+    mine = {k: el for k, el in mine.items() if k in old}
+    next_id = _max_id(root) + 1
+    for key in dropped:
+        el = mine.pop(key, None)
+        if el is not None:
+            el.getparent().remove(el)
+    order = list(new)
+    for key in changed:
+        el = deepcopy(new[key])
+        if key in mine:
+            if key != "bg":
+                el[0][0].set("id", mine[key][0][0].get("id"))
+            mine[key].getparent().replace(mine[key], el)
+        elif key in old:
+            continue                    # deleted by hand
+        elif key == "bg":
+            cSld.insert(0, el)
+        else:
+            el[0][0].set("id", str(next_id))
+            next_id += 1
+            anchor = next((mine[k] for k in reversed(order[:order.index(key)]) if k in mine and k != "bg"),
+                          None)
+            if anchor is None:
+                cSld.find(qn("p:spTree")).insert(2, el)
+            else:
+                anchor.addnext(el)
+        mine[key] = el
+    cSld.set("name", new_cSld.get("name"))
+    return serialize_part_xml(root), len(changed) + len(dropped)
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+def _write_zip(zf, blob, out, replaced):
+    """Copy every entry of ``zf`` (read from ``blob``) to ``out``, compressed
+    bytes as they are, except the entries in ``replaced`` (name -> bytes)."""
+    infos = zf.infolist()
+    position, central = 0, []
+    for old in infos:
+        info = _zip_info(old.filename)
+        new = replaced.get(old.filename)
+        if new is None:
+            data = _raw(blob, old)
+            info.compress_type = old.compress_type
+            info.CRC, info.file_size = old.CRC, old.file_size
+        else:
+            # The same compressor settings as zipfile, as in deckgen.stream
+            deflate = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            data = deflate.compress(new) + deflate.flush()
+            info.CRC, info.file_size = zlib.crc32(new), len(new)
+        info.compress_size = len(data)
+        header = info.FileHeader()
+        out.write(header)
+        out.write(data)
+        central.append(_central_record(info, position))
+        position += len(header) + len(data)
+    central = b"".join(central)
+    out.write(central)
+    _end_records(out, len(infos), position, len(central))
+
+
+def _written_path(cache, path):
+    name = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(cache.root, "patch", f"{name}.json")
+
+
+def _written(cache, path):
+    """``{"sha256", "keys"}`` of the deck deckgen last wrote to ``path``: its
+    digest and the merge bases it uses; empty if there is no record."""
+    try:
+        with open(_written_path(cache, path), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _remember(cache, path, blob, names):
+    """Record ``blob`` as written to ``path`` with slides ``names``, and drop
+    the merge bases its previous version used that no deck uses any more."""
+    keys = sorted({_base_key(name) for name in names if "#" in name})
+    previous = _written(cache, path).get("keys", ())
+    record = _written_path(cache, path)
+    os.makedirs(os.path.dirname(record), exist_ok=True)
+    tmp = f"{record}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"sha256": hashlib.sha256(blob).hexdigest(), "keys": keys}, fh)
+    os.replace(tmp, record)
+    cache.prune(set(previous) - set(keys))
+
+
+def _seed_bases(cache, blob):
+    """Cache each named slide of ``blob``, as rendered, as the base for later
+    merges; returns the slide names."""
+    with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        slides = _slide_names(zf, blob).values()
+        for member, name in slides:
+            key = _base_key(name)
+            if "#" in name and key not in cache:
+                cache.put(key, zf.read(member), zf.read(_rels_member(member)))
+    return [name for _, name in slides]
+
+
+def record_build(path, cache_dir=CACHE_DIR):
+    """Remember the deck just built at ``path`` so a later ``patch_deck()``
+    can merge into it and tell hand edits apart; call after a full build."""
+    cache = SlideCache(cache_dir)
+    with open(path, "rb") as fh:
+        blob = fh.read()
+    try:
+        names = _seed_bases(cache, blob)
+    except PatchError:
+        names = []                      # duplicate slide ids: never patchable anyway
+    _remember(cache, path, blob, names)
+
+
+def _rebuild(deck, data, path, template, master, cache, clone, blob, reason, force):
+    """Write the whole deck over ``path`` (currently ``blob``, or ``None``),
+    unless that would lose changes deckgen did not make."""
+    edited = blob is not None and hashlib.sha256(blob).hexdigest() != _written(cache, path).get("sha256")
+    if edited and not force:
+        raise PatchError(f"cannot patch {path} ({reason}) and it has changes deckgen did not write; "
+                         f"rebuild with --force (force=True) to overwrite them")
+    # write_deck replaces the file atomically
+    write_deck(deck, data, path, template, clone, master=master)
+    with open(path, "rb") as fh:
+        new = fh.read()
+    _remember(cache, path, new, _seed_bases(cache, new))
+
+
+# ── Patching ──────────────────────────────────────────────────────────────────
+
+def _plan(zf, blob, names):
+    """``[(page index, zip member, old name)]`` of the slides to re-render."""
+    if any("#" not in name for name in names):
+        raise PatchError("the deck has slides with charts or pictures")
+    slides = _slide_names(zf, blob)
+    if not slides:
+        raise PatchError("the deck has no deckgen slide names")
+    ids = [name.partition("#")[0] for name in names]
+    if set(ids) != set(slides):
+        raise PatchError("slides were added or removed")
+    return [(i, slides[slide_id][0], slides[slide_id][1])
+            for i, (slide_id, name) in enumerate(zip(ids, names)) if slides[slide_id][1] != name]
+
+
+def patch_deck(deck, data, path, template=None, master=False, cache_dir=CACHE_DIR, clone=True, force=False):
+    """Update the deck at ``path`` to ``deck`` bound to ``data``, rewriting only what changed.
+
+    ``template`` and ``master`` must be those the deck was built with.
+    When the deck cannot be patched (see the module docs) it is rebuilt if
+    it is missing, unedited since deckgen wrote it, or ``force`` is set;
+    otherwise ``PatchError`` is raised and the file is left alone.
+    Returns a summary dict: ``slides``, ``patched`` (slides rewritten),
+    ``pieces`` (backgrounds and shapes replaced, added or removed),
+    ``unchanged`` and ``rebuilt`` (why the deck was rebuilt, or ``None``).
+    """
+    cache = SlideCache(cache_dir)
+    total, pages = deck_pages(deck, data)
+    pages = list(pages)
+    names = [slide_name(compiled, slide_data, num, total, master)
+             for num, (compiled, slide_data) in enumerate(pages, start=1)]
+    summary = {"slides": total, "patched": 0, "pieces": 0, "unchanged": False, "rebuilt": None}
+
+    try:
+        with open(path, "rb") as fh:
+            blob = fh.read()
+    except FileNotFoundError:
+        blob = None
+    try:
+        if blob is None:
+            raise PatchError("there is no deck to patch yet")
+        zf = zipfile.ZipFile(io.BytesIO(blob))
+        changes = _plan(zf, blob, names)
+    except (PatchError, zipfile.BadZipFile) as exc:
+        _rebuild(deck, data, path, template, master, cache, clone, blob, str(exc), force)
+        summary["rebuilt"] = str(exc)
+        return summary
+    if not changes:
+        summary["unchanged"] = True
+        return summary
+
+    prs = new_presentation(template)
+    if master:
+        apply_master(prs)
+    replaced = {}
+    try:
+        for index, member, old_name in changes:
+            compiled, slide_data = pages[index]
+            part = render_slide(prs, compiled, slide_data, index + 1, total, clone).part
+            rels = _relink(zf, member, part.part_related_by(RT.SLIDE_LAYOUT).blob)
+            if rels is not None:
+                replaced[_rels_member(member)] = rels
+            theirs = part.blob
+            base = cache.get(_base_key(old_name))
+            replaced[member], pieces = merge_slide(zf.read(member), theirs, base and base[0])
+            cache.put(_base_key(names[index]), theirs, part.rels.xml)
+            summary["pieces"] += pieces
+    except PatchError as exc:
+        _rebuild(deck, data, path, template, master, cache, clone, blob, str(exc), force)
+        summary["rebuilt"] = str(exc)
+        return summary
+
+    out = io.BytesIO()
+    _write_zip(zf, blob, out, replaced)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(out.getbuffer())
+    os.replace(tmp, path)
+    _remember(cache, path, out.getbuffer(), names)
+    summary["patched"] = len(changes)
+    return summary
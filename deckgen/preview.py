@@ -0,0 +1,300 @@
+"""
+SVG and single-page HTML previews drawn straight from the slide specs.
+
+    svgs = preview.deck_svgs(generate_ppt.DECK, generate_ppt.deck_data())
+    page = preview.deck_html(generate_ppt.DECK, generate_ppt.deck_data(), title="FlowPulse 2.0")
+
+    python -m deckgen.preview -o preview.html      # project deck, one HTML page
+    python -m deckgen.preview -o thumbs/           # one SVG per slide
+
+Nothing goes through python-pptx or PowerPoint: ``spec.iter_shapes()``
+yields the same bound and fitted helper calls ``render_slide()`` makes, and
+each helper has an SVG counterpart here keyed by its name (background,
+rounded rectangles, ovals with labels, accent lines, text boxes, line
+charts and cached images). Coordinates are in points (1/12700 EMU) with a
+960x540 view box, so a thumbnail is the same SVG at a smaller width.
+
+Text is wrapped with ``deckgen.layout`` at the same font metrics used for
+shrink-to-fit, so line breaks match the deck wherever the fonts are
+installed; the browser still draws the glyphs, so previews are faithful in
+layout and palette rather than pixel-exact. Charts are drawn as plain
+polylines over gridlines.
+"""
+
+import argparse
+import base64
+import html
+import os
+import sys
+import time
+
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches
+
+from deckgen import assets
+from deckgen.layout import INSET_X, INSET_Y, PARAGRAPH_SPACE_AFTER, line_height, wrap
+from deckgen.spec import compile_deck, deck_pages, iter_shapes
+from deckgen.theme import (
+    BG_DARK, BORDER_COLOR, TEXT_MUTED, TEXT_WHITE, SLIDE_WIDTH, SLIDE_HEIGHT,
+)
+from deckgen.helpers import CHART_COLORS
+
+EMU_PER_PT = 12700
+
+# First baseline sits this share of the line pitch below the line's top
+_ASCENT = 0.8
+_FONTS = "Carlito, Calibri, 'Segoe UI', sans-serif"
+_ANCHORS = {PP_ALIGN.CENTER: "middle", PP_ALIGN.RIGHT: "end"}
+
+
+def _pt(emu):
+    return f"{emu / EMU_PER_PT:.2f}".rstrip("0").rstrip(".")
+
+
+def _color(rgb):
+    return f"#{rgb}"
+
+
+def _family(font_name):
+    return _FONTS if font_name in _FONTS else f"'{font_name}', {_FONTS}"
+
+
+# ── Shapes ────────────────────────────────────────────────────────────────────
+
+def _shape(out, left, top, width, height, fill_color, border_color=None, radius=None):
+    # roundRect's adjustment is the corner radius as a share of the short side
+    r = (radius or 0.02) * min(width, height)
+    stroke = f' stroke="{_color(border_color)}" stroke-width="1"' if border_color else ""
+    out.append(f'<rect x="{_pt(left)}" y="{_pt(top)}" width="{_pt(width)}" height="{_pt(height)}" '
+               f'rx="{_pt(r)}" fill="{_color(fill_color)}"{stroke}/>')
+
+
+def _accent_line(out, left, top, width, color, thickness=3):
+    out.append(f'<rect x="{_pt(left)}" y="{_pt(top)}" width="{_pt(width)}" '
+               f'height="{thickness}" fill="{_color(color)}"/>')
+
+
+def _icon_circle(out, left, top, size, color, label="", label_size=20):
+    r = size / 2
+    cx, cy = _pt(left + r), _pt(top + r)
+    out.append(f'<circle cx="{cx}" cy="{cy}" r="{_pt(r)}" fill="{_color(color)}"/>')
+    if label:
+        out.append(f'<text x="{cx}" y="{cy}" font-size="{label_size}" fill="{_color(TEXT_WHITE)}" '
+                   f'font-weight="700" text-anchor="middle" dominant-baseline="central" '
+                   f'font-family="{_FONTS}">{html.escape(label, False)}</text>')
+
+
+def _lines(out, x, y, anchor, rows, size, color, bold, font_name, pitch):
+    weight = ' font-weight="700"' if bold else ""
+    anchor = f' text-anchor="{anchor}"' if anchor != "start" else ""
+    out.append(f'<text font-size="{size}" fill="{_color(color)}"{weight}{anchor} '
+               f'font-family="{_family(font_name)}">')
+    for i, row in enumerate(rows):
+        out.append(f'<tspan x="{_pt(x)}" y="{_pt(y + i * pitch)}">{html.escape(row, False)}</tspan>')
+    out.append("</text>")
+
+
+def _text_x(left, width, alignment):
+    anchor = _ANCHORS.get(alignment, "start")
+    if anchor == "middle":
+        return left + width / 2, anchor
+    if anchor == "end":
+        return left + width - INSET_X, anchor
+    return left + INSET_X, anchor
+
+
+def _text_box(out, left, top, width, height, text, font_size=18, color=TEXT_WHITE, bold=False,
+              alignment=PP_ALIGN.LEFT, font_name="Calibri", line_spacing=1.2):
+    rows = wrap(text, width, font_name, font_size, bold)
+    pitch = line_height(font_size, line_spacing, font_name, bold) * EMU_PER_PT
+    x, anchor = _text_x(left, width, alignment)
+    _lines(out, x, top + INSET_Y + _ASCENT * pitch, anchor, rows, font_size, color, bold,
+           font_name, pitch)
+
+
+def _multiline_box(out, left, top, width, height, lines, font_size=16, color=TEXT_WHITE,
+                   font_name="Calibri", line_spacing=1.5, alignment=PP_ALIGN.LEFT):
+    x, anchor = _text_x(left, width, alignment)
+    y = top + INSET_Y
+    for item in lines:
+        if isinstance(item, str):
+            item = (item,)
+        text = item[0]
+        clr = item[1] if len(item) > 1 else color
+        bold = item[2] if len(item) > 2 else False
+        size = item[3] if len(item) > 3 else font_size
+        rows = wrap(text, width, font_name, size, bold)
+        pitch = size * line_spacing * EMU_PER_PT
+        _lines(out, x, y + _ASCENT * pitch, anchor, rows, size, clr, bold, font_name, pitch)
+        y += len(rows) * pitch + PARAGRAPH_SPACE_AFTER * EMU_PER_PT
+
+
+def _line_chart(out, left, top, width, height, chart, colors=CHART_COLORS, number_format="0",
+                font_size=10, date_format=None):
+    categories, series = chart
+    values = [v for _, vals in series for v in vals if v is not None]
+    if not values:
+        return
+    lo, hi = min(0.0, min(values)), max(values)
+    span = (hi - lo) or 1.0
+    # Room for value labels on the left, the legend on top, dates below
+    pad = font_size * EMU_PER_PT
+    x0, x1 = left + 3.5 * pad, left + width - pad
+    y0, y1 = top + (2.5 if len(series) > 1 else 1) * pad, top + height - 2 * pad
+    text = f'font-size="{font_size}" fill="{_color(TEXT_MUTED)}" font-family="{_FONTS}"'
+    for i in range(5):
+        y = y1 - (y1 - y0) * i / 4
+        out.append(f'<line x1="{_pt(x0)}" y1="{_pt(y)}" x2="{_pt(x1)}" y2="{_pt(y)}" '
+                   f'stroke="{_color(BORDER_COLOR)}" stroke-width="0.75"/>')
+        out.append(f'<text x="{_pt(x0 - pad / 2)}" y="{_pt(y)}" {text} text-anchor="end" '
+                   f'dominant-baseline="central">{lo + span * i / 4:.0f}</text>')
+    n = max(len(categories), 2) - 1
+    for (name, vals), color in zip(series, colors):
+        points = " ".join(
+            f"{_pt(x0 + (x1 - x0) * i / n)},{_pt(y1 - (y1 - y0) * (v - lo) / span)}"
+            for i, v in enumerate(vals) if v is not None)
+        out.append(f'<polyline points="{points}" fill="none" stroke="{_color(color)}" '
+                   f'stroke-width="2" stroke-linejoin="round"/>')
+    if categories:
+        first, last = (f"{c.day} {c:%b}" if hasattr(c, "strftime") else str(c)
+                       for c in (categories[0], categories[-1]))
+        out.append(f'<text x="{_pt(x0)}" y="{_pt(y1 + 1.4 * pad)}" {text}>{html.escape(first)}</text>')
+        out.append(f'<text x="{_pt(x1)}" y="{_pt(y1 + 1.4 * pad)}" {text} text-anchor="end">'
+                   f'{html.escape(last)}</text>')
+    if len(series) > 1:
+        x = (x0 + x1) / 2 - len(series) * 3 * pad
+        for (name, _), color in zip(series, colors):
+            out.append(f'<rect x="{_pt(x)}" y="{_pt(top + pad * 0.6)}" width="{_pt(pad)}" '
+                       f'height="2" fill="{_color(color)}"/>')
+            out.append(f'<text x="{_pt(x + 1.4 * pad)}" y="{_pt(top + pad * 0.6)}" {text} '
+                       f'dominant-baseline="central">{html.escape(name)}</text>')
+            x += 6 * pad
+
+
+_data_uris = {}
+
+
+def _image(out, left, top, width, height, image):
+    asset = assets.default_cache().image(image)
+    uri = _data_uris.get(asset.digest)
+    if uri is None:
+        if len(_data_uris) >= 64:
+            _data_uris.clear()
+        uri = _data_uris[asset.digest] = (
+            f"data:{asset.content_type};base64,{base64.b64encode(asset.blob).decode()}")
+    cx, cy = assets.native_size(asset)
+    if width and not height:
+        height = cy * width / cx
+    elif height and not width:
+        width = cx * height / cy
+    elif not (width and height):
+        width, height = cx, cy
+    out.append(f'<image x="{_pt(left)}" y="{_pt(top)}" width="{_pt(width)}" height="{_pt(height)}" '
+               f'preserveAspectRatio="none" href="{uri}"/>')
+
+
+# Keyed by helper name so the helpers and their fastxml twins both map here
+SHAPES = {
+    "add_shape": _shape,
+    "add_accent_line": _accent_line,
+    "add_icon_circle": _icon_circle,
+    "add_text_box": _text_box,
+    "add_multiline_box": _multiline_box,
+    "add_line_chart": _line_chart,
+    "add_image": _image,
+}
+
+
+# ── Slides and decks ──────────────────────────────────────────────────────────
+
+def slide_svg(compiled, data, num, total):
+    """One compiled slide bound to ``data`` as a standalone SVG document."""
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_pt(SLIDE_WIDTH)} '
+           f'{_pt(SLIDE_HEIGHT)}" width="{_pt(SLIDE_WIDTH)}" height="{_pt(SLIDE_HEIGHT)}">',
+           f'<rect width="100%" height="100%" fill="{_color(compiled.bg or BG_DARK)}"/>']
+    for fn, geom, args, kwargs in iter_shapes(compiled, data):
+        draw = SHAPES.get(fn.__name__)
+        if draw is None:
+            raise TypeError(f"no SVG preview for {fn.__name__}")
+        draw(out, *geom, *args, **kwargs)
+    if compiled.footer:
+        # Same box as slide_number_footer()
+        _text_box(out, Inches(12.2), Inches(7.05), Inches(1), Inches(0.4), f"{num}/{total}",
+                  font_size=10, color=TEXT_MUTED, alignment=PP_ALIGN.RIGHT)
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def deck_svgs(deck, data):
+    """Every slide of ``deck`` bound to ``data`` as SVG strings, in order."""
+    compile_deck(deck)
+    total, pages = deck_pages(deck, data)
+    return [slide_svg(compiled, slide_data, num, total)
+            for num, (compiled, slide_data) in enumerate(pages, start=1)]
+
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ margin: 0; padding: 24px; background: #0b1120; font-family: {fonts}; }}
+.slide {{ max-width: 960px; margin: 0 auto 24px; box-shadow: 0 4px 24px rgba(0, 0, 0, .5); }}
+.slide svg {{ display: block; width: 100%; height: auto; }}
+</style>
+</head>
+<body>
+{slides}
+</body>
+</html>
+"""
+
+
+def deck_html(deck, data, title="Deck preview"):
+    """A single self-contained HTML page with every slide inlined as SVG."""
+    slides = "\n".join(
+        f'<section class="slide" id="slide-{num}">\n{svg}\n</section>'
+        for num, svg in enumerate(deck_svgs(deck, data), start=1))
+    return _PAGE.format(title=html.escape(title), fonts=_FONTS, slides=slides)
+
+
+def write_preview(deck, data, path, title="Deck preview"):
+    """``path`` ending in ``.html``: one page; otherwise a directory of ``slide-NN.svg``.
+
+    Returns the number of slides written.
+    """
+    if path.endswith((".html", ".htm")):
+        page = deck_html(deck, data, title)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(page)
+        return page.count('<section class="slide"')
+    os.makedirs(path, exist_ok=True)
+    svgs = deck_svgs(deck, data)
+    for num, svg in enumerate(svgs, start=1):
+        with open(os.path.join(path, f"slide-{num:02d}.svg"), "w", encoding="utf-8") as fh:
+            fh.write(svg)
+    return len(svgs)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the project deck as SVG/HTML previews.")
+    parser.add_argument("-o", "--output", default="preview.html",
+                        help="an .html file, or a directory for one SVG per slide "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    import generate_ppt
+    t0 = time.perf_counter()
+    count = write_preview(generate_ppt.DECK, generate_ppt.deck_data(), args.output,
+                          title="FlowPulse 2.0")
+    print(f"🖼️  {count} slides previewed to {args.output} in "
+          f"{(time.perf_counter() - t0) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
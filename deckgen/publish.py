@@ -0,0 +1,182 @@
+"""
+Publish generated decks to R2 through its S3-compatible API, skipping unchanged ones.
+
+    python -m deckgen.publish FlowPulse_2.0_Presentation.pptx            # -> decks/<file name>
+    python -m deckgen.publish reports/*.pptx --prefix decks/reports/2026-W41/
+    python generate_ppt.py --publish                                      # build, then publish
+
+    result = publish("deck.pptx", "decks/deck.pptx")
+    result["uploaded"]                      # False when R2 already has these bytes
+
+Decks are reproducible (see ``deckgen.stream``), so a deck's SHA-256 says
+whether it changed. Each object is stored with its digest as
+``x-amz-meta-sha256``; publishing first asks R2 for that header (``HEAD``)
+and uploads only when it differs or the object is missing. Decks of
+``MULTIPART_THRESHOLD`` bytes or more go up as a multipart upload in
+``PART_SIZE`` parts read one at a time from disk; a failed upload is
+aborted so no orphaned parts are left in the bucket.
+
+The client is ``boto3`` (installed on demand, not a dependency of the
+generator) pointed at ``$DECKGEN_R2_ENDPOINT``, or at the account's R2
+endpoint from ``$DECKGEN_R2_ACCOUNT_ID``; credentials come from the usual
+``AWS_ACCESS_KEY_ID`` / ``AWS_SECRET_ACCESS_KEY``. Any S3-compatible server
+works as a stand-in, e.g. MinIO::
+
+    DECKGEN_R2_ENDPOINT=http://localhost:9000 python -m deckgen.publish deck.pptx
+
+``publish(..., client=...)`` takes any object with boto3's S3 client
+methods, so tests can pass a fake. Published decks are served by the
+Cloudflare Worker under ``/decks/<name>``, next to ``/download-extension``.
+It only reads keys under ``decks/``, so the CLI's ``--prefix`` must start
+with it; ``decks/reports/2026-W41/u1.pptx`` is served at
+``/decks/reports/2026-W41/u1.pptx``.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+BUCKET = os.environ.get("DECKGEN_R2_BUCKET", "flowpulse-static-assets")
+ENDPOINT = os.environ.get("DECKGEN_R2_ENDPOINT")
+ACCOUNT_ID = os.environ.get("DECKGEN_R2_ACCOUNT_ID")
+PREFIX = "decks/"
+PART_SIZE = 8 << 20                 # S3 and R2 need >= 5 MiB for every part but the last
+MULTIPART_THRESHOLD = 16 << 20
+CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+_READ_SIZE = 1 << 20
+
+
+class PublishError(RuntimeError):
+    """The bucket could not be reached or refused the upload."""
+
+
+def file_digest(path):
+    """Hex SHA-256 of the file at ``path``, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def r2_client(endpoint=None):
+    """A boto3 S3 client for R2 (or ``endpoint``, e.g. a local MinIO)."""
+    try:
+        import boto3
+    except ImportError as exc:
+        raise PublishError("publishing needs boto3: pip install boto3") from exc
+    endpoint = endpoint or ENDPOINT
+    if endpoint is None:
+        if not ACCOUNT_ID:
+            raise PublishError("set $DECKGEN_R2_ENDPOINT or $DECKGEN_R2_ACCOUNT_ID")
+        endpoint = f"https://{ACCOUNT_ID}.r2.cloudflarestorage.com"
+    return boto3.client("s3", endpoint_url=endpoint, region_name="auto")
+
+
+def _error_code(exc):
+    # botocore's ClientError, without importing botocore
+    return str(getattr(exc, "response", {}).get("Error", {}).get("Code", ""))
+
+
+def remote_digest(client, bucket, key):
+    """The ``sha256`` recorded on ``key``, or ``None`` if there is no such object."""
+    try:
+        head = client.head_object(Bucket=bucket, Key=key)
+    except Exception as exc:
+        if _error_code(exc) in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    return head.get("Metadata", {}).get("sha256")
+
+
+def _upload_multipart(client, bucket, key, path, size, part_size, extra):
+    upload = client.create_multipart_upload(Bucket=bucket, Key=key, **extra)
+    upload_id = upload["UploadId"]
+    parts = []
+    try:
+        with open(path, "rb") as fh:
+            for number in range(1, -(-size // part_size) + 1):
+                response = client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                              PartNumber=number, Body=fh.read(part_size))
+                parts.append({"PartNumber": number, "ETag": response["ETag"]})
+        client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id,
+                                         MultipartUpload={"Parts": parts})
+    except BaseException:
+        client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+    return len(parts)
+
+
+def check_key(key):
+    """Raise ``PublishError`` unless the Worker can serve ``key``: under
+    ``decks/``, with no empty, ``.`` or ``..`` segments."""
+    segments = key[len(PREFIX):].split("/")
+    if not key.startswith(PREFIX) or any(s in ("", ".", "..") for s in segments):
+        raise PublishError(f"{key!r} is not a deck key under {PREFIX} (the Worker serves nothing else)")
+
+
+def publish(path, key=None, client=None, bucket=BUCKET, part_size=PART_SIZE,
+            threshold=MULTIPART_THRESHOLD, force=False):
+    """Upload ``path`` to ``bucket``/``key`` unless the stored copy has the same hash.
+
+    ``key`` defaults to ``decks/<file name>`` and must be under ``decks/``
+    (``check_key()``). Returns ``{"key", "sha256",
+    "size", "uploaded", "parts"}``; ``parts`` is 0 for a single PUT.
+    """
+    key = key or PREFIX + os.path.basename(path)
+    check_key(key)
+    digest = file_digest(path)
+    size = os.path.getsize(path)
+    result = {"key": key, "sha256": digest, "size": size, "uploaded": False, "parts": 0}
+    client = client or r2_client()
+    try:
+        if not force and remote_digest(client, bucket, key) == digest:
+            return result
+        extra = {"ContentType": CONTENT_TYPE, "Metadata": {"sha256": digest}}
+        if size >= threshold:
+            result["parts"] = _upload_multipart(client, bucket, key, path, size, part_size, extra)
+        else:
+            with open(path, "rb") as fh:
+                client.put_object(Bucket=bucket, Key=key, Body=fh.read(), **extra)
+    except PublishError:
+        raise
+    except Exception as exc:
+        raise PublishError(f"{bucket}/{key}: {exc}") from exc
+    result["uploaded"] = True
+    return result
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish decks to R2, skipping unchanged ones.")
+    parser.add_argument("decks", nargs="+", help=".pptx files to publish")
+    parser.add_argument("--prefix", default=PREFIX, help="key prefix in the bucket, under decks/ (default: %(default)s)")
+    parser.add_argument("--bucket", default=BUCKET, help="bucket name (default: %(default)s)")
+    parser.add_argument("--endpoint", default=ENDPOINT,
+                        help="S3 endpoint URL (default: $DECKGEN_R2_ENDPOINT, else the R2 account endpoint)")
+    parser.add_argument("--force", action="store_true", help="upload even if the hash is unchanged")
+    args = parser.parse_args(argv)
+    try:
+        check_key(args.prefix + "deck.pptx")
+    except PublishError:
+        parser.error(f"--prefix must be under {PREFIX} (the Worker serves nothing else)")
+
+    try:
+        client = r2_client(args.endpoint)
+        for path in args.decks:
+            result = publish(path, args.prefix + os.path.basename(path), client, args.bucket,
+                             force=args.force)
+            how = f"{result['parts']} parts" if result["parts"] else "single PUT"
+            state = f"uploaded ({how})" if result["uploaded"] else "unchanged, skipped"
+            print(f"{'☁️ ' if result['uploaded'] else '✅'} {args.bucket}/{result['key']}: {state}  "
+                  f"{result['size'] / (1 << 20):.1f} MB  sha256 {result['sha256'][:12]}")
+    except (PublishError, OSError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,516 @@
+"""
+Live config and branding assets from the Cloudflare Worker, fetched with asyncio.
+
+    async with Fetcher("https://assets.flowpulse.app") as fetch:
+        config = await fetch.json("/config")
+        logo = await fetch.asset("branding/logo.png")       # assets.Asset
+
+    branding = prefetch("https://assets.flowpulse.app")     # background thread
+    ...                                                     # parse the export meanwhile
+    build_report(uid, week, branding=branding.result())
+
+    python -m deckgen.remote https://assets.flowpulse.app   # fetch and show the branding
+    python -m deckgen.remote --selftest                     # check against a local stand-in Worker
+
+``ConnectionPool`` is a small HTTP/1.1 client on ``asyncio`` streams: it
+keeps connections to the Worker alive between requests and lets at most
+``limit`` requests run at once. ``Fetcher`` adds the caching on top:
+
+* every response is stored under ``REMOTE_CACHE`` with its ``ETag``, and the
+  next fetch sends ``If-None-Match`` so an unchanged object costs a 304;
+* if the Worker is unreachable, times out or answers with an error, the
+  last stored copy is used (the deck still renders, with stale branding);
+* a path is fetched at most once per ``Fetcher``: concurrent and later
+  requests share the same task, so a batch of thousands of decks costs one
+  request per object.
+
+``load_branding()`` reads the report branding from ``GET /config``::
+
+    {"report": {"title": "Weekly Focus Report", "logo": "branding/logo.png"},
+     "theme": {"accentBlue": "#38BDF8", "accentGreen": "#4ADE80"}}
+
+The logo is an R2 key served by the Worker under ``/assets/<key>`` and goes
+into the content-addressed ``deckgen.assets`` cache. ``prefetch()`` runs
+that on a background event loop so the network waits overlap with loading
+the export and rendering; the batch CLI takes ``--config-url``.
+
+``--selftest`` runs all of that against ``StandInWorker``, a local HTTP
+server answering like the Worker (ETags and 304s on ``/config``, a chunked
+PNG under ``/assets/``, added latency), and checks the request counts for
+a cold fetch, a revalidation, a thousand concurrent fetches of one path and
+the stale fallbacks.
+"""
+
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import json
+import os
+import ssl
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlsplit
+
+from deckgen import assets
+from deckgen.theme import BRAND_COLORS
+
+REMOTE_CACHE = os.environ.get("DECKGEN_REMOTE_CACHE", os.path.join(".deckcache", "remote"))
+CONFIG_URL = os.environ.get("DECKGEN_CONFIG_URL")
+CONCURRENCY = 8
+TIMEOUT = 10.0
+MAX_BODY = 64 * 1024 * 1024
+
+Response = namedtuple("Response", "status headers body")
+
+
+class FetchError(RuntimeError):
+    """A fetch failed and no cached copy was available."""
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one origin, at most ``limit`` in use."""
+
+    def __init__(self, origin, limit=CONCURRENCY, timeout=TIMEOUT):
+        url = urlsplit(origin)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL: {origin!r}")
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.host_header = url.netloc
+        self.ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self.timeout = timeout
+        self.stats = {"connections": 0, "requests": 0}
+        self._slots = asyncio.Semaphore(limit)
+        self._idle = []
+
+    async def _connect(self):
+        self.stats["connections"] += 1
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout)
+
+    async def request(self, method, path, headers=None):
+        """Send one request; returns a ``Response`` with lower-cased header names."""
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    response, keep = await asyncio.wait_for(
+                        self._exchange(reader, writer, method, path, headers or {}), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # The server may have dropped an idle keep-alive connection
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                self.stats["requests"] += 1
+                if keep:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                return response
+
+    async def _exchange(self, reader, writer, method, path, headers):
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host_header}",
+                "User-Agent: deckgen", "Accept-Encoding: identity"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        line = await reader.readline()
+        if not line:
+            raise ConnectionResetError("connection closed before the response")
+        version, status, *_ = line.decode("latin-1").split(" ", 2)
+        status = int(status)
+        fields = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            fields[name.strip().lower()] = value.strip()
+
+        keep = version == "HTTP/1.1" and fields.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif fields.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._chunked(reader)
+        elif "content-length" in fields:
+            length = int(fields["content-length"])
+            if length > MAX_BODY:
+                raise FetchError(f"{path}: {length} bytes is over the {MAX_BODY} byte limit")
+            body = await reader.readexactly(length)
+        else:
+            body = await self._to_eof(reader, path)
+            keep = False
+        return Response(status, fields, body), keep
+
+    @staticmethod
+    async def _to_eof(reader, path):
+        """A body delimited by the end of the connection, up to ``MAX_BODY`` bytes."""
+        parts, size = [], 0
+        while True:
+            part = await reader.read(1 << 16)
+            if not part:
+                return b"".join(parts)
+            size += len(part)
+            if size > MAX_BODY:
+                raise FetchError(f"{path}: body is over the {MAX_BODY} byte limit")
+            parts.append(part)
+
+    @staticmethod
+    async def _chunked(reader):
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                # Trailers, then the blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+# ── Cached fetches ────────────────────────────────────────────────────────────
+
+class Fetcher:
+    """Revalidating, deduplicated GETs against one origin with a disk fallback."""
+
+    def __init__(self, base_url, cache_dir=REMOTE_CACHE, limit=CONCURRENCY, timeout=TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.pool = ConnectionPool(self.base_url, limit, timeout)
+        self.stats = {"fetched": 0, "revalidated": 0, "stale": 0, "shared": 0}
+        self._tasks = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.pool.close()
+
+    def _paths(self, path):
+        key = hashlib.sha256(f"{self.base_url}{path}".encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, path):
+        meta_path, body_path = self._paths(path)
+        try:
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(body_path, "rb") as fh:
+                return meta, fh.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _store(self, path, response):
+        meta_path, body_path = self._paths(path)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": f"{self.base_url}{path}",
+            "etag": response.headers.get("etag"),
+            "content_type": response.headers.get("content-type"),
+        }
+        # Body first: a readable sidecar means the body next to it is complete
+        for target, data in ((body_path, response.body), (meta_path, json.dumps(meta).encode())):
+            tmp = f"{target}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, target)
+
+    def get(self, path):
+        """Awaitable body of ``GET path``, shared by every caller of this fetcher."""
+        task = self._tasks.get(path)
+        if task is None:
+            task = self._tasks[path] = asyncio.ensure_future(self._get(path))
+        else:
+            self.stats["shared"] += 1
+        return task
+
+    async def _get(self, path):
+        cached = self._load(path)
+        headers = {}
+        if cached and cached[0].get("etag"):
+            headers["If-None-Match"] = cached[0]["etag"]
+        try:
+            response = await self.pool.request("GET", path, headers)
+        except (OSError, asyncio.TimeoutError, ValueError, FetchError) as exc:
+            if cached:
+                self.stats["stale"] += 1
+                return cached[1]
+            raise FetchError(f"GET {self.base_url}{path}: {exc or type(exc).__name__}") from exc
+        if response.status == 304 and cached:
+            self.stats["revalidated"] += 1
+            return cached[1]
+        if response.status == 200:
+            self.stats["fetched"] += 1
+            self._store(path, response)
+            return response.body
+        if cached:
+            self.stats["stale"] += 1
+            return cached[1]
+        raise FetchError(f"GET {self.base_url}{path}: HTTP {response.status}")
+
+    async def json(self, path):
+        return json.loads(await self.get(path))
+
+    async def asset(self, key):
+        """R2 object ``key`` (served at ``/assets/<key>``) as a cached ``assets.Asset``."""
+        blob = await self.get(f"/assets/{quote(key)}")
+        return assets.default_cache().put(blob, os.path.basename(key))
+
+
+# ── Branding ──────────────────────────────────────────────────────────────────
+
+async def load_branding(fetcher):
+    """Report branding from the Worker's ``/config``, for ``build_report(branding=...)``.
+
+    Returns ``{"version", "title", "logo", "theme"}``: ``logo`` is an
+    ``assets.Asset`` or ``None`` and ``theme`` maps ``theme.BRAND_COLORS``
+    keys to hex strings (plain data, so it pickles into worker processes).
+    """
+    config = await fetcher.json("/config")
+    report = config.get("report") or {}
+    theme = {k: v for k, v in (config.get("theme") or {}).items() if k in BRAND_COLORS}
+    logo = report.get("logo")
+    return {
+        "version": config.get("version"),
+        "title": report.get("title"),
+        "logo": await fetcher.asset(logo) if logo else None,
+        "theme": theme,
+    }
+
+
+async def _branding(base_url, **kwargs):
+    async with Fetcher(base_url, **kwargs) as fetcher:
+        branding = await load_branding(fetcher)
+        return branding, dict(fetcher.stats, **fetcher.pool.stats)
+
+
+def fetch_branding(base_url, **kwargs):
+    """``(branding, stats)`` from ``load_branding()``, run to completion."""
+    return asyncio.run(_branding(base_url, **kwargs))
+
+
+def prefetch(base_url, **kwargs):
+    """Start ``fetch_branding()`` on a background thread; returns a ``Future``.
+
+    The caller keeps working (parsing exports, planning, rendering) while
+    the requests are in flight and takes ``future.result()`` when needed.
+    """
+    future = concurrent.futures.Future()
+
+    def run():
+        try:
+            future.set_result(fetch_branding(base_url, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="deckgen-prefetch", daemon=True).start()
+    return future
+
+
+# ── Self-test ─────────────────────────────────────────────────────────────────
+
+# 1x1 PNG
+_LOGO = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==")
+_CONFIG = {"version": "selftest", "report": {"title": "Stand-in Report", "logo": "branding/logo.png"},
+           "theme": {"accentBlue": "#38BDF8"}}
+
+
+_EOF_BODY = bytes(range(256)) * 1024          # 256 KB, more than one read
+
+
+class StandInWorker:
+    """A local HTTP server that answers ``/config`` and ``/assets/<key>`` like the Worker.
+
+    Every response waits ``latency`` seconds; ``requests`` counts
+    ``(path, status)`` pairs. The logo is sent with chunked encoding and
+    ``EOF_PATH`` without a length, in pieces, until the connection closes.
+    """
+
+    EOF_PATH = "/assets/branding/unsized.bin"
+
+    def __init__(self, latency=0.05, config=_CONFIG, logo=_LOGO):
+        self.latency = latency
+        self.requests = Counter()
+        bodies = {"/config": (json.dumps(config).encode(), "application/json"),
+                  f"/assets/{config['report']['logo']}": (logo, "image/png"),
+                  self.EOF_PATH: (_EOF_BODY, "application/octet-stream")}
+        worker = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(worker.latency)
+                if self.path not in bodies:
+                    worker.requests[self.path, 404] += 1
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body, content_type = bodies[self.path]
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    worker.requests[self.path, 304] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                worker.requests[self.path, 200] += 1
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", content_type)
+                if self.path == worker.EOF_PATH:
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.close_connection = True
+                    for i in range(0, len(body), 1 << 16):
+                        self.wfile.write(body[i:i + (1 << 16)])
+                        self.wfile.flush()
+                        time.sleep(0.01)
+                elif content_type == "image/png":
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for i in range(0, len(body), 16):
+                        chunk = body[i:i + 16]
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, name="deckgen-standin", daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+async def _fetch_many(base_url, path, count, **kwargs):
+    async with Fetcher(base_url, **kwargs) as fetcher:
+        bodies = await asyncio.gather(*(fetcher.get(path) for _ in range(count)))
+        return bodies, fetcher.stats
+
+
+def selftest(latency=0.05, log=sys.stdout):
+    """Check caching, revalidation, dedup and fallbacks against ``StandInWorker``; returns the exit status."""
+    failures = 0
+
+    def check(ok, what):
+        nonlocal failures
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {what}", file=log)
+
+    worker = StandInWorker(latency)
+    saved_assets = assets._default
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "remote")
+        assets._default = assets.AssetCache(os.path.join(tmp, "assets"))
+        try:
+            branding, stats = fetch_branding(worker.url, cache_dir=cache)
+            logo = branding["logo"]
+            check(branding["title"] == "Stand-in Report" and logo is not None and logo.blob == _LOGO
+                  and branding["theme"] == {"accentBlue": "#38BDF8"},
+                  "cold fetch: config and chunked logo decoded")
+            check(stats["fetched"] == 2 and sum(worker.requests.values()) == 2,
+                  f"cold fetch: 2 requests ({dict(worker.requests)})")
+
+            worker.requests.clear()
+            _, stats = fetch_branding(worker.url, cache_dir=cache)
+            check(stats["revalidated"] == 2 and worker.requests == Counter(
+                {("/config", 304): 1, (f"/assets/{_CONFIG['report']['logo']}", 304): 1}),
+                f"warm fetch: both revalidated with 304 ({dict(worker.requests)})")
+
+            worker.requests.clear()
+            bodies, stats = asyncio.run(_fetch_many(worker.url, "/config", 1000, cache_dir=cache))
+            check(len(set(bodies)) == 1 and sum(worker.requests.values()) == 1 and stats["shared"] == 999,
+                  f"1000 concurrent gets of one path: {sum(worker.requests.values())} request, "
+                  f"{stats['shared']} shared")
+
+            (body,), _ = asyncio.run(_fetch_many(worker.url, worker.EOF_PATH, 1, cache_dir=cache))
+            check(body == _EOF_BODY, f"body without Content-Length read to the end ({len(body):,} bytes)")
+
+            url = worker.url
+            worker.close()
+            worker = None
+            branding, stats = fetch_branding(url, cache_dir=cache, timeout=1)
+            check(branding["title"] == "Stand-in Report" and stats["stale"] == 2,
+                  "server down: stale cached config and logo used")
+            try:
+                fetch_branding(url, cache_dir=os.path.join(tmp, "empty"), timeout=1)
+                check(False, "server down, nothing cached: expected FetchError")
+            except FetchError:
+                check(True, "server down, nothing cached: FetchError")
+        finally:
+            if worker is not None:
+                worker.close()
+            assets._default = saved_assets
+    return 1 if failures else 0
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch the report branding from the Worker.")
+    parser.add_argument("url", nargs="?", default=CONFIG_URL,
+                        help="Worker base URL (default: $DECKGEN_CONFIG_URL)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per request")
+    parser.add_argument("--selftest", action="store_true",
+                        help="check the client against a local stand-in Worker and exit")
+    args = parser.parse_args(argv)
+    if args.selftest:
+        return selftest()
+    if not args.url:
+        parser.error("no Worker URL given and $DECKGEN_CONFIG_URL is not set")
+
+    try:
+        branding, stats = fetch_branding(args.url, timeout=args.timeout)
+    except FetchError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    logo = branding["logo"]
+    print(f"✅ config {branding['version'] or '?'}: title={branding['title']!r} "
+          f"logo={logo.filename + f' ({len(logo.blob)} bytes)' if logo else None} "
+          f"theme={branding['theme']}")
+    print("   " + ", ".join(f"{k} {v}" for k, v in stats.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
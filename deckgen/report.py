@@ -0,0 +1,276 @@
+"""
+Per-user weekly report deck built from ``dailyStats`` / ``dailyRealtime`` docs.
+
+The Firestore export is a JSONL file with one document per line::
+
+    {"path": "users/<uid>/dailyStats/2026-03-18", "data": {...}}
+    {"path": "users/<uid>/dailyRealtime/2026-03-18", "data": {...}}
+
+``dailyStats`` carries seconds (``productiveTime``, ``distractionTime``,
+``totalDuration``); ``dailyRealtime`` carries the lightweight
+``activitySummary`` in minutes. Both are normalised into one "day" dict.
+
+With ``history`` (every day of the user up to the report week) the deck
+gains a trend slide of native line charts: tracked days are rolled up by
+day, week or month depending on the span and LTTB-downsampled to at most
+``TREND_POINTS`` points (see ``deckgen.timeseries``).
+
+``branding`` (see ``deckgen.remote.load_branding()``) replaces the title,
+adds a logo to the title slide and swaps the theme's accent colors for
+the ones in the live config.
+
+``catalog`` (``deckgen.i18n.load_catalog(locale)``) translates the deck's
+headings and labels and the strings bound into it; dates stay ISO.
+"""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+from pptx.enum.text import PP_ALIGN
+
+from deckgen.theme import (
+    BG_CARD, ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK,
+    TEXT_WHITE, TEXT_MUTED, BORDER_COLOR, palette,
+)
+from deckgen.spec import (
+    Deck, Slide, Text, Rect, Circle, Accent, Repeat, Chart, Image, Field, heading, localize, recolor,
+    render_deck,
+)
+from deckgen.i18n import SOURCE
+from deckgen.timeseries import auto_period, chart_series
+
+REPORT_DAYS = 7
+BAR_WIDTH = 4.0   # inches of the focus-score bar at 100
+TREND_POINTS = 120
+REPORT_TITLE = "Weekly Focus Report"
+
+
+# ── Export loading ────────────────────────────────────────────────────────────
+
+def _empty_day(day):
+    return {
+        "date": day,
+        "focusScore": 0,
+        "productiveMinutes": 0,
+        "distractionMinutes": 0,
+        "totalMinutes": 0,
+        "topDomain": "",
+        "peakHour": None,
+    }
+
+
+def _merge_doc(day, collection, data):
+    if collection == "dailyStats":
+        day["focusScore"] = data.get("focusScore", day["focusScore"])
+        day["productiveMinutes"] = round(data.get("productiveTime", 0) / 60)
+        day["distractionMinutes"] = round(data.get("distractionTime", 0) / 60)
+        day["totalMinutes"] = round(data.get("totalDuration", 0) / 60)
+        top = data.get("topDomains") or []
+        if top:
+            day["topDomain"] = top[0].get("domain", "")
+        day["peakHour"] = data.get("peakHour")
+    elif collection == "dailyRealtime":
+        # dailyStats is authoritative; realtime only fills the gaps
+        summary = data.get("activitySummary") or {}
+        if not day["totalMinutes"]:
+            day["totalMinutes"] = summary.get("activeMinutes", 0)
+        if not day["productiveMinutes"]:
+            day["productiveMinutes"] = summary.get("productiveMinutes", 0)
+        if not day["focusScore"]:
+            day["focusScore"] = summary.get("focusScore", 0)
+        if not day["topDomain"]:
+            day["topDomain"] = summary.get("topDomain", "")
+
+
+def load_export(path):
+    """Group an export into ``{uid: [day, ...]}`` with days sorted by date."""
+    users = {}
+    # dailyRealtime only fills gaps, so apply it after dailyStats regardless
+    # of line order in the export
+    deferred = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            doc = json.loads(line)
+            parts = doc["path"].split("/")
+            if len(parts) != 4 or parts[0] != "users":
+                continue
+            _, uid, collection, day_id = parts
+            if collection == "dailyRealtime":
+                deferred.append((uid, day_id, doc.get("data") or {}))
+                continue
+            if collection != "dailyStats":
+                continue
+            days = users.setdefault(uid, {})
+            day = days.setdefault(day_id, _empty_day(day_id))
+            _merge_doc(day, collection, doc.get("data") or {})
+    for uid, day_id, data in deferred:
+        days = users.setdefault(uid, {})
+        day = days.setdefault(day_id, _empty_day(day_id))
+        _merge_doc(day, "dailyRealtime", data)
+    return {uid: [days[k] for k in sorted(days)] for uid, days in users.items()}
+
+
+def date_window(days, start, end):
+    """Return every day from ``start`` to ``end`` (ISO dates, inclusive), empty where untracked."""
+    cur, last = date.fromisoformat(start), date.fromisoformat(end)
+    by_date = {d["date"]: d for d in days if start <= d["date"] <= end}
+    window = []
+    while cur <= last:
+        key = cur.isoformat()
+        window.append(by_date.get(key) or _empty_day(key))
+        cur += timedelta(days=1)
+    return window
+
+
+def week_window(days, week_ending=None):
+    """Return the ``REPORT_DAYS`` days ending at ``week_ending`` (or the latest day)."""
+    if not days:
+        return []
+    end = date.fromisoformat(week_ending or days[-1]["date"])
+    start = end - timedelta(days=REPORT_DAYS - 1)
+    return date_window(days, start.isoformat(), end.isoformat())
+
+
+def _fmt_minutes(minutes):
+    hours, mins = divmod(int(minutes), 60)
+    return f"{hours}h {mins:02d}m" if hours else f"{mins}m"
+
+
+# ── Deck ──────────────────────────────────────────────────────────────────────
+
+REPORT_DECK = Deck((
+    Slide("report_title", (
+        Circle(10.5, 1.0, 2.5, ACCENT_BLUE),
+        Circle(11.2, 2.8, 1.5, ACCENT_GREEN),
+        # The logo is optional branding; a None logo is skipped
+        Image(1.2, 0.8, None, 0.7, Field("logo")),
+        Text(1.2, 1.8, 8, 1.2, Field("title"), font_size=48, color=TEXT_WHITE, bold=True),
+        Accent(1.2, 3.1, 3, ACCENT_BLUE, 4),
+        Text(1.2, 3.4, 8, 0.6, Field("range"), font_size=22, color=TEXT_MUTED),
+        Text(1.2, 4.2, 8, 0.5, Field("user"), font_size=14, color=ACCENT_BLUE),
+    ), top_bar=ACCENT_BLUE),
+    Slide("report_kpis", heading("Week at a Glance", ACCENT_GREEN) + (
+        Repeat("cards", ("label", "value", "color"), dx=3.05, children=(
+            Rect(0.8, 1.8, 2.8, 2.2, BG_CARD, BORDER_COLOR, 0.05),
+            Rect(0.8, 1.8, 2.8, 0.06, Field("color")),
+            Text(1.0, 2.1, 2.4, 0.4, Field("label"), font_size=13, color=TEXT_MUTED, bold=True),
+            Text(1.0, 2.6, 2.4, 1.0, Field("value"), font_size=30, color=TEXT_WHITE, bold=True),
+        )),
+    )),
+    Slide("report_daily", heading("Daily Breakdown", ACCENT_BLUE) + (
+        Rect(0.8, 1.7, 11.7, 5.2, BG_CARD, BORDER_COLOR, 0.03),
+        Repeat("days", ("date", "score", "bar_w", "bar_color", "productive", "domain"), dy=0.68,
+               per_page=REPORT_DAYS, children=(
+            Text(1.1, 2.0, 1.4, 0.35, Field("date"), font_size=15, color=TEXT_WHITE, bold=True),
+            Rect(2.5, 2.05, BAR_WIDTH, 0.28, BORDER_COLOR),
+            # bar_w is None on untracked days, which skips the bar
+            Rect(2.5, 2.05, Field("bar_w"), 0.28, Field("bar_color")),
+            Text(6.6, 2.0, 0.7, 0.35, Field("score"), font_size=15, color=TEXT_WHITE, bold=True,
+                 alignment=PP_ALIGN.RIGHT),
+            Text(7.6, 2.0, 2.4, 0.35, Field("productive"), font_size=13, color=TEXT_MUTED),
+            # Domain names vary in length; shrink long ones onto one line
+            Text(10.0, 2.0, 2.3, 0.35, Field("domain"), font_size=13, color=ACCENT_BLUE,
+                 fit=True, min_size=9),
+        )),
+    )),
+))
+
+
+TREND_SLIDE = Slide("report_trend", heading("Focus Trend", ACCENT_PINK) + (
+    Text(0.8, 1.35, 11.7, 0.4, Field("period"), font_size=14, color=TEXT_MUTED),
+    Rect(0.8, 1.9, 5.75, 5.0, BG_CARD, BORDER_COLOR, 0.03),
+    Rect(6.75, 1.9, 5.75, 5.0, BG_CARD, BORDER_COLOR, 0.03),
+    Text(1.0, 2.05, 5.3, 0.4, "Focus Score", font_size=13, color=TEXT_MUTED, bold=True),
+    Text(6.95, 2.05, 5.3, 0.4, "Minutes per Day", font_size=13, color=TEXT_MUTED, bold=True),
+    Chart(0.9, 2.5, 5.55, 4.3, Field("focus"), colors=(ACCENT_BLUE,)),
+    Chart(6.85, 2.5, 5.55, 4.3, Field("minutes"), colors=(ACCENT_GREEN, ACCENT_PINK)),
+))
+
+REPORT_TREND_DECK = Deck(REPORT_DECK.slides + (TREND_SLIDE,))
+
+_PERIOD_LABELS = {"day": "Daily", "week": "Weekly averages", "month": "Monthly averages"}
+
+
+def trend_data(history, end=None, catalog=None):
+    """``report_trend`` fields from every tracked day up to ``end`` (inclusive)."""
+    _ = catalog or SOURCE
+    days = [d for d in history if d["totalMinutes"] and (end is None or d["date"] <= end)]
+    if not days:
+        return {"period": _("No tracked days yet"), "focus": None, "minutes": None}
+    times = np.array([d["date"] for d in days], dtype="datetime64[D]")
+    period = auto_period(times)
+    focus = chart_series(times, {_("Focus score"): [d["focusScore"] for d in days]},
+                         period, how="mean", max_points=TREND_POINTS)
+    minutes = chart_series(times, {
+        _("Productive"): [d["productiveMinutes"] for d in days],
+        _("Distraction"): [d["distractionMinutes"] for d in days],
+    }, period, how="mean", max_points=TREND_POINTS, decimals=0)
+    return {
+        "period": f"{_(_PERIOD_LABELS[period])}  ·  {days[0]['date']}  –  {days[-1]['date']}  ·  "
+                  + _("{count} tracked days").format(count=len(days)),
+        "focus": focus,
+        "minutes": minutes,
+    }
+
+
+def report_data(uid, week, history=None, branding=None, catalog=None):
+    """Bind a ``week_window()`` into the fields ``REPORT_DECK`` expects.
+
+    With ``history`` the data also fills ``REPORT_TREND_DECK``'s trend slide.
+    """
+    _ = catalog or SOURCE
+    branding = branding or {}
+    colors = palette(branding.get("theme"))
+    accent = {c: colors.get(c, c) for c in (ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK)}
+    tracked = [d for d in week if d["totalMinutes"]]
+    avg_focus = round(sum(d["focusScore"] for d in tracked) / len(tracked)) if tracked else 0
+    productive = sum(d["productiveMinutes"] for d in week)
+    distraction = sum(d["distractionMinutes"] for d in week)
+    best = max(week, key=lambda d: d["focusScore"])
+
+    data = {
+        "report_title": {
+            "title": _(branding.get("title") or REPORT_TITLE),
+            "logo": branding.get("logo"),
+            "range": f"{week[0]['date']}  –  {week[-1]['date']}",
+            "user": _("User {uid}").format(uid=uid),
+        },
+        "report_kpis": {"cards": [
+            (_("Avg Focus Score"), f"{avg_focus}", accent[ACCENT_BLUE]),
+            (_("Productive Time"), _fmt_minutes(productive), accent[ACCENT_GREEN]),
+            (_("Distraction Time"), _fmt_minutes(distraction), accent[ACCENT_PINK]),
+            (_("Best Day"), f"{best['date'][5:]}  ·  {best['focusScore']}", accent[ACCENT_AMBER]),
+        ]},
+        "report_daily": {"days": [
+            (
+                d["date"][5:],
+                str(d["focusScore"]),
+                BAR_WIDTH * min(d["focusScore"], 100) / 100 if d["focusScore"] else None,
+                accent[ACCENT_GREEN] if d["focusScore"] >= 60 else accent[ACCENT_AMBER],
+                _("{time} productive").format(time=_fmt_minutes(d["productiveMinutes"])),
+                d["topDomain"] or "—",
+            )
+            for d in week
+        ]},
+    }
+    if history is not None:
+        data["report_trend"] = trend_data(history, week[-1]["date"], catalog)
+    return data
+
+
+def build_report(uid, week, template=None, clone=True, history=None, branding=None, master=False,
+                 catalog=None):
+    """Build the weekly report deck for one user from a ``week_window()``.
+
+    ``history`` adds the trend slide; see ``trend_data()``. ``master`` draws
+    the chrome on a themed master (``deckgen.master``). ``catalog``
+    localizes it (``deckgen.i18n``).
+    """
+    deck = REPORT_DECK if history is None else REPORT_TREND_DECK
+    deck = localize(recolor(deck, palette((branding or {}).get("theme"))), catalog)
+    return render_deck(deck, report_data(uid, week, history, branding, catalog), template=template,
+                       clone=clone, master=master)
@@ -0,0 +1,728 @@
+"""
+Declarative slide specs compiled once into EMU-resolved render plans.
+
+A deck is described with frozen dataclasses that mirror the shape helpers::
+
+    Slide("overview", (
+        Text(0.8, 0.5, 6, 0.7, "Project Overview", font_size=36, bold=True),
+        Accent(0.8, 1.2, 2.5, ACCENT_BLUE),
+        Repeat("cards", ("label", "value", "color"), dx=3.05, children=(
+            Rect(0.8, 1.8, 2.8, 2.2, BG_CARD, BORDER_COLOR, 0.05),
+            Text(1.0, 2.1, 2.4, 0.4, Field("label"), color=TEXT_MUTED),
+        )),
+    ))
+
+Geometry is given in inches (or as a pptx ``Length`` for EMU values such as
+``SLIDE_WIDTH``). ``compile_deck()`` converts every coordinate to EMU and
+pre-computes ``Repeat`` offsets once; the result is cached, so rendering
+many decks from the same spec only binds ``Field`` values from the data.
+Shapes are emitted through ``deckgen.fastxml``, which stamps cached per-style
+element templates instead of going through python-pptx's property setters.
+
+Children of a ``Repeat`` are positioned as if they were item 0; item ``i``
+is shifted by ``(i % wrap) * (dx, dy) + (i // wrap) * (wrap_dx, wrap_dy)``.
+Fields resolve against the current repeat item first, then the slide data;
+tuple items are named by ``Repeat.fields`` and scalar items by its first field.
+An element whose bound text or geometry is ``None`` is skipped for that item.
+
+``Repeat(..., per_page=n)`` paginates: the slide is emitted once per ``n``
+items, each page binding its slice of the list plus ``page``, ``pages``,
+``first``, ``last`` and ``count`` (1-based item numbers), e.g. for a title
+``Format("Phases ({first}–{last})")``. ``deck_pages()`` sizes every
+paginated slide from its list length alone, so the ``n/total`` footers are
+known before the first slide is rendered and each item is bound once.
+
+``Text(..., fit=True)`` and ``Lines(..., fit=True)`` shrink the font size
+until the (wrapped) text fits the box, down to ``min_size``; see
+``deckgen.layout``. Unbound text is fitted once at compile time.
+
+``Chart(x, y, w, h, Field("trend"))`` adds a native line chart from
+``(categories, ((name, values), ...))``, e.g. ``timeseries.chart_series()``
+output; a ``None`` chart is skipped. A chart owns its own chart and
+workbook parts, so it is always rendered fresh and never cloned.
+
+``Image(x, y, w, h, source)`` places a picture from a path, bytes or an
+``assets.Asset`` (e.g. ``assets.sparkline(values)``) through the
+content-addressed asset cache; ``w`` or ``h`` may be ``None`` to keep the
+aspect ratio. Pictures reference their image part by rId, so like charts
+they are never cloned.
+
+A slide's chrome – ``Slide(bg=..., top_bar=..., footer=...)`` – is drawn on
+the slide itself, unless the presentation has the themed master from
+``deckgen.master`` (``render_deck(..., master=True)``), whose layouts carry
+it instead.
+
+Every rendered slide is named ``<id>#<digest>`` (``slide_name()``): a
+stable id plus a hash of its inputs, by which ``deckgen.patch`` updates a
+finished deck in place.
+"""
+
+import hashlib
+from collections import ChainMap
+from copy import deepcopy
+from dataclasses import dataclass, fields, is_dataclass, replace
+from functools import lru_cache
+
+from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+from pptx.util import Inches, Length
+from pptx.enum.text import PP_ALIGN
+
+from deckgen import tracing
+from deckgen.layout import MIN_FONT_SIZE, fit_text, fit_lines
+from deckgen.theme import BG_DARK, ACCENT_BLUE, TEXT_WHITE, SLIDE_WIDTH, TOP_BAR_HEIGHT
+from deckgen.helpers import (
+    CHART_COLORS, new_presentation, add_blank_slide, add_bg, add_line_chart, add_image,
+)
+from deckgen.master import apply_master, layout_for, to_scheme
+from deckgen.fastxml import (
+    add_shape, add_text_box, add_multiline_box, add_accent_line, add_icon_circle,
+    slide_number_footer, next_shape_id,
+)
+
+
+# ── Spec elements ─────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Field:
+    """Placeholder bound from the slide data (or the current repeat item)."""
+    key: str
+
+    def resolve(self, item, data):
+        return _lookup(self.key, item, data)
+
+
+@dataclass(frozen=True)
+class Format:
+    """``str.format`` pattern over the current repeat item and the slide data."""
+    pattern: str
+
+    def resolve(self, item, data):
+        return self.pattern.format_map(ChainMap(item or {}, data))
+
+
+_BOUND = (Field, Format)
+
+
+@dataclass(frozen=True)
+class Text:
+    x: object
+    y: object
+    w: object
+    h: object
+    text: object
+    font_size: object = 18
+    color: object = TEXT_WHITE
+    bold: object = False
+    alignment: object = PP_ALIGN.LEFT
+    font_name: str = "Calibri"
+    line_spacing: float = 1.2
+    fit: bool = False
+    min_size: float = MIN_FONT_SIZE
+
+
+@dataclass(frozen=True)
+class Lines:
+    x: object
+    y: object
+    w: object
+    h: object
+    lines: object
+    font_size: object = 16
+    color: object = TEXT_WHITE
+    font_name: str = "Calibri"
+    line_spacing: float = 1.5
+    alignment: object = PP_ALIGN.LEFT
+    fit: bool = False
+    min_size: float = MIN_FONT_SIZE
+
+
+@dataclass(frozen=True)
+class Rect:
+    x: object
+    y: object
+    w: object
+    h: object
+    fill: object
+    border: object = None
+    radius: object = None
+
+
+@dataclass(frozen=True)
+class Circle:
+    x: object
+    y: object
+    size: object
+    color: object
+    label: object = ""
+    label_size: object = 20
+
+
+@dataclass(frozen=True)
+class Accent:
+    x: object
+    y: object
+    w: object
+    color: object = ACCENT_BLUE
+    thickness: object = 3
+
+
+@dataclass(frozen=True)
+class Chart:
+    x: object
+    y: object
+    w: object
+    h: object
+    data: object
+    colors: tuple = CHART_COLORS
+    number_format: str = "0"
+    font_size: object = 10
+
+
+@dataclass(frozen=True)
+class Image:
+    x: object
+    y: object
+    w: object
+    h: object
+    source: object
+
+
+@dataclass(frozen=True)
+class Repeat:
+    items: str
+    fields: tuple = ()
+    children: tuple = ()
+    dx: float = 0
+    dy: float = 0
+    wrap: int = 0
+    wrap_dx: float = 0
+    wrap_dy: float = 0
+    per_page: int = 0
+
+
+@dataclass(frozen=True)
+class Slide:
+    """One slide. ``static=True`` marks slides whose data is the same in every
+    deck (e.g. the table of contents) so they can be cloned whole.
+
+    ``bg``, ``top_bar`` (a colour, or ``None`` for none) and ``footer`` are
+    the slide's chrome; see ``deckgen.master``."""
+    name: str
+    children: tuple = ()
+    bg: object = BG_DARK
+    footer: bool = True
+    static: bool = False
+    top_bar: object = None
+
+
+@dataclass(frozen=True)
+class Deck:
+    slides: tuple
+
+
+def heading(title, accent, width=6):
+    """Slide title + accent underline used on every content slide."""
+    return (
+        Text(0.8, 0.5, width, 0.7, title, font_size=36, color=TEXT_WHITE, bold=True),
+        Accent(0.8, 1.2, 2.5, accent, 3),
+    )
+
+
+def recolor(deck, palette):
+    """``deck`` with every color in ``palette`` (``{old: new}``) swapped.
+
+    Specs are frozen, so this builds a new ``Deck``; it is cached per
+    palette, so a rebranded deck is compiled once like any other spec.
+    """
+    if not palette:
+        return deck
+    return _recolor(deck, tuple(palette.items()))
+
+
+@lru_cache(maxsize=64)
+def _recolor(deck, swaps):
+    swaps = dict(swaps)
+
+    def swap(value):
+        if isinstance(value, RGBColor):
+            return swaps.get(value, value)
+        if isinstance(value, tuple):
+            return tuple(swap(v) for v in value)
+        if is_dataclass(value) and not isinstance(value, _BOUND):
+            return replace(value, **{f.name: swap(getattr(value, f.name)) for f in fields(value)})
+        return value
+
+    return swap(deck)
+
+
+def localize(deck, catalog):
+    """``deck`` with its texts translated by ``catalog`` (``deckgen.i18n``).
+
+    Literal ``Text``/``Lines`` texts, ``Circle`` labels and ``Format``
+    patterns go through the catalog, and every ``Text`` and ``Lines`` whose
+    text is bound or translated is shrunk to fit, since a translation may be
+    longer than the box was drawn for. Cached per catalog; elements without
+    translated text compile to the same ops in every locale. The source
+    catalog returns ``deck`` itself.
+    """
+    if catalog is None or catalog.is_source:
+        return deck
+    return _localize(deck, catalog)
+
+
+@lru_cache(maxsize=64)
+def _localize(deck, catalog):
+    def text(value):
+        if isinstance(value, str):
+            return catalog(value)
+        if isinstance(value, Format):
+            return Format(catalog(value.pattern))
+        return value
+
+    def lines(value):
+        if not isinstance(value, (tuple, list)):
+            return value
+        return tuple((text(line[0]),) + tuple(line[1:]) if isinstance(line, tuple) else text(line)
+                     for line in value)
+
+    def element(el):
+        if isinstance(el, Text):
+            translated = text(el.text)
+            return replace(el, text=translated, fit=el.fit or translated != el.text or isinstance(el.text, Field))
+        if isinstance(el, Lines):
+            translated = lines(el.lines)
+            return replace(el, lines=translated, fit=el.fit or translated != el.lines or isinstance(el.lines, Field))
+        if isinstance(el, Circle):
+            return replace(el, label=text(el.label))
+        if isinstance(el, Repeat):
+            return replace(el, children=tuple(element(c) for c in el.children))
+        return el
+
+    return Deck(tuple(replace(s, children=tuple(element(c) for c in s.children)) for s in deck.slides))
+
+
+# ── Compiler ──────────────────────────────────────────────────────────────────
+
+def _emu(value):
+    if isinstance(value, _BOUND):
+        return value
+    if isinstance(value, Length):
+        return int(value)
+    return Inches(value)
+
+
+class _Op:
+    """One helper call with geometry already resolved to EMU."""
+    __slots__ = ("fn", "geom", "args", "kwargs", "text_key", "bound", "fit", "parts")
+
+    def __init__(self, fn, geom, args, kwargs, text_key=None, fit=None, parts=False):
+        self.fn = fn
+        self.geom = tuple(_emu(v) for v in geom)
+        self.args = args
+        self.kwargs = kwargs
+        self.text_key = text_key
+        # Shapes that point at a part of their own (chart, picture) by rId:
+        # copying the XML is not enough, so they are always run, never cloned
+        self.parts = parts
+        self.bound = (
+            parts
+            or any(isinstance(v, _BOUND) for v in self.geom)
+            or any(isinstance(v, _BOUND) for v in args)
+            or any(isinstance(v, _BOUND) for v in kwargs.values())
+        )
+        # Minimum font size when the text is shrunk to fit its box
+        self.fit = fit
+        if fit is not None and not self.bound:
+            args = list(args)
+            _fit(self, self.geom, args, kwargs)
+            self.args = tuple(args)
+            self.fit = None
+
+
+def _fit(op, geom, args, kwargs):
+    """Shrink the font size(s) in ``args``/``kwargs`` until the text fits ``geom``."""
+    if op.fn is add_text_box:
+        kwargs["font_size"] = fit_text(
+            args[0], geom[2], geom[3], kwargs["font_size"], kwargs["font_name"],
+            kwargs["bold"], kwargs["line_spacing"], op.fit)
+    else:
+        kwargs["font_size"], args[0] = fit_lines(
+            args[0], geom[2], geom[3], kwargs["font_size"], kwargs["font_name"],
+            kwargs["line_spacing"], op.fit)
+
+
+class _RepeatOp:
+    __slots__ = ("items", "fields", "ops", "spec", "offsets")
+
+    def __init__(self, spec, ops):
+        self.items = spec.items
+        self.fields = spec.fields
+        self.ops = ops
+        self.spec = spec
+        self.offsets = []
+
+    def offset(self, i):
+        while len(self.offsets) <= i:
+            n = len(self.offsets)
+            s = self.spec
+            step, band = (n % s.wrap, n // s.wrap) if s.wrap else (n, 0)
+            self.offsets.append((
+                Inches(step * s.dx + band * s.wrap_dx),
+                Inches(step * s.dy + band * s.wrap_dy),
+            ))
+        return self.offsets[i]
+
+
+@lru_cache(maxsize=None)
+def _compile_element(el):
+    # Cached per element, so equal elements share one op (and its clone
+    # cache entry) across slides, decks, palettes and locales
+    if isinstance(el, Text):
+        return _Op(add_text_box, (el.x, el.y, el.w, el.h), (el.text,), {
+            "font_size": el.font_size, "color": el.color, "bold": el.bold,
+            "alignment": el.alignment, "font_name": el.font_name,
+            "line_spacing": el.line_spacing,
+        }, text_key=el.text, fit=el.min_size if el.fit else None)
+    if isinstance(el, Lines):
+        return _Op(add_multiline_box, (el.x, el.y, el.w, el.h), (el.lines,), {
+            "font_size": el.font_size, "color": el.color, "font_name": el.font_name,
+            "line_spacing": el.line_spacing, "alignment": el.alignment,
+        }, fit=el.min_size if el.fit else None)
+    if isinstance(el, Rect):
+        return _Op(add_shape, (el.x, el.y, el.w, el.h), (el.fill, el.border, el.radius), {})
+    if isinstance(el, Circle):
+        return _Op(add_icon_circle, (el.x, el.y, el.size), (el.color, el.label, el.label_size), {})
+    if isinstance(el, Accent):
+        return _Op(add_accent_line, (el.x, el.y, el.w), (el.color, el.thickness), {})
+    if isinstance(el, Chart):
+        return _Op(add_line_chart, (el.x, el.y, el.w, el.h), (el.data,), {
+            "colors": el.colors, "number_format": el.number_format, "font_size": el.font_size,
+        }, text_key=el.data, parts=True)
+    if isinstance(el, Image):
+        # A 0 width or height is derived from the aspect ratio by add_image()
+        return _Op(add_image, (el.x, el.y, el.w or 0, el.h or 0), (el.source,), {},
+                   text_key=el.source, parts=True)
+    if isinstance(el, Repeat):
+        if any(isinstance(c, Repeat) for c in el.children):
+            raise ValueError(f"nested Repeat is not supported: {el.items}")
+        return _RepeatOp(el, tuple(_compile_element(c) for c in el.children))
+    raise TypeError(f"unknown spec element: {el!r}")
+
+
+def _leaf_ops(ops):
+    for op in ops:
+        if isinstance(op, _RepeatOp):
+            yield from op.ops
+        else:
+            yield op
+
+
+class CompiledSlide:
+    __slots__ = ("name", "spec", "ops", "chrome", "bg", "top_bar", "footer", "static", "paginate", "digest")
+
+    def __init__(self, spec):
+        self.name = spec.name
+        self.spec = spec
+        self.ops = tuple(_compile_element(el) for el in spec.children)
+        # Drawn under the shapes unless a themed master's layout carries them
+        self.chrome = () if spec.top_bar is None else (
+            _compile_element(Rect(0, 0, SLIDE_WIDTH, TOP_BAR_HEIGHT, spec.top_bar)),
+        )
+        self.bg = spec.bg
+        self.top_bar = spec.top_bar
+        self.footer = spec.footer
+        parts = any(op.parts for op in _leaf_ops(self.ops))
+        self.static = (spec.static or all(
+            isinstance(op, _Op) and not op.bound for op in self.ops
+        )) and not parts
+        # Slides with chart or picture parts are never patched, so need no digest
+        self.digest = None if parts else hashlib.sha256(repr(spec).encode()).hexdigest()
+        paged = [op for op in self.ops if isinstance(op, _RepeatOp) and op.spec.per_page]
+        if len(paged) > 1:
+            raise ValueError(f"slide {spec.name} paginates more than one Repeat")
+        self.paginate = paged[0] if paged else None
+
+    def page_count(self, data):
+        if self.paginate is None:
+            return 1
+        items = len(_lookup(self.paginate.items, None, data))
+        return max(1, -(-items // self.paginate.spec.per_page))
+
+    def page_data(self, data, page, pages):
+        """``data`` for page ``page`` (0-based) of ``pages``."""
+        if self.paginate is None:
+            return data
+        key, per_page = self.paginate.items, self.paginate.spec.per_page
+        items = _lookup(key, None, data)
+        start = page * per_page
+        chunk = items[start:start + per_page]
+        return dict(data, **{key: chunk}, page=page + 1, pages=pages,
+                    first=start + 1, last=start + len(chunk), count=len(items))
+
+
+@lru_cache(maxsize=None)
+def compile_deck(deck):
+    """Resolve every slide of ``deck`` to EMU once; cached per spec."""
+    return tuple(CompiledSlide(s) for s in deck.slides)
+
+
+def deck_pages(deck, data):
+    """``(total, pages)`` for ``deck`` bound to ``data``.
+
+    ``pages`` yields ``(compiled, slide_data)`` in order, one per output
+    slide; ``total`` counts them up front from the paginated lists' lengths.
+    """
+    compiled = compile_deck(deck)
+    counts = [slide.page_count(data.get(slide.name, {})) for slide in compiled]
+
+    def pages():
+        for slide, count in zip(compiled, counts):
+            slide_data = data.get(slide.name, {})
+            for page in range(count):
+                yield slide, slide.page_data(slide_data, page, count)
+
+    return sum(counts), pages()
+
+
+# Top-level shapes of a slide; each one deckgen draws is named "<kind> #<n>",
+# n its place among them, which ``deckgen.patch`` matches shapes by
+SHAPE_TAGS = frozenset(qn(t) for t in ("p:sp", "p:pic", "p:cxnSp", "p:graphicFrame", "p:grpSp",
+                                       "p:contentPart"))
+_KEY_MARK = " #"
+
+
+def shape_key(element):
+    """The deckgen key of a top-level shape element, or ``None`` for one added by hand."""
+    name = element[0][0].get("name") or ""
+    key = name.rpartition(_KEY_MARK)[2]
+    return key if _KEY_MARK in name and key.isdigit() else None
+
+
+def _stamp_keys(spTree):
+    n = 0
+    for element in spTree:
+        if element.tag in SHAPE_TAGS:
+            n += 1
+            cNvPr = element[0][0]
+            kind = cNvPr.get("name", "").rsplit(" ", 1)[0]
+            cNvPr.set("name", f"{kind}{_KEY_MARK}{n}")
+
+
+def slide_name(compiled, data, num, total, themed=False):
+    """``"<id>#<digest>"``, the ``p:cSld`` name of a rendered slide.
+
+    The id is the spec slide's name, plus ``.<page>`` on a paginated slide,
+    so it is the same in every build; the digest changes with anything the
+    slide's XML is made from (spec, data, position, deck length, themed
+    chrome). Slides with chart or picture parts get the id alone.
+    ``deckgen.patch`` finds and compares slides in a finished deck by it.
+    """
+    slide_id = compiled.name if compiled.paginate is None else f"{compiled.name}.{data['page']}"
+    if compiled.digest is None:
+        return slide_id
+    key = f"{compiled.digest}:{num}/{total}:{themed:d}:{data!r}"
+    return f"{slide_id}#{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+
+
+# ── Static cloning ────────────────────────────────────────────────────────────
+# Anything that binds no data renders to identical XML in every deck, so it
+# is built through python-pptx once and deep-copied afterwards:
+#
+# * static slides – the whole ``p:cSld`` (background and shapes) keyed by
+#   the compiled slide and, for ``Slide(static=True)``, by its data; the
+#   footer is drawn after the copy, so one entry serves every position;
+# * unbound ops on other slides ("chrome": cards, accent bars, circles) –
+#   the shape element, keyed by op and repeat offset, with only its shape id
+#   and name rewritten on copy.
+#
+# Spec slides carry no relationships beyond their layout, which
+# ``add_slide`` already creates, so copying the XML is a complete part copy.
+
+_CLONE_LIMIT = 4096
+_slides = {}
+_shapes = {}
+
+
+def clear_clone_cache():
+    _slides.clear()
+    _shapes.clear()
+
+
+def _slide_key(compiled, data, themed):
+    if all(isinstance(op, _Op) and not op.bound for op in compiled.ops):
+        return compiled, themed
+    return compiled, themed, repr(sorted(data.items()))
+
+
+def _clone_shape(slide, cached):
+    element, basename = cached
+    element = deepcopy(element)
+    shape_id = next_shape_id(slide.shapes)
+    cNvPr = element[0][0]
+    cNvPr.set("id", str(shape_id))
+    cNvPr.set("name", f"{basename} {shape_id - 1}")
+    slide.shapes._spTree.append(element)
+
+
+def _remember_shape(key, shape):
+    if len(_shapes) >= _CLONE_LIMIT:
+        _shapes.clear()
+    _shapes[key] = (deepcopy(shape._element), shape.name.rsplit(" ", 1)[0])
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+
+def _lookup(key, item, data):
+    if item is not None and key in item:
+        return item[key]
+    return data[key]
+
+
+def _bind(op, item, data, dx=0, dy=0):
+    """``(geom, args, kwargs)`` of a bound op, or ``None`` when it is skipped."""
+    def bind(v):
+        return v.resolve(item, data) if isinstance(v, _BOUND) else v
+
+    if isinstance(op.text_key, _BOUND) and bind(op.text_key) is None:
+        return None
+    geom = [bind(v) for v in op.geom]
+    if None in geom:
+        return None
+    geom = [Inches(v) if isinstance(f, Field) else v for f, v in zip(op.geom, geom)]
+    geom[0] += dx
+    geom[1] += dy
+    args = [bind(v) for v in op.args]
+    kwargs = {k: bind(v) for k, v in op.kwargs.items()}
+    if op.fit is not None:
+        _fit(op, geom, args, kwargs)
+    return geom, args, kwargs
+
+
+def _run(op, slide, item, data, dx=0, dy=0, clone=False):
+    if not op.bound:
+        if clone:
+            key = (op, dx, dy)
+            cached = _shapes.get(key)
+            if cached is not None:
+                _clone_shape(slide, cached)
+                return
+        geom = op.geom
+        if dx or dy:
+            geom = (geom[0] + dx, geom[1] + dy) + geom[2:]
+        shape = op.fn(slide, *geom, *op.args, **op.kwargs)
+        if clone:
+            _remember_shape(key, shape)
+        return
+
+    call = _bind(op, item, data, dx, dy)
+    if call is not None:
+        geom, args, kwargs = call
+        op.fn(slide, *geom, *args, **kwargs)
+
+
+def _traced_run(op, slide, item, data, dx=0, dy=0, clone=False):
+    with tracing.span(op.fn.__name__, "helper"):
+        _run(op, slide, item, data, dx, dy, clone)
+
+
+def _placed(ops, data):
+    """``(op, item, dx, dy)`` for every op of a slide in z-order, repeats expanded."""
+    for op in ops:
+        if isinstance(op, _RepeatOp):
+            for i, item in enumerate(_lookup(op.items, None, data)):
+                if op.fields:
+                    if not isinstance(item, (tuple, list)):
+                        item = (item,)
+                    item = dict(zip(op.fields, item))
+                dx, dy = op.offset(i)
+                for child in op.ops:
+                    yield child, item, dx, dy
+        else:
+            yield op, None, 0, 0
+
+
+def _run_ops(ops, slide, data, clone):
+    run = _run if tracing.active() is None else _traced_run
+    for op, item, dx, dy in _placed(ops, data):
+        run(op, slide, item, data, dx, dy, clone)
+
+
+def iter_shapes(compiled, data):
+    """``(fn, geom, args, kwargs)`` for each shape ``compiled`` draws with ``data``.
+
+    The same calls ``render_slide()`` makes (minus background and footer),
+    bound and fitted, so other backends such as ``deckgen.preview`` can draw
+    the slide from its spec without building any pptx XML.
+    """
+    for op, item, dx, dy in _placed(compiled.chrome + compiled.ops, data):
+        if op.bound:
+            call = _bind(op, item, data, dx, dy)
+            if call is not None:
+                yield (op.fn,) + call
+        else:
+            geom = op.geom
+            if dx or dy:
+                geom = (geom[0] + dx, geom[1] + dy) + geom[2:]
+            yield op.fn, geom, op.args, op.kwargs
+
+
+def render_slide(prs, compiled, data, num, total, clone=True):
+    """Append one compiled slide bound to ``data`` to ``prs``.
+
+    With ``clone`` everything that binds no data is copied from a previously
+    rendered instance when available; the resulting XML is identical.
+    """
+    with tracing.span(f"{num:02d} {compiled.name}", "slide") as args:
+        slide = _render_slide(prs, compiled, data, num, total, clone)
+        if args is not None:
+            args["shapes"] = len(slide.shapes._spTree) - 2
+    return slide
+
+
+def _render_slide(prs, compiled, data, num, total, clone):
+    layout = layout_for(prs, compiled, total)
+    slide = add_blank_slide(prs, layout)
+    key = _slide_key(compiled, data, layout is not None) if clone and compiled.static else None
+    cached = _slides.get(key) if key is not None else None
+    if cached is not None:
+        # Refill the existing spTree rather than swapping the cSld: the
+        # slide's shape collection proxy holds on to this spTree element
+        bg, spTree = cached
+        cSld = slide._element.cSld
+        if bg is not None:
+            cSld.insert(0, deepcopy(bg))
+        cSld.spTree[:] = list(deepcopy(spTree))
+    elif layout is None:
+        add_bg(slide, compiled.bg)
+        _run_ops(compiled.chrome + compiled.ops, slide, data, clone and key is None)
+    else:
+        _run_ops(compiled.ops, slide, data, clone and key is None)
+        to_scheme(slide._element.cSld.spTree)
+    if key is not None and cached is None:
+        if len(_slides) >= _CLONE_LIMIT:
+            _slides.clear()
+        cSld = slide._element.cSld
+        _slides[key] = (deepcopy(cSld.bg), deepcopy(cSld.spTree))
+
+    if layout is None and compiled.footer:
+        with tracing.span("slide_number_footer", "helper"):
+            slide_number_footer(slide, num, total)
+    _stamp_keys(slide._element.cSld.spTree)
+    slide._element.cSld.set("name", slide_name(compiled, data, num, total, layout is not None))
+    return slide
+
+
+def render_deck(deck, data, prs=None, template=None, clone=True, master=False):
+    """Render ``deck`` with ``data`` (``{slide_name: {field: value}}``).
+
+    ``master`` puts the chrome on a FlowPulse theme and master (``deckgen.master``).
+    """
+    if prs is None:
+        prs = new_presentation(template)
+        if master:
+            apply_master(prs)
+    total, pages = deck_pages(deck, data)
+    for num, (slide, slide_data) in enumerate(pages, start=1):
+        render_slide(prs, slide, slide_data, num, total, clone)
+    return prs
@@ -0,0 +1,613 @@
+"""
+Streaming .pptx writer that emits each slide part as soon as it is finished.
+
+``prs.save()`` serialises every part at the end, so every slide's XML tree is
+alive until the whole deck is done. ``DeckWriter`` writes a slide's XML and
+rels into the zip when it is flushed and then drops the tree; only the small
+shared parts (presentation, masters, layouts, theme, media) are written on
+``close()`` together with ``[Content_Types].xml``::
+
+    with DeckWriter(sys.stdout.buffer) as writer:
+        for page in pages:
+            slide = writer.add_slide()
+            ...
+            writer.flush(slide)
+
+The target may be a path or any binary file-like object; it does not need to
+be seekable (stdout, pipes and sockets work), in which case zip entries are
+written with data descriptors.
+
+A flushed slide still leaves a few KB of bookkeeping behind. For decks of
+tens of thousands of slides ``SpillWriter`` (``write_deck(..., spill=True)``,
+``generate_ppt.py --spill``) keeps memory flat instead: flushed parts are
+deflated into a temp-file spill store, slides are detached from the
+presentation, and on ``close()`` the zip is assembled from the
+memory-mapped store without recompressing anything. Sizes are known by
+then, so there are no data descriptors even on a pipe and the output is
+always the bytes ``DeckWriter`` writes to a regular file.
+
+Output is reproducible: every zip entry gets the same timestamp and
+attributes and parts are written in render order, so the same deck built
+twice is the same bytes and can be compared, cached or published by hash
+(``deckgen.publish``). ``save(prs, file)`` writes an already rendered
+presentation the same way, in place of ``prs.save()``.
+
+``write_deck(..., workers=n)`` renders slides in ``n`` forked worker
+processes, up to ``chunk`` consecutive slides per task (fewer for short
+decks, so every worker gets a share). Each worker builds its slides in a
+private presentation and sends back only the serialised slide XML; the
+parent appends those as pre-rendered parts (``add_blob()``), in deck order,
+and writes the shared parts, relationships and ``[Content_Types].xml`` as
+usual. Slide XML does not depend on where it was rendered (shape ids are per
+slide, the layout is always ``rId1``), so the package is identical to a
+serial build. Slides that relate to other parts (charts, pictures) are
+rendered by the parent, which owns the package.
+"""
+
+import gc
+import mmap
+import multiprocessing
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+
+from deckgen import tracing
+from deckgen.helpers import new_presentation, add_blank_slide, add_slide_blob
+from deckgen.master import apply_master, layout_for
+from deckgen.spec import deck_pages, render_slide
+
+
+# Fixed zip entry metadata; the zip default is the current local time
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _zip_info(name):
+    info = zipfile.ZipInfo(name, ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _write_package(zf, package, written=()):
+    """Write the package rels, every part not in ``written`` and the content types."""
+    parts = tuple(package.iter_parts())
+    zf.writestr(_zip_info(PACKAGE_URI.rels_uri.membername), package._rels.xml)
+    for part in parts:
+        if part.partname in written:
+            continue
+        zf.writestr(_zip_info(part.partname.membername), part.blob)
+        if part._rels:
+            zf.writestr(_zip_info(part.partname.rels_uri.membername), part.rels.xml)
+    zf.writestr(_zip_info(CONTENT_TYPES_URI.membername),
+                serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+
+
+def _is_path(file):
+    return isinstance(file, (str, os.PathLike))
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def save(prs, file):
+    """``prs.save(file)`` with reproducible zip metadata (see the module docs).
+
+    A path is written through ``<path>.tmp``, so a failed save leaves the
+    previous file in place.
+    """
+    if not _is_path(file):
+        with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as zf:
+            _write_package(zf, prs.part.package)
+        return
+    tmp = f"{os.fspath(file)}.tmp"
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+            _write_package(zf, prs.part.package)
+    except BaseException:
+        _discard(tmp)
+        raise
+    os.replace(tmp, file)
+
+
+class DeckWriter:
+    """Write a presentation slide by slide to ``file``.
+
+    ``prs`` is the underlying Presentation; slides that have been flushed no
+    longer have an XML tree and must not be touched again. ``master`` installs
+    the FlowPulse theme and master (``deckgen.master``). A path is written
+    through ``<path>.tmp``, which replaces it on ``close()``; on an error the
+    previous file is left as it was.
+    """
+
+    def __init__(self, file, template=None, master=False):
+        self.prs = new_presentation(template)
+        if master:
+            apply_master(self.prs)
+        self._path = os.fspath(file) if _is_path(file) else None
+        self._open(f"{self._path}.tmp" if self._path else file)
+        self._flushed = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._abort()
+            if self._path:
+                _discard(f"{self._path}.tmp")
+
+    def _open(self, file):
+        self._zip = zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED)
+
+    def _abort(self):
+        self._zip.close()
+
+    @property
+    def slide_count(self):
+        return len(self.prs.slides)
+
+    def _write(self, uri, blob):
+        self._zip.writestr(_zip_info(uri.membername), blob)
+
+    def add_slide(self, layout=None):
+        return add_blank_slide(self.prs, layout)
+
+    def add_blob(self, blob, layout=None):
+        """Append and write a slide serialised elsewhere (layout-only rels)."""
+        part = add_slide_blob(self.prs, blob, layout)
+        with tracing.span("flush", "save"):
+            self._write(part.partname, blob)
+            self._write(part.partname.rels_uri, part.rels.xml)
+        self._done(part)
+
+    def flush(self, slide, blob=None, rels=None):
+        """Write ``slide`` to the package now and release its XML tree.
+
+        ``blob`` / ``rels`` substitute previously serialised slide XML and
+        rels for the slide's own, e.g. when reusing a cached rendering.
+        """
+        part = slide.part
+        if part.partname in self._flushed:
+            return
+        with tracing.span("flush", "save"):
+            self._write(part.partname, part.blob if blob is None else blob)
+            self._write(part.partname.rels_uri, part.rels.xml if rels is None else rels)
+            if blob is None:
+                self._flush_charts(part)
+        self._done(part)
+        part._element = None
+        part.__dict__.pop("slide", None)
+
+    def _done(self, part):
+        self._flushed.add(part.partname)
+
+    def _flush_charts(self, part):
+        # Chart parts (and their embedded workbooks) belong to one slide only
+        for rel in part.rels.values():
+            if rel.reltype != RT.CHART or rel.is_external:
+                continue
+            chart = rel.target_part
+            self._write(chart.partname, chart.blob)
+            self._flushed.add(chart.partname)
+            for sub in chart.rels.values():
+                if not sub.is_external:
+                    self._write(sub.target_part.partname, sub.target_part.blob)
+                    self._flushed.add(sub.target_part.partname)
+            self._write(chart.partname.rels_uri, chart.rels.xml)
+            chart._element = None
+
+    def close(self):
+        """Write the remaining parts, package rels and content types."""
+        try:
+            with tracing.span("close", "save"):
+                self._close()
+        except BaseException:
+            if self._path:
+                _discard(f"{self._path}.tmp")
+            raise
+        if self._path:
+            os.replace(f"{self._path}.tmp", self._path)
+
+    def _close(self):
+        _write_package(self._zip, self.prs.part.package, self._flushed)
+        self._zip.close()
+
+
+# ── Spill mode ────────────────────────────────────────────────────────────────
+# A flushed slide leaves a part shell, a relationship, a ``p:sldId`` and two
+# ``ZipInfo`` records behind: about 5 KB per slide, a 300 MB peak at 50k
+# slides. ``SpillWriter`` keeps none of them. Entries are deflated into a temp file
+# as they are flushed, with one fixed-size index record each in a second
+# temp file; layout-only slides are then detached from the presentation
+# entirely. ``close()`` writes presentation.xml, its rels and
+# [Content_Types].xml with an entry per slide, generated rather than kept,
+# and copies every entry's deflated bytes from the memory-mapped spill file
+# into the zip without recompressing them.
+
+_SPILL_WINDOW = 4 << 20             # mapped spill bytes dropped from RSS at a time
+_FIRST_SLIDE_ID = 256               # python-pptx's first p:sldId id
+_SLIDE_PARTNAME = "/ppt/slides/slide%d.xml"
+_BATCH = 1024                       # generated XML entries per chunk
+
+_DOS_DATE = (ZIP_DATE_TIME[0] - 1980) << 9 | ZIP_DATE_TIME[1] << 5 | ZIP_DATE_TIME[2]
+_DOS_TIME = ZIP_DATE_TIME[3] << 11 | ZIP_DATE_TIME[4] << 5 | ZIP_DATE_TIME[5] // 2
+
+_RELEASE_EVERY = 256                # detached slides between _release_memory() calls
+
+_Entry = namedtuple("_Entry", "partname content_type")
+_malloc_trim = None
+
+
+class _SpillStore:
+    """Deflated zip entries appended to an anonymous temp file, in order."""
+
+    _RECORD = struct.Struct("<QQQLH")   # offset, compressed size, size, CRC-32, name length
+
+    def __init__(self, spill_dir=None):
+        self._dir = spill_dir
+        self._data = tempfile.TemporaryFile(dir=spill_dir)
+        self._index = tempfile.TemporaryFile(dir=spill_dir)
+        self._offset = 0
+        self.count = 0
+
+    def add(self, name, chunks):
+        """Deflate ``chunks`` (bytes, or an iterable of bytes) as entry ``name``."""
+        if isinstance(chunks, bytes):
+            chunks = (chunks,)
+        # The same compressor settings as zipfile, so the bytes match its output
+        deflate = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        start, crc, size = self._offset, 0, 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            self._offset += self._data.write(deflate.compress(chunk))
+        self._offset += self._data.write(deflate.flush())
+        name = name.encode()
+        self._index.write(self._RECORD.pack(start, self._offset - start, size, crc, len(name)) + name)
+        self.count += 1
+
+    def write_zip(self, out):
+        """Write the entries to binary file ``out`` as a zip archive, in order."""
+        self._data.flush()
+        self._index.flush()
+        self._index.seek(0)
+        position = central_size = 0
+        # Central directory records go to a temp file too, then after the entries
+        with tempfile.TemporaryFile(dir=self._dir) as central:
+            if self.count:
+                with mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ) as spill:
+                    position, central_size = self._copy(spill, out, central)
+            central.seek(0)
+            shutil.copyfileobj(central, out)
+        _end_records(out, self.count, position, central_size)
+
+    def _copy(self, spill, out, central):
+        position = central_size = released = 0
+        for _ in range(self.count):
+            offset, length, size, crc, name_length = self._RECORD.unpack(
+                self._index.read(self._RECORD.size))
+            info = _zip_info(self._index.read(name_length).decode())
+            info.CRC, info.compress_size, info.file_size = crc, length, size
+            header = info.FileHeader()
+            out.write(header)
+            with memoryview(spill)[offset:offset + length] as data:
+                out.write(data)
+            record = _central_record(info, position)
+            central.write(record)
+            position += len(header) + length
+            central_size += len(record)
+            # Pages already copied are dropped so the mapping's RSS stays bounded
+            if hasattr(spill, "madvise") and offset - released >= _SPILL_WINDOW:
+                end = offset - offset % mmap.PAGESIZE
+                spill.madvise(mmap.MADV_DONTNEED, released, end - released)
+                released = end
+        return position, central_size
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+
+def _central_record(info, offset):
+    # zipfile.ZipFile._write_end_record() for one entry
+    extra = []
+    file_size, compress_size = info.file_size, info.compress_size
+    if file_size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT:
+        extra += [file_size, compress_size]
+        file_size = compress_size = 0xFFFFFFFF
+    if offset > zipfile.ZIP64_LIMIT:
+        extra.append(offset)
+        offset = 0xFFFFFFFF
+    extra = struct.pack(f"<HH{len(extra)}Q", 1, 8 * len(extra), *extra) if extra else b""
+    version = zipfile.ZIP64_VERSION if extra else 0
+    name, flag_bits = info._encodeFilenameFlags()
+    return struct.pack(
+        zipfile.structCentralDir, zipfile.stringCentralDir,
+        max(version, info.create_version), info.create_system,
+        max(version, info.extract_version), info.reserved, flag_bits, info.compress_type,
+        _DOS_TIME, _DOS_DATE, info.CRC, compress_size, file_size,
+        len(name), len(extra), 0, 0, info.internal_attr, info.external_attr, offset,
+    ) + name + extra
+
+
+def _end_records(out, count, offset, size):
+    # zipfile.ZipFile._write_end_record() after the central directory
+    if count > zipfile.ZIP_FILECOUNT_LIMIT or offset > zipfile.ZIP64_LIMIT or size > zipfile.ZIP64_LIMIT:
+        out.write(struct.pack(zipfile.structEndArchive64, zipfile.stringEndArchive64,
+                              44, 45, 45, 0, 0, count, count, size, offset))
+        out.write(struct.pack(zipfile.structEndArchive64Locator,
+                              zipfile.stringEndArchive64Locator, 0, offset + size, 1))
+        count = min(count, 0xFFFF)
+        size = min(size, 0xFFFFFFFF)
+        offset = min(offset, 0xFFFFFFFF)
+    out.write(struct.pack(zipfile.structEndArchive, zipfile.stringEndArchive,
+                          0, 0, count, count, size, offset, 0))
+
+
+def _release_memory():
+    """Free the trees of detached slides now and hand the pages back to the OS.
+
+    python-pptx's proxies form reference cycles (slide and its shapes, a fill
+    and its colour) that keep a slide's whole lxml tree alive until the next
+    full collection, which rarely comes; and glibc keeps freed pages mapped
+    until ``malloc_trim`` (skipped where there is no glibc). Without this
+    RSS still grows by about 0.6 KB per slide.
+    """
+    global _malloc_trim
+    gc.collect()
+    if _malloc_trim is None:
+        try:
+            import ctypes
+            _malloc_trim = ctypes.CDLL(None).malloc_trim
+        except (OSError, AttributeError):
+            _malloc_trim = False
+    if _malloc_trim:
+        _malloc_trim(0)
+
+
+def _detach(prs, part):
+    """Remove slide ``part``'s ``p:sldId`` and relationship from ``prs``."""
+    sldIdLst = prs.part._element.sldIdLst
+    rels = prs.part.rels
+    for sldId in reversed(sldIdLst):
+        if rels[sldId.rId].target_part is part:
+            sldIdLst.remove(sldId)
+            rels.pop(sldId.rId)
+            return
+
+
+def _lexicographic(n):
+    """1..n in the order their decimal strings sort, without building the list."""
+    k = 1
+    for _ in range(n):
+        yield k
+        if k * 10 <= n:
+            k *= 10
+        else:
+            while k % 10 == 9 or k + 1 > n:
+                k //= 10
+            k += 1
+
+
+def _spliced(head, tail, entries):
+    # ``head``, then ``entries`` in batches, then ``tail``
+    yield head
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) == _BATCH:
+            yield "".join(batch).encode()
+            batch.clear()
+    yield "".join(batch).encode()
+    yield tail
+
+
+class SpillWriter(DeckWriter):
+    """``DeckWriter`` whose memory use does not grow with the number of slides.
+
+    Flushed parts are deflated into temp files under ``spill_dir`` (default:
+    the system temp dir) and slides whose only relationship is their layout
+    are removed from ``prs``; slides with charts or pictures stay in it,
+    without their XML, so those parts keep unique names. The zip is written
+    to ``file`` on ``close()``; it is the same bytes ``DeckWriter`` writes
+    to a seekable file. The template must not contain slides.
+    """
+
+    def __init__(self, file, template=None, master=False, spill_dir=None):
+        self._spill_dir = spill_dir
+        super().__init__(file, template, master)
+        if len(self.prs.slides):
+            self._store.close()
+            raise ValueError("spill mode needs a template without slides")
+        self._detached = 0
+
+    def _open(self, file):
+        self._file = file
+        self._store = _SpillStore(self._spill_dir)
+
+    def _abort(self):
+        self._store.close()
+
+    @property
+    def slide_count(self):
+        return self._detached + len(self.prs.slides)
+
+    def _write(self, uri, blob):
+        self._store.add(uri.membername, blob)
+
+    def _done(self, part):
+        if all(rel.reltype == RT.SLIDE_LAYOUT for rel in part.rels.values()):
+            _detach(self.prs, part)
+            self._detached += 1
+            if not self._detached % _RELEASE_EVERY:
+                _release_memory()
+        else:
+            self._flushed.add(part.partname)
+
+    def _close(self):
+        package = self.prs.part.package
+        parts = tuple(package.iter_parts())
+        count = self.slide_count
+        for part in parts:
+            if part.content_type == CT.PML_SLIDE:
+                _detach(self.prs, part)
+
+        add = self._store.add
+        add(PACKAGE_URI.rels_uri.membername, package._rels.xml)
+        for part in parts:
+            if part.partname in self._flushed:
+                continue
+            if part is self.prs.part:
+                blob, rels = self._presentation(count)
+                add(part.partname.membername, blob)
+                add(part.partname.rels_uri.membername, rels)
+                continue
+            add(part.partname.membername, part.blob)
+            if part._rels:
+                add(part.partname.rels_uri.membername, part.rels.xml)
+        parts = [p for p in parts if p.content_type != CT.PML_SLIDE]
+        add(CONTENT_TYPES_URI.membername, self._content_types(parts, count))
+
+        try:
+            if isinstance(self._file, (str, os.PathLike)):
+                with open(self._file, "wb") as out:
+                    self._store.write_zip(out)
+            else:
+                self._store.write_zip(self._file)
+        finally:
+            self._store.close()
+
+    def _presentation(self, count):
+        """presentation.xml and its rels listing slides 1..``count``, as chunks."""
+        part = self.prs.part
+        if not count:
+            return part.blob, part.rels.xml
+        rels = part.rels
+        # As python-pptx numbers them when nothing has been removed
+        first_rId = max((int(r[3:]) for r in rels.keys() if r[3:].isdigit()), default=0) + 1
+        part._element.get_or_add_sldIdLst()._add_sldId(id=_FIRST_SLIDE_ID, rId=f"rId{first_rId}")
+        entry = '<p:sldId id="{}" r:id="rId{}"/>'
+        head, marker, tail = serialize_part_xml(part._element).partition(
+            entry.format(_FIRST_SLIDE_ID, first_rId).encode())
+        if not marker:
+            raise RuntimeError("unexpected p:sldId serialisation")
+        blob = _spliced(head, tail, (entry.format(_FIRST_SLIDE_ID + i, first_rId + i)
+                                     for i in range(count)))
+
+        rel = f'<Relationship Id="rId{{}}" Type="{RT.SLIDE}" Target="slides/slide{{}}.xml"/>'
+        head, marker, tail = rels.xml.rpartition(b"</Relationships>")
+        rels = _spliced(head, marker + tail, (rel.format(first_rId + i, i + 1)
+                                              for i in range(count)))
+        return blob, rels
+
+    def _content_types(self, parts, count):
+        """[Content_Types].xml with an override per slide, as chunks."""
+        if not count:
+            return serialize_part_xml(_ContentTypesItem.xml_for(parts))
+        # Slide overrides sort together, so one stands in for all of them
+        first = _Entry(PackURI(_SLIDE_PARTNAME % 1), CT.PML_SLIDE)
+        override = f'<Override PartName="{_SLIDE_PARTNAME}" ContentType="{CT.PML_SLIDE}"/>'
+        head, marker, tail = serialize_part_xml(_ContentTypesItem.xml_for(parts + [first])).partition(
+            (override % 1).encode())
+        if not marker:
+            raise RuntimeError("unexpected Override serialisation")
+        return _spliced(head, tail, (override % k for k in _lexicographic(count)))
+
+
+CHUNK = 32
+
+# (pages, total, template, clone, master) of the deck being rendered, set by the
+# parent before forking and inherited by the workers; specs and data hold
+# RGBColor values, which do not pickle
+_job = None
+_worker_prs = None
+
+
+def _render_chunk(bounds):
+    """Serialised XML for pages ``[start, stop)``; ``None`` where the parent must render."""
+    global _worker_prs
+    pages, total, template, clone, master = _job
+    if _worker_prs is None:
+        _worker_prs = new_presentation(template)
+        if master:
+            apply_master(_worker_prs)
+    blobs = []
+    for index in range(*bounds):
+        spec, slide_data = pages[index]
+        part = render_slide(_worker_prs, spec, slide_data, index + 1, total, clone).part
+        layout_only = all(rel.reltype == RT.SLIDE_LAYOUT for rel in part.rels.values())
+        blobs.append(part.blob if layout_only else None)
+        # The worker's presentation is scratch space: drop layout-only slides
+        # altogether and keep only the part shell of the rest
+        if layout_only:
+            _detach(_worker_prs, part)
+        part._element = None
+        part.__dict__.pop("slide", None)
+    return blobs
+
+
+def _parallel(workers):
+    return workers and workers > 1 and "fork" in multiprocessing.get_all_start_methods()
+
+
+def write_deck(deck, data, file, template=None, clone=True, workers=1, chunk=CHUNK, master=False,
+               spill=None):
+    """Render ``deck`` like ``render_deck()`` but stream it to ``file``.
+
+    ``workers > 1`` renders slides in that many processes (where ``fork``
+    is available), at most ``chunk`` slides per task, and assembles them
+    here in order. ``master`` draws the chrome on a themed master
+    (``deckgen.master``). ``spill`` (``True``, or a directory for the temp
+    files) writes through a ``SpillWriter``.
+    Returns the number of slides written.
+    """
+    global _job
+    total, pages = deck_pages(deck, data)
+    with tracing.span("new_presentation", "setup"):
+        if spill:
+            writer = SpillWriter(file, template, master, None if spill is True else spill)
+        else:
+            writer = DeckWriter(file, template, master)
+    if not _parallel(workers) or total < 2:
+        with writer:
+            for num, (spec, slide_data) in enumerate(pages, start=1):
+                slide = render_slide(writer.prs, spec, slide_data, num, total, clone)
+                writer.flush(slide)
+        return total
+
+    pages = list(pages)
+    _job = (pages, total, template, clone, master)
+    # Short decks are split evenly rather than left to a single chunk
+    chunk = max(1, min(chunk, -(-total // workers)))
+    bounds = [(start, min(start + chunk, total)) for start in range(0, total, chunk)]
+    try:
+        with writer, ProcessPoolExecutor(
+                max_workers=min(workers, len(bounds)),
+                mp_context=multiprocessing.get_context("fork")) as pool:
+            for (start, _), blobs in zip(bounds, pool.map(_render_chunk, bounds)):
+                for index, blob in enumerate(blobs, start=start):
+                    spec, slide_data = pages[index]
+                    if blob is not None:
+                        writer.add_blob(blob, layout_for(writer.prs, spec, total))
+                        continue
+                    writer.flush(render_slide(writer.prs, spec, slide_data, index + 1, total, clone))
+    finally:
+        _job = None
+    return total
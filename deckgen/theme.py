@@ -0,0 +1,44 @@
+"""
+FlowPulse deck theme – palette and slide geometry shared by every generator.
+"""
+
+from pptx.dml.color import RGBColor
+from pptx.util import Inches
+
+# ── Theme Colors ──────────────────────────────────────────────────────────────
+BG_DARK      = RGBColor(0x0F, 0x17, 0x2A)   # Deep navy background
+BG_CARD      = RGBColor(0x1A, 0x25, 0x3C)   # Card/content area
+ACCENT_BLUE  = RGBColor(0x38, 0xBD, 0xF8)   # Cyan accent
+ACCENT_GREEN = RGBColor(0x4A, 0xDE, 0x80)   # Green accent
+ACCENT_AMBER = RGBColor(0xFB, 0xBF, 0x24)   # Amber/yellow accent
+ACCENT_PINK  = RGBColor(0xF4, 0x72, 0xB6)   # Pink accent
+TEXT_WHITE    = RGBColor(0xF1, 0xF5, 0xF9)   # Primary text
+TEXT_MUTED    = RGBColor(0x94, 0xA3, 0xB8)   # Secondary/muted text
+BORDER_COLOR = RGBColor(0x33, 0x41, 0x55)   # Border/divider
+SLIDE_WIDTH  = Inches(13.333)
+SLIDE_HEIGHT = Inches(7.5)
+TOP_BAR_HEIGHT = Inches(0.06)                # Decorative accent bar along the top edge
+
+# Colors the live config may override, by their config key
+BRAND_COLORS = {
+    "accentBlue": ACCENT_BLUE,
+    "accentGreen": ACCENT_GREEN,
+    "accentAmber": ACCENT_AMBER,
+    "accentPink": ACCENT_PINK,
+}
+
+
+def palette(overrides):
+    """``{theme color: replacement}`` from ``{"accentBlue": "#0EA5E9", ...}``.
+
+    Unknown keys and malformed hex values are ignored.
+    """
+    out = {}
+    for key, value in (overrides or {}).items():
+        if key not in BRAND_COLORS or not isinstance(value, str):
+            continue
+        try:
+            out[BRAND_COLORS[key]] = RGBColor.from_string(value.lstrip("#"))
+        except ValueError:
+            continue
+    return out
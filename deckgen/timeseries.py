@@ -0,0 +1,152 @@
+"""
+Vectorized rollups and LTTB downsampling for chart slides.
+
+    days, sums = rollup(times, np.column_stack([productive, distraction]), "week")
+    keep = lttb(times.astype("int64"), focus, 300)
+    chart = chart_series(times, {"Focus score": focus}, how="mean", max_points=300)
+
+``times`` are ``datetime64`` arrays of any unit (or ISO date strings);
+``values`` are 1-D, or 2-D with one column per series. Rollups bin by
+day, ISO week (starting Monday) or calendar month with a single
+``np.unique`` + ``np.bincount`` per column, so a year of minute-level
+samples (~525k rows) aggregates in milliseconds.
+
+``lttb()`` is Largest-Triangle-Three-Buckets: it keeps the first and last
+points and, per bucket, the point that forms the largest triangle with the
+previous pick and the next bucket's mean, which preserves peaks and dips
+that averaging would flatten. The loop runs once per *output* point; the
+work inside each bucket is vectorized.
+
+``chart_series()`` combines both and returns plain Python tuples (dates and
+floats rounded to ``decimals``): that is what python-pptx writes into the
+chart XML, and it keeps slide data ``repr``-stable for incremental builds.
+"""
+
+import numpy as np
+
+PERIODS = ("day", "week", "month")
+MAX_POINTS = 300
+
+# Pick the coarsest period that still leaves a readable number of points
+_AUTO_PERIOD = ((120, "day"), (104 * 7, "week"))
+
+
+def as_datetime64(times):
+    times = np.asarray(times)
+    if not np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype("datetime64[s]")
+    return times
+
+
+def period_start(times, period="day"):
+    """Floor ``times`` to the start of their day, ISO week or month (``datetime64[D]``)."""
+    days = as_datetime64(times).astype("datetime64[D]")
+    if period == "day":
+        return days
+    if period == "week":
+        # 1970-01-01 was a Thursday: (n + 3) % 7 is 0 on Mondays
+        offset = (days.astype("int64") + 3) % 7
+        return days - offset.astype("timedelta64[D]")
+    if period == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"unknown period {period!r}; expected one of {PERIODS}")
+
+
+def rollup(times, values, period="day", how="sum"):
+    """Aggregate ``values`` per period; returns ``(starts, aggregated)``.
+
+    ``how`` is ``"sum"``, ``"mean"`` or ``"max"``. Periods without samples
+    are absent from the result rather than zero-filled.
+    """
+    values = np.asarray(values, dtype="float64")
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+    starts, inverse = np.unique(period_start(times, period), return_inverse=True)
+    inverse = inverse.ravel()
+    n = len(starts)
+    if how == "max":
+        out = np.full((n, values.shape[1]), -np.inf)
+        np.maximum.at(out, inverse, values)
+    else:
+        out = np.column_stack([
+            np.bincount(inverse, weights=values[:, i], minlength=n) for i in range(values.shape[1])
+        ]) if values.shape[1] else np.zeros((n, 0))
+        if how == "mean":
+            out /= np.bincount(inverse, minlength=n)[:, None]
+        elif how != "sum":
+            raise ValueError(f"unknown aggregation {how!r}")
+    return starts, out[:, 0] if flat else out
+
+
+def lttb(x, y, n_out):
+    """Indices of the ``n_out`` points LTTB keeps from ``(x, y)`` (``x`` ascending)."""
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Bucket b covers [edges[b], edges[b + 1]); the first and last points are fixed
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype("int64") + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # The last bucket looks ahead to the final point itself
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    keep = np.empty(n_out, dtype="int64")
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        xa, ya = x[a], y[a]
+        area = np.abs((xa - avg_x[b]) * (y[lo:hi] - ya) - (xa - x[lo:hi]) * (avg_y[b] - ya))
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return keep
+
+
+def downsample(times, values, n_out=MAX_POINTS):
+    """Keep at most ``n_out`` rows, the union of each column's LTTB picks."""
+    times = as_datetime64(times)
+    values = np.asarray(values, dtype="float64")
+    if len(times) <= n_out:
+        return times, values
+    columns = values[:, None] if values.ndim == 1 else values
+    x = times.astype("int64").astype("float64")
+    share = max(3, n_out // columns.shape[1])
+    keep = np.unique(np.concatenate([lttb(x, columns[:, i], share) for i in range(columns.shape[1])]))
+    return times[keep], values[keep]
+
+
+def auto_period(times):
+    times = as_datetime64(times)
+    if not len(times):
+        return "day"
+    span = (times.max() - times.min()).astype("timedelta64[D]").astype("int64") + 1
+    for limit, period in _AUTO_PERIOD:
+        if span <= limit:
+            return period
+    return "month"
+
+
+def chart_series(times, series, period=None, how="sum", max_points=MAX_POINTS, decimals=1):
+    """Roll up and downsample ``{name: values}`` sharing ``times`` for a chart.
+
+    ``period=None`` picks day, week or month from the time span. Returns
+    ``(categories, ((name, values), ...))`` with ``datetime.date``
+    categories and rounded floats, ready for ``helpers.add_line_chart()``.
+    """
+    names = list(series)
+    times = as_datetime64(times)
+    if not len(times):
+        return (), tuple((name, ()) for name in names)
+    values = np.column_stack([np.asarray(series[name], dtype="float64") for name in names])
+    order = np.argsort(times, kind="stable")
+    starts, rolled = rollup(times[order], values[order], period or auto_period(times), how)
+    starts, rolled = downsample(starts, rolled, max_points)
+    rolled = np.round(rolled, decimals)
+    categories = tuple(starts.astype("datetime64[D]").tolist())
+    return categories, tuple((name, tuple(rolled[:, i].tolist())) for i, name in enumerate(names))
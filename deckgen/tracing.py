@@ -0,0 +1,124 @@
+"""
+Per-slide / per-helper profiling with Chrome trace-event output.
+
+    with tracing.profiling() as prof:
+        create_presentation(...)
+    prof.write_trace("deck-trace.json")     # chrome://tracing or ui.perfetto.dev
+    print(prof.format_summary())
+
+Instrumented code wraps work in ``tracing.span(name, cat)``; when no profiler
+is active that is a no-op ``nullcontext``. Each span records wall time, CPU
+time, allocated memory blocks and tracemalloc bytes, plus any args the code
+adds to the yielded dict (e.g. the slide's shape count).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Summary order; spans in other categories are listed last
+CATEGORIES = ("deck", "setup", "slide", "helper", "save")
+
+_active = None
+
+
+class Profiler:
+    def __init__(self):
+        self.events = []
+        self._t0 = time.perf_counter()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def span(self, name, cat, **args):
+        tracing = tracemalloc.is_tracing()
+        mem0 = tracemalloc.get_traced_memory()[0] if tracing else 0
+        blocks0 = sys.getallocatedblocks()
+        cpu0 = time.process_time()
+        wall0 = time.perf_counter()
+        try:
+            yield args
+        finally:
+            wall = time.perf_counter() - wall0
+            args["cpu_ms"] = round((time.process_time() - cpu0) * 1000, 3)
+            args["alloc_blocks"] = sys.getallocatedblocks() - blocks0
+            if tracing:
+                args["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - mem0) / 1024, 1)
+            self.events.append({
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round((wall0 - self._t0) * 1e6, 1),
+                "dur": round(wall * 1e6, 1),
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    # ── Output ────────────────────────────────────────────────────────────────
+
+    def trace(self):
+        return {"traceEvents": sorted(self.events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.trace(), fh)
+
+    def summary(self):
+        """Aggregate spans by ``(cat, name)``, grouped by category."""
+        rows = {}
+        for e in sorted(self.events, key=lambda e: e["ts"]):
+            row = rows.setdefault((e["cat"], e["name"]), {
+                "cat": e["cat"], "name": e["name"], "count": 0,
+                "wall_ms": 0.0, "cpu_ms": 0.0, "alloc_blocks": 0, "alloc_kb": 0.0, "shapes": 0,
+            })
+            row["count"] += 1
+            row["wall_ms"] += e["dur"] / 1000
+            row["cpu_ms"] += e["args"]["cpu_ms"]
+            row["alloc_blocks"] += e["args"]["alloc_blocks"]
+            row["alloc_kb"] += e["args"].get("alloc_kb", 0)
+            row["shapes"] += e["args"].get("shapes", 0)
+        order = {cat: i for i, cat in enumerate(CATEGORIES)}
+        return sorted(rows.values(), key=lambda r: order.get(r["cat"], len(order)))
+
+    def format_summary(self):
+        # blocks/KB are net growth of live allocations over the span
+        lines = [f"{'span':<38} {'n':>5} {'wall ms':>10} {'cpu ms':>10} {'blocks':>8} {'KB':>9} {'shapes':>7}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['cat'] + ':' + row['name']:<38} {row['count']:>5} {row['wall_ms']:>10.2f} "
+                f"{row['cpu_ms']:>10.2f} {row['alloc_blocks']:>8} {row['alloc_kb']:>9.1f} "
+                f"{row['shapes'] or '':>7}"
+            )
+        return "\n".join(lines)
+
+
+def span(name, cat, **args):
+    """Record a span on the active profiler, if any."""
+    if _active is None:
+        return nullcontext()
+    return _active.span(name, cat, **args)
+
+
+def active():
+    return _active
+
+
+@contextmanager
+def profiling(trace_malloc=True):
+    """Activate a new ``Profiler`` for the duration of the block."""
+    global _active
+    prof = Profiler()
+    started = trace_malloc and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _active = prof
+    try:
+        yield prof
+    finally:
+        _active = None
+        if started:
+            tracemalloc.stop()
@@ -2,313 +2,322 @@
 """
 FlowPulse 2.0 – PowerPoint Presentation Generator
 Generates a professional dark-themed PPT from the project documentation.
+
+The deck layout is the declarative ``DECK`` spec below (see ``deckgen.spec``);
+the content it binds comes from ``deck_data()``. The table of contents,
+requirements, phases and completion criteria are parsed from ``document.txt``;
+the remaining slides summarise the document by hand.
+
+    python generate_ppt.py                      # ./FlowPulse_2.0_Presentation.pptx
+    python generate_ppt.py -o deck.pptx
+    python generate_ppt.py -o - > deck.pptx     # stream to stdout
+    python generate_ppt.py --incremental        # re-render changed slides only
+    python generate_ppt.py --patch              # rewrite only what changed, keep edits made in PowerPoint
+    python generate_ppt.py --patch --force      # rebuild an unpatchable deck even over hand edits
+    python generate_ppt.py -j 8                 # render slides in 8 processes
+    python generate_ppt.py --master             # chrome on a themed master, unused layouts dropped
+    python generate_ppt.py --spill              # flat memory for huge decks (temp-file spill store)
+    python generate_ppt.py --optimize           # + shrink the finished deck (see deckgen.optimize)
+    python generate_ppt.py --locale de,es       # one deck per locale: ...Presentation.de.pptx, ...es.pptx
+    python generate_ppt.py --publish            # + upload to R2 as decks/<name> if it changed
+    python generate_ppt.py --watch              # rebuild whenever document.txt changes
+    python generate_ppt.py --preview preview.html   # + an SVG/HTML preview (no PowerPoint)
+    python generate_ppt.py --profile            # + deck-trace.json and a timing table
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.enum.shapes import MSO_SHAPE
-
-# ── Theme Colors ──────────────────────────────────────────────────────────────
-BG_DARK      = RGBColor(0x0F, 0x17, 0x2A)   # Deep navy background
-BG_CARD      = RGBColor(0x1A, 0x25, 0x3C)   # Card/content area
-ACCENT_BLUE  = RGBColor(0x38, 0xBD, 0xF8)   # Cyan accent
-ACCENT_GREEN = RGBColor(0x4A, 0xDE, 0x80)   # Green accent
-ACCENT_AMBER = RGBColor(0xFB, 0xBF, 0x24)   # Amber/yellow accent
-ACCENT_PINK  = RGBColor(0xF4, 0x72, 0xB6)   # Pink accent
-TEXT_WHITE    = RGBColor(0xF1, 0xF5, 0xF9)   # Primary text
-TEXT_MUTED    = RGBColor(0x94, 0xA3, 0xB8)   # Secondary/muted text
-BORDER_COLOR = RGBColor(0x33, 0x41, 0x55)   # Border/divider
-SLIDE_WIDTH  = Inches(13.333)
-SLIDE_HEIGHT = Inches(7.5)
-
-
-def create_presentation():
-    prs = Presentation()
-    prs.slide_width = SLIDE_WIDTH
-    prs.slide_height = SLIDE_HEIGHT
-
-    # Use blank layout for full control
-    blank_layout = prs.slide_layouts[6]
-
-    def add_bg(slide, color=BG_DARK):
-        bg = slide.background
-        fill = bg.fill
-        fill.solid()
-        fill.fore_color.rgb = color
-
-    def add_shape(slide, left, top, width, height, fill_color, border_color=None, radius=None):
-        shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height)
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = fill_color
-        if border_color:
-            shape.line.color.rgb = border_color
-            shape.line.width = Pt(1)
-        else:
-            shape.line.fill.background()
-        # Set corner radius
-        if radius:
-            shape.adjustments[0] = radius
-        else:
-            shape.adjustments[0] = 0.02
-        return shape
-
-    def add_text_box(slide, left, top, width, height, text, font_size=18,
-                     color=TEXT_WHITE, bold=False, alignment=PP_ALIGN.LEFT,
-                     font_name="Calibri", line_spacing=1.2):
-        txBox = slide.shapes.add_textbox(left, top, width, height)
-        tf = txBox.text_frame
-        tf.word_wrap = True
-        p = tf.paragraphs[0]
-        p.text = text
-        p.font.size = Pt(font_size)
-        p.font.color.rgb = color
-        p.font.bold = bold
-        p.font.name = font_name
-        p.alignment = alignment
-        p.space_after = Pt(0)
-        p.space_before = Pt(0)
-        if line_spacing != 1.0:
-            p.line_spacing = Pt(font_size * line_spacing)
-        return txBox
-
-    def add_multiline_box(slide, left, top, width, height, lines, font_size=16,
-                          color=TEXT_WHITE, font_name="Calibri", line_spacing=1.5,
-                          alignment=PP_ALIGN.LEFT):
-        """lines = list of (text, color, bold, font_size_override)"""
-        txBox = slide.shapes.add_textbox(left, top, width, height)
-        tf = txBox.text_frame
-        tf.word_wrap = True
-        for i, item in enumerate(lines):
-            if isinstance(item, str):
-                txt, clr, bld, fs = item, color, False, font_size
-            else:
-                txt = item[0]
-                clr = item[1] if len(item) > 1 else color
-                bld = item[2] if len(item) > 2 else False
-                fs  = item[3] if len(item) > 3 else font_size
-            if i == 0:
-                p = tf.paragraphs[0]
-            else:
-                p = tf.add_paragraph()
-            p.text = txt
-            p.font.size = Pt(fs)
-            p.font.color.rgb = clr
-            p.font.bold = bld
-            p.font.name = font_name
-            p.alignment = alignment
-            p.space_after = Pt(2)
-            p.line_spacing = Pt(fs * line_spacing)
-        return txBox
-
-    def add_accent_line(slide, left, top, width, color=ACCENT_BLUE, thickness=3):
-        shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, Pt(thickness))
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = color
-        shape.line.fill.background()
-        return shape
-
-    def add_icon_circle(slide, left, top, size, color, label="", label_size=20):
-        shape = slide.shapes.add_shape(MSO_SHAPE.OVAL, left, top, size, size)
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = color
-        shape.line.fill.background()
-        if label:
-            tf = shape.text_frame
-            tf.word_wrap = False
-            p = tf.paragraphs[0]
-            p.text = label
-            p.font.size = Pt(label_size)
-            p.font.color.rgb = TEXT_WHITE
-            p.font.bold = True
-            p.font.name = "Calibri"
-            p.alignment = PP_ALIGN.CENTER
-            tf.paragraphs[0].space_before = Pt(0)
-            tf.paragraphs[0].space_after = Pt(0)
-        return shape
-
-    def slide_number_footer(slide, num, total):
-        add_text_box(slide, Inches(12.2), Inches(7.05), Inches(1), Inches(0.4),
-                     f"{num}/{total}", font_size=10, color=TEXT_MUTED,
-                     alignment=PP_ALIGN.RIGHT)
-
-    TOTAL_SLIDES = 15
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 1 — TITLE SLIDE
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    # Decorative top accent bar
-    add_shape(slide, Inches(0), Inches(0), SLIDE_WIDTH, Inches(0.06), ACCENT_BLUE)
-
-    # Decorative circles
-    add_icon_circle(slide, Inches(10.5), Inches(1.0), Inches(2.5), RGBColor(0x38, 0xBD, 0xF8))
-    add_icon_circle(slide, Inches(11.2), Inches(2.8), Inches(1.5), RGBColor(0x4A, 0xDE, 0x80))
-    add_icon_circle(slide, Inches(9.8), Inches(3.2), Inches(1.0), RGBColor(0xFB, 0xBF, 0x24))
-
-    # Title
-    add_text_box(slide, Inches(1.2), Inches(1.8), Inches(8), Inches(1.2),
-                 "FlowPulse 2.0", font_size=54, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(1.2), Inches(3.1), Inches(3), ACCENT_BLUE, 4)
-    add_text_box(slide, Inches(1.2), Inches(3.4), Inches(8), Inches(0.8),
-                 "Browser Extension + Web Dashboard for Productivity Tracking",
-                 font_size=22, color=TEXT_MUTED)
-    add_text_box(slide, Inches(1.2), Inches(4.4), Inches(8), Inches(0.5),
-                 "Powered by Firebase  |  Serverless Architecture  |  Real-Time Analytics",
-                 font_size=14, color=ACCENT_BLUE)
-
-    add_text_box(slide, Inches(1.2), Inches(5.8), Inches(8), Inches(0.5),
-                 "Project Documentation & Implementation Plan",
-                 font_size=16, color=TEXT_MUTED)
-
-    slide_number_footer(slide, 1, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 2 — TABLE OF CONTENTS
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(6), Inches(0.7),
-                 "Table of Contents", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_BLUE, 3)
+import argparse
+import os
+import re
+import sys
+import time
 
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+
+from deckgen.theme import (
+    BG_DARK, BG_CARD, ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK,
+    TEXT_WHITE, TEXT_MUTED, BORDER_COLOR, SLIDE_WIDTH,
+)
+from deckgen.spec import (
+    Deck, Slide, Text, Lines, Rect, Circle, Accent, Repeat, Field, Format, heading, localize, render_deck,
+)
+from deckgen.stream import write_deck
+from deckgen.incremental import CACHE_DIR, build_incremental
+from deckgen.optimize import format_stats, optimize_file
+from deckgen.patch import PatchError, patch_deck, record_build
+from deckgen.document import parse_document, title_case, watch
+from deckgen.i18n import SOURCE, LocaleError, load_catalog, localized_path, parse_locales
+from deckgen.preview import write_preview
+from deckgen.publish import BUCKET, PublishError, check_key, publish
+from deckgen import tracing
+
+DEFAULT_OUTPUT = "FlowPulse_2.0_Presentation.pptx"
+DOCUMENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "document.txt")
+
+ALERT_RED     = RGBColor(0xEF, 0x44, 0x44)   # Problem card accent
+ACCENT_VIOLET = RGBColor(0xA7, 0x8B, 0xFA)   # Phase 5 accent
+CENTER = PP_ALIGN.CENTER
+
+TOC_COLORS   = [ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK]
+PHASE_COLORS = [ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK, ACCENT_VIOLET, ACCENT_BLUE]
+NFR_ICONS = {
+    "NFR-01": "🔒", "NFR-02": "📈", "NFR-03": "⚡", "NFR-04": "🔄",
+    "NFR-05": "🪶", "NFR-06": "📱", "NFR-07": "✅",
+}
+_PAREN = re.compile(r"\s*\(.*?\)")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DECK LAYOUT
+# ══════════════════════════════════════════════════════════════════════════════
+DECK = Deck((
+    # ── SLIDE 1 — TITLE SLIDE ─────────────────────────────────────────────────
+    Slide("title", (
+        # Decorative circles
+        Circle(10.5, 1.0, 2.5, RGBColor(0x38, 0xBD, 0xF8)),
+        Circle(11.2, 2.8, 1.5, RGBColor(0x4A, 0xDE, 0x80)),
+        Circle(9.8, 3.2, 1.0, RGBColor(0xFB, 0xBF, 0x24)),
+        # Title
+        Text(1.2, 1.8, 8, 1.2, "FlowPulse 2.0", font_size=54, color=TEXT_WHITE, bold=True),
+        Accent(1.2, 3.1, 3, ACCENT_BLUE, 4),
+        Text(1.2, 3.4, 8, 0.8, "Browser Extension + Web Dashboard for Productivity Tracking",
+             font_size=22, color=TEXT_MUTED),
+        Text(1.2, 4.4, 8, 0.5,
+             "Powered by Firebase  |  Serverless Architecture  |  Real-Time Analytics",
+             font_size=14, color=ACCENT_BLUE),
+        Text(1.2, 5.8, 8, 0.5, "Project Documentation & Implementation Plan",
+             font_size=16, color=TEXT_MUTED),
+    ), top_bar=ACCENT_BLUE),   # decorative top accent bar
+
+    # ── SLIDE 2 — TABLE OF CONTENTS ───────────────────────────────────────────
+    Slide("toc", heading("Table of Contents", ACCENT_BLUE) + (
+        Repeat("toc_items", ("num", "title", "color"), dy=0.65, wrap=7, wrap_dx=6.0, per_page=14, children=(
+            Circle(1.0, 1.7, 0.45, Field("color"), Field("num"), 12),
+            Text(1.7, 1.75, 4, 0.4, Field("title"), font_size=17, color=TEXT_WHITE, fit=True),
+        )),
+    ), static=True),
+
+    # ── SLIDE 3 — PROJECT OVERVIEW ────────────────────────────────────────────
+    Slide("overview", heading("Project Overview", ACCENT_BLUE) + (
+        Repeat("cards", ("label", "value", "color"), dx=3.05, children=(
+            Rect(0.8, 1.8, 2.8, 2.2, BG_CARD, BORDER_COLOR, 0.05),
+            Rect(0.8, 1.8, 2.8, 0.06, Field("color")),
+            Text(1.0, 2.1, 2.4, 0.4, Field("label"), font_size=13, color=TEXT_MUTED, bold=True),
+            Text(1.0, 2.5, 2.4, 1.2, Field("value"), font_size=20, color=TEXT_WHITE, bold=True),
+        )),
+        # Core Objective box
+        Rect(0.8, 4.4, 11.7, 2.2, BG_CARD, BORDER_COLOR, 0.03),
+        Text(1.1, 4.6, 3, 0.4, "CORE OBJECTIVE", font_size=13, color=ACCENT_BLUE, bold=True),
+        Text(1.1, 5.1, 11.2, 1.2, Field("objective"), font_size=18, color=TEXT_WHITE,
+             line_spacing=1.4),
+    )),
+
+    # ── SLIDE 4 — PROBLEM & SOLUTION ──────────────────────────────────────────
+    Slide("problem_solution", heading("Problem & Solution", ACCENT_GREEN) + (
+        # Problem card
+        Rect(0.8, 1.7, 5.6, 4.5, BG_CARD, BORDER_COLOR, 0.04),
+        Rect(0.8, 1.7, 5.6, 0.06, ALERT_RED),
+        Circle(1.2, 2.1, 0.6, ALERT_RED, "!", 22),
+        Text(2.0, 2.15, 4, 0.5, "PROBLEM", font_size=20, color=ALERT_RED, bold=True),
+        Lines(1.2, 3.0, 4.8, 3, Field("problem_lines"), font_size=16, line_spacing=1.4),
+        # Solution card
+        Rect(6.9, 1.7, 5.6, 4.5, BG_CARD, BORDER_COLOR, 0.04),
+        Rect(6.9, 1.7, 5.6, 0.06, ACCENT_GREEN),
+        Circle(7.3, 2.1, 0.6, ACCENT_GREEN, "✓", 22),
+        Text(8.1, 2.15, 4, 0.5, "SOLUTION", font_size=20, color=ACCENT_GREEN, bold=True),
+        Lines(7.3, 3.0, 4.8, 3, Field("solution_lines"), font_size=16, line_spacing=1.4),
+    )),
+
+    # ── SLIDE 5 — SYSTEM ARCHITECTURE ─────────────────────────────────────────
+    Slide("architecture", heading("System Architecture", ACCENT_BLUE) + (
+        Text(0.8, 1.5, 10, 0.5, "Serverless Architecture  –  End-to-End Data Flow",
+             font_size=16, color=TEXT_MUTED),
+        # Architecture flow boxes; the arrow is None for the last box
+        Repeat("arch_items", ("icon", "title", "desc_lines", "color", "arrow"), dx=2.55, children=(
+            Rect(0.5, 2.3, 2.3, 4.2, BG_CARD, BORDER_COLOR, 0.05),
+            Rect(0.5, 2.3, 2.3, 0.06, Field("color")),
+            Text(0.5, 2.6, 2.3, 0.7, Field("icon"), font_size=36, color=TEXT_WHITE, alignment=CENTER),
+            Text(0.65, 3.4, 2.0, 0.8, Field("title"), font_size=17, color=TEXT_WHITE, bold=True,
+                 alignment=CENTER),
+            Lines(0.65, 4.5, 2.0, 1.8, Field("desc_lines"), font_size=12, line_spacing=1.5,
+                  alignment=CENTER),
+            Text(2.85, 3.8, 0.3, 0.5, Field("arrow"), font_size=28, color=ACCENT_BLUE,
+                 alignment=CENTER),
+        )),
+    )),
+
+    # ── SLIDE 6 — TECHNOLOGY STACK ────────────────────────────────────────────
+    Slide("tech_stack", heading("Technology Stack", ACCENT_AMBER) + (
+        Repeat("tech_groups", ("title", "lines", "color"), dx=4.1, children=(
+            Rect(0.8, 1.8, 3.8, 5.0, BG_CARD, BORDER_COLOR, 0.04),
+            Rect(0.8, 1.8, 3.8, 0.06, Field("color")),
+            Text(1.1, 2.1, 3.2, 0.5, Field("title"), font_size=18, color=Field("color"), bold=True),
+            Lines(1.1, 2.8, 3.2, 3.5, Field("lines"), font_size=16, line_spacing=1.8),
+        )),
+    )),
+
+    # ── SLIDE 7 — SYSTEM COMPONENTS (EXTENSION) ───────────────────────────────
+    Slide("components_extension", heading("System Components — Browser Extension", ACCENT_PINK, 8) + (
+        # Responsibilities
+        Rect(0.8, 1.7, 5.8, 5.0, BG_CARD, BORDER_COLOR, 0.04),
+        Text(1.1, 1.9, 5, 0.5, "RESPONSIBILITIES", font_size=14, color=ACCENT_PINK, bold=True),
+        Lines(1.1, 2.5, 5.2, 3.5, Field("resp_lines"), font_size=15, line_spacing=1.8),
+        # Key Modules
+        Rect(6.9, 1.7, 5.6, 5.0, BG_CARD, BORDER_COLOR, 0.04),
+        Text(7.2, 1.9, 5, 0.5, "KEY MODULES", font_size=14, color=ACCENT_BLUE, bold=True),
+        Repeat("modules", ("num", "name", "desc"), dy=1.0, children=(
+            Circle(7.3, 2.5, 0.4, ACCENT_BLUE, Field("num"), 13),
+            Text(7.9, 2.45, 4.2, 0.35, Field("name"), font_size=15, color=TEXT_WHITE, bold=True),
+            Text(7.9, 2.8, 4.2, 0.35, Field("desc"), font_size=12, color=TEXT_MUTED),
+        )),
+    )),
+
+    # ── SLIDE 8 — SYSTEM COMPONENTS (BACKEND + DASHBOARD) ─────────────────────
+    Slide("components_backend", heading("System Components — Backend & Dashboard", ACCENT_GREEN, 10) + (
+        # Firebase Backend
+        Rect(0.8, 1.7, 5.8, 5.0, BG_CARD, BORDER_COLOR, 0.04),
+        Rect(0.8, 1.7, 5.8, 0.06, ACCENT_AMBER),
+        Text(1.1, 1.9, 5, 0.5, "FIREBASE BACKEND", font_size=14, color=ACCENT_AMBER, bold=True),
+        Lines(1.1, 2.5, 5.2, 4, Field("backend_lines"), font_size=14, line_spacing=1.5),
+        # Web Dashboard
+        Rect(6.9, 1.7, 5.6, 5.0, BG_CARD, BORDER_COLOR, 0.04),
+        Rect(6.9, 1.7, 5.6, 0.06, ACCENT_GREEN),
+        Text(7.2, 1.9, 5, 0.5, "WEB DASHBOARD FEATURES", font_size=14, color=ACCENT_GREEN, bold=True),
+        Lines(7.2, 2.5, 5.0, 4, Field("dashboard_lines"), font_size=14, line_spacing=1.7),
+    )),
+
+    # ── SLIDE 9 — DATABASE DESIGN ─────────────────────────────────────────────
+    Slide("database", heading("Database Design", ACCENT_GREEN) + (
+        Text(0.8, 1.5, 10, 0.4, "Firestore Collections Structure — Nested under users/{userId}",
+             font_size=15, color=TEXT_MUTED),
+        # Collection cards
+        Repeat("collections", ("name", "lines", "color"), dx=3.15, children=(
+            Rect(0.5, 2.0, 2.95, 4.8, BG_CARD, BORDER_COLOR, 0.04),
+            Rect(0.5, 2.0, 2.95, 0.06, Field("color")),
+            Text(0.65, 2.2, 2.65, 0.45, Field("name"), font_size=13, color=Field("color"), bold=True),
+            Lines(0.65, 2.7, 2.65, 3.8, Field("lines"), font_size=12, line_spacing=1.3),
+        )),
+    )),
+
+    # ── SLIDE 10 — FUNCTIONAL REQUIREMENTS ────────────────────────────────────
+    Slide("functional", heading("Functional Requirements", ACCENT_BLUE, 8) + (
+        Rect(0.8, 1.7, 11.7, 5.2, BG_CARD, BORDER_COLOR, 0.03),
+        Repeat("frs", ("code", "desc", "color"), dy=0.48, per_page=10, children=(
+            Rect(1.1, 1.95, 0.85, 0.35, Field("color")),
+            Text(1.12, 1.96, 0.85, 0.35, Field("code"), font_size=11, color=BG_DARK, bold=True,
+                 alignment=CENTER),
+            Text(2.15, 1.96, 9.8, 0.35, Field("desc"), font_size=15, color=TEXT_WHITE, fit=True),
+        )),
+    )),
+
+    # ── SLIDE 11 — NON-FUNCTIONAL REQUIREMENTS ────────────────────────────────
+    Slide("non_functional", heading("Non-Functional Requirements", ACCENT_AMBER, 8) + (
+        Repeat("nfrs", ("code", "title", "desc", "icon"), dx=6.2, wrap=2, wrap_dy=1.35, per_page=8, children=(
+            Rect(0.8, 1.7, 5.9, 1.15, BG_CARD, BORDER_COLOR, 0.04),
+            Text(1.0, 1.85, 0.5, 0.5, Field("icon"), font_size=22, alignment=CENTER),
+            Text(1.55, 1.8, 1.0, 0.35, Field("code"), font_size=11, color=ACCENT_AMBER, bold=True),
+            Text(2.55, 1.8, 3.8, 0.35, Field("title"), font_size=15, color=TEXT_WHITE, bold=True,
+                 fit=True),
+            Text(1.55, 2.25, 4.8, 0.45, Field("desc"), font_size=12, color=TEXT_MUTED, fit=True),
+        )),
+    )),
+
+    # ── SLIDES 12+ — DEVELOPMENT PHASES (three per slide) ─────────────────────
+    Slide("phases", heading(Format("Development Phases ({first}–{last})"), ACCENT_PINK, 8) + (
+        Repeat("phases", ("phase", "title", "lines", "color"), dx=4.15, per_page=3, children=(
+            Rect(0.6, 1.7, 3.9, 5.2, BG_CARD, BORDER_COLOR, 0.04),
+            Rect(0.6, 1.7, 3.9, 0.06, Field("color")),
+            Text(0.8, 1.9, 3.5, 0.35, Field("phase"), font_size=12, color=Field("color"), bold=True),
+            Text(0.8, 2.25, 3.5, 0.4, Field("title"), font_size=18, color=TEXT_WHITE, bold=True,
+                 fit=True),
+            Lines(0.8, 2.8, 3.5, 3.8, Field("lines"), font_size=13, line_spacing=1.7, fit=True),
+        )),
+    )),
+
+    # ── SLIDE 14 — COMPLETION CRITERIA ────────────────────────────────────────
+    Slide("criteria", heading("Completion Criteria", ACCENT_BLUE, 8) + (
+        Text(0.8, 1.5, 10, 0.4, "Project is considered COMPLETE when all criteria are met:",
+             font_size=15, color=TEXT_MUTED),
+        Rect(2.0, 2.0, 9.3, 5.0, BG_CARD, BORDER_COLOR, 0.04),
+        Repeat("criteria", ("text",), dy=0.45, per_page=10, children=(
+            Text(2.5, 2.3, 0.4, 0.35, "✓", font_size=16, color=ACCENT_GREEN, bold=True,
+                 alignment=CENTER),
+            Text(3.0, 2.32, 7.8, 0.35, Field("text"), font_size=15, color=TEXT_WHITE, fit=True),
+        )),
+    )),
+
+    # ── SLIDE 15 — THANK YOU ──────────────────────────────────────────────────
+    Slide("thank_you", (
+        Text(0, 2.2, SLIDE_WIDTH, 1.2, "Thank You", font_size=54, color=TEXT_WHITE, bold=True,
+             alignment=CENTER),
+        Accent(5.5, 3.5, 2.3, ACCENT_BLUE, 4),
+        Text(0, 3.8, SLIDE_WIDTH, 0.7, "FlowPulse 2.0", font_size=28, color=ACCENT_BLUE,
+             alignment=CENTER, bold=True),
+        Text(0, 4.5, SLIDE_WIDTH, 0.5, "A Smarter Way to Understand Your Browsing Habits",
+             font_size=16, color=TEXT_MUTED, alignment=CENTER),
+        # Decorative circles
+        Circle(1.5, 5.5, 1.2, ACCENT_BLUE),
+        Circle(3.0, 6.0, 0.8, ACCENT_GREEN),
+        Circle(9.5, 5.5, 1.2, ACCENT_PINK),
+        Circle(11.0, 6.0, 0.8, ACCENT_AMBER),
+        Text(0, 5.5, SLIDE_WIDTH, 0.5, "Questions?", font_size=20, color=TEXT_MUTED,
+             alignment=CENTER),
+    ), top_bar=ACCENT_BLUE),
+))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DECK CONTENT
+# ══════════════════════════════════════════════════════════════════════════════
+def deck_data(doc=None, catalog=None):
+    """Content bound into ``DECK``, keyed by slide name.
+
+    ``doc`` is a ``parse_document()`` result; ``document.txt`` is parsed when
+    it is omitted. ``catalog`` translates the text, including the parsed
+    document's (see ``deckgen.i18n``).
+    """
+    _ = catalog or SOURCE
+    if doc is None:
+        doc = parse_document(DOCUMENT)
     toc_items = [
-        ("01", "Project Overview", ACCENT_BLUE),
-        ("02", "Problem & Solution", ACCENT_GREEN),
-        ("03", "System Architecture", ACCENT_BLUE),
-        ("04", "Technology Stack", ACCENT_AMBER),
-        ("05", "System Components", ACCENT_PINK),
-        ("06", "Database Design", ACCENT_GREEN),
-        ("07", "Functional Requirements", ACCENT_BLUE),
-        ("08", "Non-Functional Requirements", ACCENT_AMBER),
-        ("09", "Development Phases", ACCENT_PINK),
-        ("10", "Implementation Plan", ACCENT_GREEN),
-        ("11", "Completion Criteria", ACCENT_BLUE),
-        ("12", "Folder Structure", ACCENT_AMBER),
-        ("13", "Summary & Next Steps", ACCENT_PINK),
+        (f"{num:02d}", _(title_case(_PAREN.sub("", title))), TOC_COLORS[i % len(TOC_COLORS)])
+        for i, (num, title) in enumerate(doc["sections"])
     ]
-
-    col1 = toc_items[:7]
-    col2 = toc_items[7:]
-
-    for i, (num, title, color) in enumerate(col1):
-        y = Inches(1.7) + Inches(i * 0.65)
-        add_icon_circle(slide, Inches(1.0), y, Inches(0.45), color, num, 12)
-        add_text_box(slide, Inches(1.7), y + Inches(0.05), Inches(4), Inches(0.4),
-                     title, font_size=17, color=TEXT_WHITE)
-
-    for i, (num, title, color) in enumerate(col2):
-        y = Inches(1.7) + Inches(i * 0.65)
-        add_icon_circle(slide, Inches(7.0), y, Inches(0.45), color, num, 12)
-        add_text_box(slide, Inches(7.7), y + Inches(0.05), Inches(4), Inches(0.4),
-                     title, font_size=17, color=TEXT_WHITE)
-
-    slide_number_footer(slide, 2, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 3 — PROJECT OVERVIEW
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(6), Inches(0.7),
-                 "Project Overview", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_BLUE, 3)
+    frs = [(code, _(desc)) for code, desc in doc["frs"]]
+    nfrs = [(code, _(title), _(desc), NFR_ICONS.get(code, "•")) for code, title, desc in doc["nfrs"]]
+    phases = [
+        (_("Phase {num}").format(num=num), _(title), [_(t) for t in tasks],
+         PHASE_COLORS[(num - 1) % len(PHASE_COLORS)])
+        for num, title, tasks in doc["phases"]
+    ]
+    criteria = [_(c) for c in doc["criteria"]]
 
     cards = [
-        ("Project Name", "FlowPulse", ACCENT_BLUE),
-        ("Type", "Browser Extension +\nWeb Application", ACCENT_GREEN),
-        ("Architecture", "Serverless\n(Firebase-based)", ACCENT_AMBER),
-        ("Backend", "Firebase Auth +\nFirestore + Functions", ACCENT_PINK),
+        (_("Project Name"), "FlowPulse", ACCENT_BLUE),
+        (_("Type"), _("Browser Extension +\nWeb Application"), ACCENT_GREEN),
+        (_("Architecture"), _("Serverless\n(Firebase-based)"), ACCENT_AMBER),
+        (_("Backend"), "Firebase Auth +\nFirestore + Functions", ACCENT_PINK),
     ]
-
-    for i, (label, value, color) in enumerate(cards):
-        x = Inches(0.8 + i * 3.05)
-        card = add_shape(slide, x, Inches(1.8), Inches(2.8), Inches(2.2), BG_CARD, BORDER_COLOR, 0.05)
-        add_shape(slide, x, Inches(1.8), Inches(2.8), Inches(0.06), color)
-        add_text_box(slide, x + Inches(0.2), Inches(2.1), Inches(2.4), Inches(0.4),
-                     label, font_size=13, color=TEXT_MUTED, bold=True)
-        add_text_box(slide, x + Inches(0.2), Inches(2.5), Inches(2.4), Inches(1.2),
-                     value, font_size=20, color=TEXT_WHITE, bold=True)
-
-    # Core Objective box
-    add_shape(slide, Inches(0.8), Inches(4.4), Inches(11.7), Inches(2.2), BG_CARD, BORDER_COLOR, 0.03)
-    add_text_box(slide, Inches(1.1), Inches(4.6), Inches(3), Inches(0.4),
-                 "CORE OBJECTIVE", font_size=13, color=ACCENT_BLUE, bold=True)
-    add_text_box(slide, Inches(1.1), Inches(5.1), Inches(11.2), Inches(1.2),
-                 "Track daily web activity, analyze usage patterns, and provide productivity "
-                 "insights through a centralized dashboard using Firebase backend.",
-                 font_size=18, color=TEXT_WHITE, line_spacing=1.4)
-
-    slide_number_footer(slide, 3, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 4 — PROBLEM & SOLUTION
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(6), Inches(0.7),
-                 "Problem & Solution", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_GREEN, 3)
-
-    # Problem card
-    add_shape(slide, Inches(0.8), Inches(1.7), Inches(5.6), Inches(4.5), BG_CARD, BORDER_COLOR, 0.04)
-    add_shape(slide, Inches(0.8), Inches(1.7), Inches(5.6), Inches(0.06), RGBColor(0xEF, 0x44, 0x44))
-    add_icon_circle(slide, Inches(1.2), Inches(2.1), Inches(0.6), RGBColor(0xEF, 0x44, 0x44), "!", 22)
-    add_text_box(slide, Inches(2.0), Inches(2.15), Inches(4), Inches(0.5),
-                 "PROBLEM", font_size=20, color=RGBColor(0xEF, 0x44, 0x44), bold=True)
+    objective = _("Track daily web activity, analyze usage patterns, and provide productivity "
+                  "insights through a centralized dashboard using Firebase backend.")
 
     problem_lines = [
-        ("Users are unaware of how they spend", TEXT_WHITE),
-        ("time online", TEXT_WHITE),
+        (_("Users are unaware of how they spend"), TEXT_WHITE),
+        (_("time online"), TEXT_WHITE),
         ("", TEXT_WHITE),
-        ("No simple, privacy-focused system exists", TEXT_MUTED),
-        ("that visualizes browsing behavior", TEXT_MUTED),
-        ("across sessions in real-time", TEXT_MUTED),
+        (_("No simple, privacy-focused system exists"), TEXT_MUTED),
+        (_("that visualizes browsing behavior"), TEXT_MUTED),
+        (_("across sessions in real-time"), TEXT_MUTED),
     ]
-    add_multiline_box(slide, Inches(1.2), Inches(3.0), Inches(4.8), Inches(3),
-                      problem_lines, font_size=16, line_spacing=1.4)
-
-    # Solution card
-    add_shape(slide, Inches(6.9), Inches(1.7), Inches(5.6), Inches(4.5), BG_CARD, BORDER_COLOR, 0.04)
-    add_shape(slide, Inches(6.9), Inches(1.7), Inches(5.6), Inches(0.06), ACCENT_GREEN)
-    add_icon_circle(slide, Inches(7.3), Inches(2.1), Inches(0.6), ACCENT_GREEN, "✓", 22)
-    add_text_box(slide, Inches(8.1), Inches(2.15), Inches(4), Inches(0.5),
-                 "SOLUTION", font_size=20, color=ACCENT_GREEN, bold=True)
-
     solution_lines = [
-        ("FlowPulse collects browser activity", TEXT_WHITE),
-        ("via Chrome extension", TEXT_WHITE),
+        (_("FlowPulse collects browser activity"), TEXT_WHITE),
+        (_("via Chrome extension"), TEXT_WHITE),
         ("", TEXT_WHITE),
-        ("→  Stores structured logs in Firebase", ACCENT_BLUE),
-        ("→  Processes analytics via Cloud Functions", ACCENT_BLUE),
-        ("→  Displays insights in React dashboard", ACCENT_BLUE),
+        ("→  " + _("Stores structured logs in Firebase"), ACCENT_BLUE),
+        ("→  " + _("Processes analytics via Cloud Functions"), ACCENT_BLUE),
+        ("→  " + _("Displays insights in React dashboard"), ACCENT_BLUE),
     ]
-    add_multiline_box(slide, Inches(7.3), Inches(3.0), Inches(4.8), Inches(3),
-                      solution_lines, font_size=16, line_spacing=1.4)
 
-    slide_number_footer(slide, 4, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 5 — SYSTEM ARCHITECTURE
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(6), Inches(0.7),
-                 "System Architecture", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_BLUE, 3)
-
-    add_text_box(slide, Inches(0.8), Inches(1.5), Inches(10), Inches(0.5),
-                 "Serverless Architecture  –  End-to-End Data Flow",
-                 font_size=16, color=TEXT_MUTED)
-
-    # Architecture flow boxes
     arch_items = [
         ("🌐", "Browser\nExtension", "Tab tracking\nIdle detection\nDomain extraction", ACCENT_BLUE),
         ("🔐", "Firebase\nAuth", "Google Sign-In\nUser isolation\nSession mgmt", ACCENT_GREEN),
@@ -317,45 +326,6 @@ def create_presentation():
         ("📊", "Web\nDashboard", "Charts & graphs\nSettings UI\nReal-time sync", ACCENT_BLUE),
     ]
 
-    for i, (icon, title, desc, color) in enumerate(arch_items):
-        x = Inches(0.5 + i * 2.55)
-        y = Inches(2.3)
-
-        # Card
-        add_shape(slide, x, y, Inches(2.3), Inches(4.2), BG_CARD, BORDER_COLOR, 0.05)
-        add_shape(slide, x, y, Inches(2.3), Inches(0.06), color)
-
-        # Icon
-        add_text_box(slide, x, y + Inches(0.3), Inches(2.3), Inches(0.7),
-                     icon, font_size=36, color=TEXT_WHITE, alignment=PP_ALIGN.CENTER)
-
-        # Title
-        add_text_box(slide, x + Inches(0.15), y + Inches(1.1), Inches(2.0), Inches(0.8),
-                     title, font_size=17, color=TEXT_WHITE, bold=True, alignment=PP_ALIGN.CENTER)
-
-        # Description
-        desc_lines = [(line, TEXT_MUTED) for line in desc.split("\n")]
-        add_multiline_box(slide, x + Inches(0.15), y + Inches(2.2), Inches(2.0), Inches(1.8),
-                          desc_lines, font_size=12, line_spacing=1.5, alignment=PP_ALIGN.CENTER)
-
-        # Arrow between boxes
-        if i < len(arch_items) - 1:
-            arrow_x = x + Inches(2.35)
-            add_text_box(slide, arrow_x, y + Inches(1.5), Inches(0.3), Inches(0.5),
-                         "→", font_size=28, color=ACCENT_BLUE, alignment=PP_ALIGN.CENTER)
-
-    slide_number_footer(slide, 5, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 6 — TECHNOLOGY STACK
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(6), Inches(0.7),
-                 "Technology Stack", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_AMBER, 3)
-
     tech_groups = [
         ("Frontend (Web App)", [
             "React", "Firebase SDK", "Recharts", "Tailwind CSS", "Vite"
@@ -368,52 +338,13 @@ def create_presentation():
         ], ACCENT_AMBER),
     ]
 
-    for i, (group_title, techs, color) in enumerate(tech_groups):
-        x = Inches(0.8 + i * 4.1)
-        add_shape(slide, x, Inches(1.8), Inches(3.8), Inches(5.0), BG_CARD, BORDER_COLOR, 0.04)
-        add_shape(slide, x, Inches(1.8), Inches(3.8), Inches(0.06), color)
-
-        add_text_box(slide, x + Inches(0.3), Inches(2.1), Inches(3.2), Inches(0.5),
-                     group_title, font_size=18, color=color, bold=True)
-
-        lines = []
-        for tech in techs:
-            lines.append(("●  " + tech, TEXT_WHITE))
-        add_multiline_box(slide, x + Inches(0.3), Inches(2.8), Inches(3.2), Inches(3.5),
-                          lines, font_size=16, line_spacing=1.8)
-
-    slide_number_footer(slide, 6, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 7 — SYSTEM COMPONENTS (EXTENSION)
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(8), Inches(0.7),
-                 "System Components — Browser Extension",
-                 font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_PINK, 3)
-
-    # Responsibilities
-    add_shape(slide, Inches(0.8), Inches(1.7), Inches(5.8), Inches(5.0), BG_CARD, BORDER_COLOR, 0.04)
-    add_text_box(slide, Inches(1.1), Inches(1.9), Inches(5), Inches(0.5),
-                 "RESPONSIBILITIES", font_size=14, color=ACCENT_PINK, bold=True)
     resp_lines = [
-        ("●  Detect active tab and track time per domain", TEXT_WHITE),
-        ("●  Extract domain and page title from tabs", TEXT_WHITE),
-        ("●  Calculate browsing duration per site", TEXT_WHITE),
-        ("●  Send activity logs to Firestore in batches", TEXT_WHITE),
-        ("●  Sync user settings (tracking toggle, blocked sites)", TEXT_WHITE),
+        ("●  " + _("Detect active tab and track time per domain"), TEXT_WHITE),
+        ("●  " + _("Extract domain and page title from tabs"), TEXT_WHITE),
+        ("●  " + _("Calculate browsing duration per site"), TEXT_WHITE),
+        ("●  " + _("Send activity logs to Firestore in batches"), TEXT_WHITE),
+        ("●  " + _("Sync user settings (tracking toggle, blocked sites)"), TEXT_WHITE),
     ]
-    add_multiline_box(slide, Inches(1.1), Inches(2.5), Inches(5.2), Inches(3.5),
-                      resp_lines, font_size=15, line_spacing=1.8)
-
-    # Key Modules
-    add_shape(slide, Inches(6.9), Inches(1.7), Inches(5.6), Inches(5.0), BG_CARD, BORDER_COLOR, 0.04)
-    add_text_box(slide, Inches(7.2), Inches(1.9), Inches(5), Inches(0.5),
-                 "KEY MODULES", font_size=14, color=ACCENT_BLUE, bold=True)
-
     modules = [
         ("Background Script", "Tab tracking, idle detection, alarm-based flush"),
         ("Content Script", "Title extraction, focus/blur detection"),
@@ -421,82 +352,27 @@ def create_presentation():
         ("Auth Handler", "Google login flow, session management"),
     ]
 
-    for i, (name, desc) in enumerate(modules):
-        y = Inches(2.5) + Inches(i * 1.0)
-        add_icon_circle(slide, Inches(7.3), y, Inches(0.4), ACCENT_BLUE, str(i + 1), 13)
-        add_text_box(slide, Inches(7.9), y - Inches(0.05), Inches(4.2), Inches(0.35),
-                     name, font_size=15, color=TEXT_WHITE, bold=True)
-        add_text_box(slide, Inches(7.9), y + Inches(0.3), Inches(4.2), Inches(0.35),
-                     desc, font_size=12, color=TEXT_MUTED)
-
-    slide_number_footer(slide, 7, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 8 — SYSTEM COMPONENTS (BACKEND + DASHBOARD)
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(10), Inches(0.7),
-                 "System Components — Backend & Dashboard",
-                 font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_GREEN, 3)
-
-    # Firebase Backend
-    add_shape(slide, Inches(0.8), Inches(1.7), Inches(5.8), Inches(5.0), BG_CARD, BORDER_COLOR, 0.04)
-    add_shape(slide, Inches(0.8), Inches(1.7), Inches(5.8), Inches(0.06), ACCENT_AMBER)
-    add_text_box(slide, Inches(1.1), Inches(1.9), Inches(5), Inches(0.5),
-                 "FIREBASE BACKEND", font_size=14, color=ACCENT_AMBER, bold=True)
-
     backend_lines = [
-        ("Authentication", ACCENT_BLUE, True),
-        ("  Google Sign-In, user-based data isolation", TEXT_MUTED),
+        (_("Authentication"), ACCENT_BLUE, True),
+        ("  " + _("Google Sign-In, user-based data isolation"), TEXT_MUTED),
         ("", TEXT_WHITE),
         ("Cloud Firestore", ACCENT_BLUE, True),
-        ("  Activity logs, user settings, daily stats", TEXT_MUTED),
+        ("  " + _("Activity logs, user settings, daily stats"), TEXT_MUTED),
         ("", TEXT_WHITE),
         ("Cloud Functions", ACCENT_BLUE, True),
-        ("  Daily aggregation, productivity scoring", TEXT_MUTED),
-        ("  Pattern detection, weekly trends", TEXT_MUTED),
+        ("  " + _("Daily aggregation, productivity scoring"), TEXT_MUTED),
+        ("  " + _("Pattern detection, weekly trends"), TEXT_MUTED),
     ]
-    add_multiline_box(slide, Inches(1.1), Inches(2.5), Inches(5.2), Inches(4),
-                      backend_lines, font_size=14, line_spacing=1.5)
-
-    # Web Dashboard
-    add_shape(slide, Inches(6.9), Inches(1.7), Inches(5.6), Inches(5.0), BG_CARD, BORDER_COLOR, 0.04)
-    add_shape(slide, Inches(6.9), Inches(1.7), Inches(5.6), Inches(0.06), ACCENT_GREEN)
-    add_text_box(slide, Inches(7.2), Inches(1.9), Inches(5), Inches(0.5),
-                 "WEB DASHBOARD FEATURES", font_size=14, color=ACCENT_GREEN, bold=True)
-
     dashboard_lines = [
-        ("●  Daily activity chart (time per domain)", TEXT_WHITE),
-        ("●  Category breakdown (productive/distraction)", TEXT_WHITE),
-        ("●  Weekly trends (line/area charts)", TEXT_WHITE),
-        ("●  Productivity score gauge", TEXT_WHITE),
-        ("●  Enable/Disable tracking toggle", TEXT_WHITE),
-        ("●  Manage blocked sites list", TEXT_WHITE),
-        ("●  Real-time data updates", TEXT_WHITE),
+        ("●  " + _("Daily activity chart (time per domain)"), TEXT_WHITE),
+        ("●  " + _("Category breakdown (productive/distraction)"), TEXT_WHITE),
+        ("●  " + _("Weekly trends (line/area charts)"), TEXT_WHITE),
+        ("●  " + _("Productivity score gauge"), TEXT_WHITE),
+        ("●  " + _("Enable/Disable tracking toggle"), TEXT_WHITE),
+        ("●  " + _("Manage blocked sites list"), TEXT_WHITE),
+        ("●  " + _("Real-time data updates"), TEXT_WHITE),
     ]
-    add_multiline_box(slide, Inches(7.2), Inches(2.5), Inches(5.0), Inches(4),
-                      dashboard_lines, font_size=14, line_spacing=1.7)
-
-    slide_number_footer(slide, 8, TOTAL_SLIDES)
 
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 9 — DATABASE DESIGN
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(6), Inches(0.7),
-                 "Database Design", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_GREEN, 3)
-
-    add_text_box(slide, Inches(0.8), Inches(1.5), Inches(10), Inches(0.4),
-                 "Firestore Collections Structure — Nested under users/{userId}",
-                 font_size=15, color=TEXT_MUTED)
-
-    # Collection cards
     collections = [
         ("users/{userId}", [
             ("email", "string"),
@@ -528,284 +404,238 @@ def create_presentation():
         ], ACCENT_PINK),
     ]
 
-    for i, (coll_name, fields, color) in enumerate(collections):
-        x = Inches(0.5 + i * 3.15)
-        card_h = Inches(4.8)
-        add_shape(slide, x, Inches(2.0), Inches(2.95), card_h, BG_CARD, BORDER_COLOR, 0.04)
-        add_shape(slide, x, Inches(2.0), Inches(2.95), Inches(0.06), color)
-
-        add_text_box(slide, x + Inches(0.15), Inches(2.2), Inches(2.65), Inches(0.45),
-                     coll_name, font_size=13, color=color, bold=True)
-
-        lines = []
-        for fname, ftype in fields:
-            lines.append((f"  {fname}", TEXT_WHITE, False, 12))
-            lines.append((f"     {ftype}", TEXT_MUTED, False, 10))
-        add_multiline_box(slide, x + Inches(0.15), Inches(2.7), Inches(2.65), Inches(3.8),
-                          lines, font_size=12, line_spacing=1.3)
-
-    slide_number_footer(slide, 9, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 10 — FUNCTIONAL REQUIREMENTS
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(8), Inches(0.7),
-                 "Functional Requirements", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_BLUE, 3)
-
-    frs = [
-        ("FR-01", "User can sign in securely via Google Login"),
-        ("FR-02", "Extension detects active tab and tracks browsing duration"),
-        ("FR-03", "Activity logs are stored per user in Firestore"),
-        ("FR-04", "Dashboard displays real-time daily analytics"),
-        ("FR-05", "Dashboard displays weekly trend charts"),
-        ("FR-06", "Dashboard shows productivity score"),
-        ("FR-07", "User can enable/disable tracking from dashboard and extension"),
-        ("FR-08", "User can manage a blocked-sites list"),
-        ("FR-09", "System aggregates daily usage via Cloud Functions"),
-        ("FR-10", "Settings sync in real-time between extension and dashboard"),
-    ]
-
-    add_shape(slide, Inches(0.8), Inches(1.7), Inches(11.7), Inches(5.2), BG_CARD, BORDER_COLOR, 0.03)
-
-    for i, (code, desc) in enumerate(frs):
-        y = Inches(1.95) + Inches(i * 0.48)
-        color = [ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK, ACCENT_BLUE][i % 5]
-        add_shape(slide, Inches(1.1), y, Inches(0.85), Inches(0.35), color)
-        add_text_box(slide, Inches(1.12), y + Inches(0.01), Inches(0.85), Inches(0.35),
-                     code, font_size=11, color=BG_DARK, bold=True, alignment=PP_ALIGN.CENTER)
-        add_text_box(slide, Inches(2.15), y + Inches(0.01), Inches(9.8), Inches(0.35),
-                     desc, font_size=15, color=TEXT_WHITE)
-
-    slide_number_footer(slide, 10, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 11 — NON-FUNCTIONAL REQUIREMENTS
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(8), Inches(0.7),
-                 "Non-Functional Requirements", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_AMBER, 3)
-
-    nfrs = [
-        ("NFR-01", "Secure User Isolation", "Each user sees only their own data", "🔒"),
-        ("NFR-02", "Scalable Design", "Firestore sub-collections for efficient queries", "📈"),
-        ("NFR-03", "Low Latency Logging", "Batch writes, minimal network calls", "⚡"),
-        ("NFR-04", "Real-Time Sync", "Firestore onSnapshot listeners for settings", "🔄"),
-        ("NFR-05", "Minimal Impact", "Background script optimized for performance", "🪶"),
-        ("NFR-06", "Responsive UI", "Dashboard works on desktop and tablet", "📱"),
-        ("NFR-07", "Data Validation", "Firestore security rules enforce schema", "✅"),
-    ]
-
-    for i, (code, title, desc, icon) in enumerate(nfrs):
-        col = i % 2
-        row = i // 2
-        x = Inches(0.8 + col * 6.2)
-        y = Inches(1.7 + row * 1.35)
-
-        add_shape(slide, x, y, Inches(5.9), Inches(1.15), BG_CARD, BORDER_COLOR, 0.04)
-
-        add_text_box(slide, x + Inches(0.2), y + Inches(0.15), Inches(0.5), Inches(0.5),
-                     icon, font_size=22, alignment=PP_ALIGN.CENTER)
-        add_text_box(slide, x + Inches(0.75), y + Inches(0.1), Inches(1.0), Inches(0.35),
-                     code, font_size=11, color=ACCENT_AMBER, bold=True)
-        add_text_box(slide, x + Inches(1.75), y + Inches(0.1), Inches(3.8), Inches(0.35),
-                     title, font_size=15, color=TEXT_WHITE, bold=True)
-        add_text_box(slide, x + Inches(0.75), y + Inches(0.55), Inches(4.8), Inches(0.45),
-                     desc, font_size=12, color=TEXT_MUTED)
-
-    slide_number_footer(slide, 11, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 12 — DEVELOPMENT PHASES (1-3)
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(8), Inches(0.7),
-                 "Development Phases (1–3)", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_PINK, 3)
-
-    phases_1 = [
-        ("Phase 1", "Project Setup", [
-            "Create Firebase project",
-            "Enable Auth (Google provider)",
-            "Initialize Cloud Firestore",
-            "Define security rules",
-            "Set up React + Vite + Tailwind",
-            "Set up extension scaffold (MV3)",
-            "Configure Firebase SDK",
-        ], ACCENT_BLUE),
-        ("Phase 2", "Extension Development", [
-            "Active tab detection (chrome.tabs)",
-            "Idle state detection (chrome.idle)",
-            "Track duration per tab session",
-            "Extract domain + title from URLs",
-            "Batch logs → push to Firestore",
-            "Google Sign-In in popup",
-            "Build popup UI",
-            "Sync settings from Firestore",
-        ], ACCENT_GREEN),
-        ("Phase 3", "Web Dashboard", [
-            "Firebase Auth (login/logout)",
-            "Dashboard layout + sidebar",
-            "Daily activity chart",
-            "Category breakdown (PieChart)",
-            "Weekly trends (LineChart)",
-            "Productivity score gauge",
-            "Settings page",
-            "Real-time data (onSnapshot)",
-        ], ACCENT_AMBER),
-    ]
-
-    for i, (phase, title, tasks, color) in enumerate(phases_1):
-        x = Inches(0.6 + i * 4.15)
-        add_shape(slide, x, Inches(1.7), Inches(3.9), Inches(5.2), BG_CARD, BORDER_COLOR, 0.04)
-        add_shape(slide, x, Inches(1.7), Inches(3.9), Inches(0.06), color)
-
-        add_text_box(slide, x + Inches(0.2), Inches(1.9), Inches(3.5), Inches(0.35),
-                     phase, font_size=12, color=color, bold=True)
-        add_text_box(slide, x + Inches(0.2), Inches(2.25), Inches(3.5), Inches(0.4),
-                     title, font_size=18, color=TEXT_WHITE, bold=True)
-
-        lines = [("□  " + t, TEXT_MUTED) for t in tasks]
-        add_multiline_box(slide, x + Inches(0.2), Inches(2.8), Inches(3.5), Inches(3.8),
-                          lines, font_size=12, line_spacing=1.6)
-
-    slide_number_footer(slide, 12, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 13 — DEVELOPMENT PHASES (4-6)
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(8), Inches(0.7),
-                 "Development Phases (4–6)", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_PINK, 3)
-
-    phases_2 = [
-        ("Phase 4", "Backend Logic", [
-            "Scheduled daily aggregation function",
-            "Compute productivity score per day",
-            "Compute top domains + peak hour",
-            "Write results to dailyStats",
-            "Pattern detection for weekly trends",
-        ], ACCENT_PINK),
-        ("Phase 5", "Optimization & Security", [
-            "Firestore security rules (user isolation)",
-            "Input validation in Cloud Functions",
-            "Rate limiting for activity writes",
-            "Performance tuning (batch writes)",
-            "Error handling and logging",
-        ], RGBColor(0xA7, 0x8B, 0xFA)),
-        ("Phase 6", "Deployment", [
-            "Package Chrome extension",
-            "Deploy web app to Firebase Hosting",
-            "Deploy Cloud Functions to prod",
-            "Configure production env vars",
-            "Final end-to-end testing",
-        ], ACCENT_BLUE),
-    ]
-
-    for i, (phase, title, tasks, color) in enumerate(phases_2):
-        x = Inches(0.6 + i * 4.15)
-        add_shape(slide, x, Inches(1.7), Inches(3.9), Inches(4.5), BG_CARD, BORDER_COLOR, 0.04)
-        add_shape(slide, x, Inches(1.7), Inches(3.9), Inches(0.06), color)
-
-        add_text_box(slide, x + Inches(0.2), Inches(1.9), Inches(3.5), Inches(0.35),
-                     phase, font_size=12, color=color, bold=True)
-        add_text_box(slide, x + Inches(0.2), Inches(2.25), Inches(3.5), Inches(0.4),
-                     title, font_size=18, color=TEXT_WHITE, bold=True)
-
-        lines = [("□  " + t, TEXT_MUTED) for t in tasks]
-        add_multiline_box(slide, x + Inches(0.2), Inches(2.8), Inches(3.5), Inches(3.2),
-                          lines, font_size=13, line_spacing=1.7)
-
-    slide_number_footer(slide, 13, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 14 — COMPLETION CRITERIA
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_text_box(slide, Inches(0.8), Inches(0.5), Inches(8), Inches(0.7),
-                 "Completion Criteria", font_size=36, color=TEXT_WHITE, bold=True)
-    add_accent_line(slide, Inches(0.8), Inches(1.2), Inches(2.5), ACCENT_BLUE, 3)
-
-    add_text_box(slide, Inches(0.8), Inches(1.5), Inches(10), Inches(0.4),
-                 "Project is considered COMPLETE when all criteria are met:",
-                 font_size=15, color=TEXT_MUTED)
-
-    criteria = [
-        "Users can sign in via Google Login",
-        "Extension tracks browsing activity accurately",
-        "Activity logs are stored in Firestore per user",
-        "Dashboard displays daily and weekly insights",
-        "Productivity score is calculated and displayed",
-        "Settings sync in real-time (extension ↔ dashboard)",
-        "Data is secure and isolated per user",
-        "System performs reliably under multiple users",
-        "Extension is packaged and loadable",
-        "Web app is deployed and accessible",
+    frs_colors = [ACCENT_BLUE, ACCENT_GREEN, ACCENT_AMBER, ACCENT_PINK, ACCENT_BLUE]
+    return {
+        "toc": {"toc_items": toc_items},
+        "overview": {"cards": cards, "objective": objective},
+        "problem_solution": {"problem_lines": problem_lines, "solution_lines": solution_lines},
+        "architecture": {"arch_items": [
+            (icon, _(title), [(_(line), TEXT_MUTED) for line in desc.split("\n")], color,
+             "→" if i < len(arch_items) - 1 else None)
+            for i, (icon, title, desc, color) in enumerate(arch_items)
+        ]},
+        "tech_stack": {"tech_groups": [
+            (_(title), [("●  " + tech, TEXT_WHITE) for tech in techs], color)
+            for title, techs, color in tech_groups
+        ]},
+        "components_extension": {
+            "resp_lines": resp_lines,
+            "modules": [(str(i + 1), _(name), _(desc)) for i, (name, desc) in enumerate(modules)],
+        },
+        "components_backend": {"backend_lines": backend_lines, "dashboard_lines": dashboard_lines},
+        "database": {"collections": [
+            (name, [line for fname, ftype in fields for line in (
+                (f"  {fname}", TEXT_WHITE, False, 12),
+                (f"     {ftype}", TEXT_MUTED, False, 10),
+            )], color)
+            for name, fields, color in collections
+        ]},
+        "functional": {"frs": [
+            (code, desc, frs_colors[i % 5]) for i, (code, desc) in enumerate(frs)
+        ]},
+        "non_functional": {"nfrs": nfrs},
+        "phases": {"phases": [
+            (phase, title, [("□  " + t, TEXT_MUTED) for t in tasks], color)
+            for phase, title, tasks, color in phases
+        ]},
+        "criteria": {"criteria": criteria},
+    }
+
+
+def build_presentation(data=None):
+    """Build the project deck and return the unsaved Presentation."""
+    return render_deck(DECK, data if data is not None else deck_data())
+
+
+def create_presentation(output_path=DEFAULT_OUTPUT, incremental=False, cache_dir=CACHE_DIR, doc=None,
+                        preview=None, workers=1, master=False, spill=None, optimize=False, locale=None,
+                        patch=False, force=False):
+    """Stream the project deck to ``output_path`` (a path or binary file object).
+
+    With ``incremental`` only slides whose content hash changed since the
+    last build are rendered; the rest come from ``cache_dir``. ``doc`` is a
+    pre-parsed ``document.txt`` (see ``deck_data()``). ``preview`` also
+    writes an HTML page or a directory of SVGs (see ``deckgen.preview``).
+    ``workers`` renders slides in that many processes (see ``deckgen.stream``).
+    ``master`` draws the chrome on a themed master (see ``deckgen.master``).
+    ``spill`` writes through a temp-file spill store (see ``deckgen.stream``).
+    ``optimize`` shrinks the finished deck (see ``deckgen.optimize``); it
+    needs ``output_path`` to be a path. ``locale`` translates the deck with
+    that locale's catalog (see ``deckgen.i18n``); the layout is shared.
+    ``patch`` updates the deck already at ``output_path`` in place,
+    rewriting only the slides and shapes that changed (see ``deckgen.patch``);
+    a deck that cannot be patched is only rebuilt over hand edits with
+    ``force``, otherwise ``PatchError`` is raised. Every other build to a
+    path is recorded for later patches.
+    """
+    # Keep stdout clean when the deck itself is being written there
+    log = sys.stderr if output_path is sys.stdout.buffer else sys.stdout
+    name = getattr(output_path, "name", output_path)
+    catalog = load_catalog(locale)
+    deck = localize(DECK, catalog)
+    with tracing.span("deck_data", "setup"):
+        data = deck_data(doc, catalog)
+    if preview:
+        with tracing.span("preview", "save"):
+            count = write_preview(deck, data, preview, title="FlowPulse 2.0")
+        print(f"🖼️  Preview of {count} slides written to: {preview}", file=log)
+    if patch:
+        start = time.perf_counter()
+        summary = patch_deck(deck, data, output_path, master=master, cache_dir=cache_dir, force=force)
+        ms = (time.perf_counter() - start) * 1000
+        if summary["unchanged"]:
+            print(f"✅ Presentation up to date: {name}", file=log)
+        elif summary["rebuilt"]:
+            print(f"⚠️  Cannot patch {name} ({summary['rebuilt']}); rebuilt it in {ms:.0f} ms", file=log)
+        else:
+            print(f"🩹 Patched {name}: {summary['patched']} of {summary['slides']} slides, "
+                  f"{summary['pieces']} shapes in {ms:.0f} ms", file=log)
+        return
+    if incremental:
+        summary = build_incremental(deck, data, output_path, cache_dir, master=master, optimize=optimize)
+        if summary["unchanged"]:
+            print(f"✅ Presentation up to date: {name}", file=log)
+            return
+        count = summary["slides"]
+        stats = summary.get("optimized")
+    else:
+        count = write_deck(deck, data, output_path, workers=workers, master=master, spill=spill)
+        if optimize:
+            with tracing.span("optimize", "save"):
+                stats = optimize_file(output_path)
+    if isinstance(output_path, (str, os.PathLike)):
+        with tracing.span("record_build", "save"):
+            record_build(output_path, cache_dir)
+    print(f"✅ Presentation saved to: {name}", file=log)
+    if incremental:
+        print(f"   {count} slides ({summary['rendered']} rendered, {summary['reused']} from cache)", file=log)
+    else:
+        print(f"   {count} slides generated", file=log)
+    if optimize:
+        print(f"🗜️  Optimized: {format_stats(stats)}", file=log)
+
+
+def _publish(path, key):
+    """``--publish``: upload ``path`` to R2 unless its hash is unchanged; returns the exit status."""
+    if key is None:
+        return 0
+    try:
+        result = publish(path, key or None)
+    except PublishError as exc:
+        print(f"❌ Publish failed: {exc}", file=sys.stderr)
+        return 1
+    if result["uploaded"]:
+        print(f"☁️  Published to {BUCKET}/{result['key']} (sha256 {result['sha256'][:12]})")
+    else:
+        print(f"✅ {BUCKET}/{result['key']} is up to date (sha256 {result['sha256'][:12]})")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the FlowPulse 2.0 project deck.")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help="output .pptx path, or - for stdout (default: %(default)s)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-render slides whose content changed since the last build")
+    parser.add_argument("--patch", action="store_true",
+                        help="update the existing deck in place: rewrite only changed slides and shapes, "
+                             "keeping edits made in PowerPoint")
+    parser.add_argument("--force", action="store_true",
+                        help="with --patch: rebuild a deck that cannot be patched even if it was edited by hand")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="slide cache for --incremental and --patch (default: %(default)s)")
+    parser.add_argument("--watch", action="store_true",
+                        help="rebuild incrementally (or patch, with --patch) whenever document.txt changes")
+    parser.add_argument("--profile", nargs="?", const="deck-trace.json", default=None, metavar="TRACE",
+                        help="time each slide, helper call and the save; write a Chrome trace "
+                             "(default: %(const)s) and print a summary")
+    parser.add_argument("--preview", metavar="PATH",
+                        help="also write an SVG preview: an .html page, or a directory of slide SVGs")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="render slides in this many processes, split evenly for short decks "
+                             "(default: %(default)s)")
+    parser.add_argument("--master", action="store_true",
+                        help="draw background, top bar and footer on a FlowPulse theme and master")
+    parser.add_argument("--spill", nargs="?", const=True, default=None, metavar="DIR",
+                        help="spill finished slides to temp files (in DIR) so memory stays flat")
+    parser.add_argument("--optimize", action="store_true",
+                        help="shrink the finished deck: drop unused parts, dedupe media, recompress")
+    parser.add_argument("--locale", metavar="LOCALE[,LOCALE...]",
+                        help="translate the deck (e.g. de); several locales or 'all' write one deck each, "
+                             "named <output>.<locale>.pptx")
+    parser.add_argument("--publish", nargs="?", const="", default=None, metavar="KEY",
+                        help="upload the deck to R2 (default key: decks/<file name>; KEY must be under decks/) "
+                             "unless it is unchanged")
+    args = parser.parse_args(argv)
+    output = sys.stdout.buffer if args.output == "-" else args.output
+    if args.publish is not None and (output is sys.stdout.buffer or args.watch):
+        parser.error("--publish needs an output path and cannot be combined with --watch")
+    if args.publish:
+        try:
+            check_key(args.publish)
+        except PublishError as exc:
+            parser.error(f"--publish: {exc}")
+    if args.optimize and output is sys.stdout.buffer:
+        parser.error("--optimize needs an output path")
+    if args.patch and (output is sys.stdout.buffer or args.incremental or args.spill or args.optimize):
+        parser.error("--patch needs an output path and cannot be combined with --incremental, --spill "
+                     "or --optimize")
+    if args.force and not args.patch:
+        parser.error("--force only applies to --patch")
+    locales = parse_locales(args.locale) if args.locale else [None]
+    try:
+        for locale in locales:
+            load_catalog(locale)
+    except LocaleError as exc:
+        parser.error(str(exc))
+    if len(locales) > 1 and (output is sys.stdout.buffer or args.publish):
+        parser.error("several locales need an output path and the default --publish key")
+    targets = [
+        (locale, output, args.preview) if len(locales) == 1 else
+        (locale, localized_path(output, locale), args.preview and localized_path(args.preview, locale))
+        for locale in locales
     ]
 
-    add_shape(slide, Inches(2.0), Inches(2.0), Inches(9.3), Inches(5.0), BG_CARD, BORDER_COLOR, 0.04)
-
-    for i, criterion in enumerate(criteria):
-        y = Inches(2.3) + Inches(i * 0.45)
-        color = ACCENT_GREEN
-        add_text_box(slide, Inches(2.5), y, Inches(0.4), Inches(0.35),
-                     "✓", font_size=16, color=color, bold=True, alignment=PP_ALIGN.CENTER)
-        add_text_box(slide, Inches(3.0), y + Inches(0.02), Inches(7.8), Inches(0.35),
-                     criterion, font_size=15, color=TEXT_WHITE)
-
-    slide_number_footer(slide, 14, TOTAL_SLIDES)
-
-    # ══════════════════════════════════════════════════════════════════════════
-    # SLIDE 15 — THANK YOU
-    # ══════════════════════════════════════════════════════════════════════════
-    slide = prs.slides.add_slide(blank_layout)
-    add_bg(slide)
-
-    add_shape(slide, Inches(0), Inches(0), SLIDE_WIDTH, Inches(0.06), ACCENT_BLUE)
-
-    add_text_box(slide, Inches(0), Inches(2.2), SLIDE_WIDTH, Inches(1.2),
-                 "Thank You", font_size=54, color=TEXT_WHITE, bold=True,
-                 alignment=PP_ALIGN.CENTER)
-    add_accent_line(slide, Inches(5.5), Inches(3.5), Inches(2.3), ACCENT_BLUE, 4)
-
-    add_text_box(slide, Inches(0), Inches(3.8), SLIDE_WIDTH, Inches(0.7),
-                 "FlowPulse 2.0", font_size=28, color=ACCENT_BLUE,
-                 alignment=PP_ALIGN.CENTER, bold=True)
-    add_text_box(slide, Inches(0), Inches(4.5), SLIDE_WIDTH, Inches(0.5),
-                 "A Smarter Way to Understand Your Browsing Habits",
-                 font_size=16, color=TEXT_MUTED, alignment=PP_ALIGN.CENTER)
-
-    # Decorative circles
-    add_icon_circle(slide, Inches(1.5), Inches(5.5), Inches(1.2), ACCENT_BLUE)
-    add_icon_circle(slide, Inches(3.0), Inches(6.0), Inches(0.8), ACCENT_GREEN)
-    add_icon_circle(slide, Inches(9.5), Inches(5.5), Inches(1.2), ACCENT_PINK)
-    add_icon_circle(slide, Inches(11.0), Inches(6.0), Inches(0.8), ACCENT_AMBER)
-
-    add_text_box(slide, Inches(0), Inches(5.5), SLIDE_WIDTH, Inches(0.5),
-                 "Questions?", font_size=20, color=TEXT_MUTED,
-                 alignment=PP_ALIGN.CENTER)
-
-    slide_number_footer(slide, 15, TOTAL_SLIDES)
-
-    # ── Save ──────────────────────────────────────────────────────────────────
-    output_path = "/Users/havocerebus/Documents/Current_Project_Working/FlowPulse/FlowPulse_2.0_Presentation.pptx"
-    prs.save(output_path)
-    print(f"✅ Presentation saved to: {output_path}")
-    print(f"   {TOTAL_SLIDES} slides generated")
+    def build(doc=None, incremental=args.incremental):
+        # The document is parsed once and the layout compiled once for all locales
+        if doc is None and len(targets) > 1:
+            doc = parse_document(DOCUMENT)
+        for locale, path, preview in targets:
+            create_presentation(path, incremental, args.cache_dir, doc, preview, args.workers, args.master,
+                                args.spill, args.optimize, locale, args.patch, args.force)
+
+    def publish_all():
+        return max(_publish(path, args.publish) for _, path, _ in targets)
+
+    if args.profile:
+        with tracing.profiling() as prof:
+            with tracing.span("create_presentation", "deck"):
+                try:
+                    build()
+                except PatchError as exc:
+                    print(f"❌ {exc}", file=sys.stderr)
+                    return 1
+        prof.write_trace(args.profile)
+        print(prof.format_summary(), file=sys.stderr)
+        print(f"📈 Trace written to {args.profile} (open in ui.perfetto.dev or chrome://tracing)",
+              file=sys.stderr)
+        return publish_all()
+    if args.watch:
+        if output is sys.stdout.buffer:
+            parser.error("--watch needs an output path")
+        print(f"👀 Watching {DOCUMENT} (Ctrl-C to stop)")
+        try:
+            watch(DOCUMENT, lambda doc: build(doc, not args.patch))
+        except KeyboardInterrupt:
+            pass
+        return
+    try:
+        build()
+    except PatchError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    return publish_all()
 
 
 if __name__ == "__main__":
-    create_presentation()
+    sys.exit(main())
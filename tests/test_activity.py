@@ -0,0 +1,76 @@
+"""deckgen.activity: serial, chunked and parallel aggregation agree with a plain-Python reference."""
+
+import json
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from deckgen.activity import aggregate
+
+CATEGORIES = ("neutral", "productive", "distraction")
+
+
+def _logs(n=3000, seed=7):
+    rng = random.Random(seed)
+    logs = []
+    for i in range(n):
+        uid = f"u{rng.randrange(5)}"
+        moment = datetime(2026, 10, 1 + rng.randrange(4), rng.randrange(24), rng.randrange(60),
+                          tzinfo=timezone.utc)
+        # Mostly ISO strings (the vectorized path), some epoch seconds
+        start = moment.strftime("%Y-%m-%dT%H:%M:%SZ") if i % 7 else moment.timestamp()
+        data = {"domain": f"site{rng.randrange(30)}.com", "category": rng.choice(CATEGORIES),
+                "duration": rng.randrange(1, 900), "startTime": start}
+        logs.append({"path": f"users/{uid}/activityLogs/{i}", "data": data})
+    return logs
+
+
+def _reference(logs):
+    """dailyAggregation.ts, one log at a time."""
+    days = {}
+    for doc in logs:
+        log = doc["data"]
+        start = log["startTime"]
+        if isinstance(start, str):
+            moment = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        else:
+            moment = datetime.fromtimestamp(start, timezone.utc)
+        key = (doc["path"].split("/")[1], moment.date().isoformat())
+        day = days.setdefault(key, {"time": dict.fromkeys(CATEGORIES, 0), "hours": {}, "domains": {}})
+        day["time"][log["category"]] += log["duration"]
+        day["hours"][moment.hour] = day["hours"].get(moment.hour, 0) + log["duration"]
+        domain = day["domains"].setdefault(log["domain"], {"duration": 0, "category": log["category"]})
+        domain["duration"] += log["duration"]
+
+    stats = []
+    for (uid, date), day in days.items():
+        time = day["time"]
+        total = sum(time.values())
+        raw = time["productive"] / total * 80 + 20 - time["distraction"] / total * 40
+        top = sorted(day["domains"].items(), key=lambda item: -item[1]["duration"])[:10]
+        stats.append((uid, date, {
+            "date": date,
+            "focusScore": int(min(max(raw, 0), 100) + 0.5),
+            "productiveTime": time["productive"],
+            "neutralTime": time["neutral"],
+            "distractionTime": time["distraction"],
+            "totalDuration": total,
+            "topDomains": [{"domain": d, "duration": v["duration"], "category": v["category"]} for d, v in top],
+            "peakHour": max(day["hours"], key=lambda h: (day["hours"][h], -list(day["hours"]).index(h))),
+        }))
+    return sorted(stats)
+
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    logs = _logs()
+    path = tmp_path_factory.mktemp("activity") / "logs.jsonl"
+    path.write_text("".join(json.dumps(log) + "\n" for log in logs))
+    return str(path), _reference(logs)
+
+
+@pytest.mark.parametrize("workers, chunk_rows", [(1, 1 << 14), (1, 257), (3, 257)])
+def test_matches_reference(dump, workers, chunk_rows):
+    path, expected = dump
+    assert sorted(aggregate(path, workers, chunk_rows).daily_stats()) == expected
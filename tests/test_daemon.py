@@ -0,0 +1,54 @@
+"""deckgen.daemon's HTTP front end rejects malformed requests with 4xx."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from deckgen.daemon import RenderService, make_server
+
+
+@pytest.fixture
+def server():
+    service = RenderService(workers=1, queue_size=1, timeout=5)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service._pool.shutdown(cancel_futures=True)
+
+
+def _post(server, headers, body=b""):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.putrequest("POST", "/render")
+    for name, value in headers.items():
+        conn.putheader(name, value)
+    conn.endheaders(body)
+    response = conn.getresponse()
+    status, payload = response.status, response.read()
+    conn.close()
+    return status, json.loads(payload)
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_invalid_content_length_is_400(server, length):
+    status, payload = _post(server, {"Content-Length": length})
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_invalid_json_is_400(server):
+    assert _post(server, {"Content-Length": "3"}, b"{x}")[0] == 400
+
+
+@pytest.mark.parametrize("day", [
+    {"date": "2026-13-01", "focusScore": 50},
+    {"date": "2026-10-01", "focusScore": "high"},
+    {"date": "2026-10-01", "totalMinutes": True},
+])
+def test_invalid_report_values_are_400(server, day):
+    body = json.dumps({"deck": "report", "uid": "u1", "days": [day]}).encode()
+    status, payload = _post(server, {"Content-Length": str(len(body))}, body)
+    assert status == 400, payload
@@ -0,0 +1,31 @@
+"""Decks are the same bytes every time they are built, charts included."""
+
+import io
+import zipfile
+
+from deckgen.report import build_report
+from deckgen.stream import ZIP_DATE_TIME, save
+
+WEEK = [{"date": f"2026-10-{d:02d}", "totalMinutes": 60 + d, "productiveMinutes": 40, "distractionMinutes": 20,
+         "focusScore": 60 + d, "topDomain": "github.com"} for d in range(5, 12)]
+
+
+def _chart_deck():
+    buf = io.BytesIO()
+    save(build_report("u1", WEEK, history=WEEK), buf)
+    return buf.getvalue()
+
+
+def test_chart_deck_is_reproducible():
+    assert _chart_deck() == _chart_deck()
+
+
+def test_embedded_workbook_has_fixed_dates():
+    with zipfile.ZipFile(io.BytesIO(_chart_deck())) as deck:
+        names = [n for n in deck.namelist() if n.startswith("ppt/embeddings/")]
+        assert names
+        for name in names:
+            with zipfile.ZipFile(io.BytesIO(deck.read(name))) as workbook:
+                assert {info.date_time for info in workbook.infolist()} == {ZIP_DATE_TIME}
+                core = workbook.read("docProps/core.xml").decode()
+                assert core.count("1980-01-01T00:00:00Z") == 2
@@ -0,0 +1,50 @@
+"""deckgen.incremental: partial rebuilds, and a cache that does not grow with every edit."""
+
+import glob
+import io
+import os
+
+from deckgen.incremental import build_incremental
+from deckgen.spec import Deck, Field, Slide, Text
+from deckgen.stream import write_deck
+
+DECK = Deck((
+    Slide("a", (Text(1, 1, 6, 1, Field("text")),)),
+    Slide("b", (Text(1, 1, 6, 1, "Static"),)),
+))
+
+
+def _cached(cache):
+    return len(glob.glob(os.path.join(cache, "slides", "*", "*.xml")))
+
+
+def test_rebuild_renders_changed_slides_and_matches_full_build(tmp_path):
+    path, cache = str(tmp_path / "deck.pptx"), str(tmp_path / "cache")
+    assert build_incremental(DECK, {"a": {"text": "one"}}, path, cache)["rendered"] == 2
+    summary = build_incremental(DECK, {"a": {"text": "two"}}, path, cache)
+    assert (summary["rendered"], summary["reused"]) == (1, 1)
+    assert build_incremental(DECK, {"a": {"text": "two"}}, path, cache)["unchanged"]
+
+    fresh = io.BytesIO()
+    write_deck(DECK, {"a": {"text": "two"}}, fresh)
+    with open(path, "rb") as fh:
+        assert fh.read() == fresh.getvalue()
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_superseded_slides_are_evicted(tmp_path):
+    path, cache = str(tmp_path / "deck.pptx"), str(tmp_path / "cache")
+    build_incremental(DECK, {"a": {"text": "one"}}, path, cache)
+    for text in ("two", "three", "four"):
+        summary = build_incremental(DECK, {"a": {"text": text}}, path, cache)
+        assert summary["evicted"] == 1
+    assert _cached(cache) == 2
+
+
+def test_slides_used_by_another_output_are_kept(tmp_path):
+    cache = str(tmp_path / "cache")
+    first, second = str(tmp_path / "first.pptx"), str(tmp_path / "second.pptx")
+    build_incremental(DECK, {"a": {"text": "one"}}, first, cache)
+    build_incremental(DECK, {"a": {"text": "one"}}, second, cache)
+    assert build_incremental(DECK, {"a": {"text": "two"}}, first, cache)["evicted"] == 0
+    assert build_incremental(DECK, {"a": {"text": "one"}}, first, cache)["reused"] == 2
@@ -0,0 +1,63 @@
+"""deckgen.manifest: a run killed mid-record resumes without redoing finished jobs."""
+
+import json
+
+import pytest
+
+from deckgen.manifest import run_manifest
+
+USERS = ("u0", "u1", "u2")
+
+
+@pytest.fixture
+def job(tmp_path):
+    export = tmp_path / "export.jsonl"
+    with open(export, "w", encoding="utf-8") as fh:
+        for n, uid in enumerate(USERS):
+            for day in range(1, 4):
+                stats = {"focusScore": 30 + n + day, "productiveTime": 18000 + 100 * day,
+                         "distractionTime": 6000, "totalDuration": 30000,
+                         "topDomains": [{"domain": "github.com", "duration": 100}], "peakHour": 14}
+                fh.write(json.dumps({"path": f"users/{uid}/dailyStats/2026-03-0{day}", "data": stats}) + "\n")
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text("".join(json.dumps({"uid": uid}) + "\n" for uid in USERS), encoding="utf-8")
+    return {"manifest_path": str(manifest), "export_path": str(export), "workers": 1,
+            "out_dir": str(tmp_path / "reports")}
+
+
+def test_resume_after_torn_line(job):
+    first = run_manifest(**job)
+    assert (first["jobs"], first["skipped"], first["rendered"], first["failed"]) == (3, 0, 3, [])
+
+    # Kill the run halfway through writing the last record
+    done = job["manifest_path"] + ".done"
+    with open(done, "rb") as fh:
+        lines = fh.readlines()
+    torn = json.loads(lines[-1])
+    with open(done, "wb") as fh:
+        fh.writelines(lines[:-1])
+        fh.write(lines[-1][:len(lines[-1]) // 2])
+
+    second = run_manifest(**job)
+    assert (second["skipped"], second["rendered"], second["failed"]) == (2, 1, [])
+    with open(done, "rb") as fh:
+        lines = fh.readlines()
+    assert json.loads(lines[-1])["id"] == torn["id"]
+    assert all(line.endswith(b"\n") for line in lines)
+
+    third = run_manifest(**job)
+    assert (third["skipped"], third["rendered"]) == (3, 0)
+
+
+def test_missing_output_is_rendered_again(job, tmp_path):
+    run_manifest(**job)
+    (tmp_path / "reports" / "u1.pptx").unlink()
+    summary = run_manifest(**job)
+    assert (summary["skipped"], summary["rendered"]) == (2, 1)
+    assert (tmp_path / "reports" / "u1.pptx").exists()
+
+
+def test_restart_renders_everything(job):
+    run_manifest(**job)
+    summary = run_manifest(restart=True, **job)
+    assert (summary["skipped"], summary["rendered"]) == (0, 3)
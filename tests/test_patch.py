@@ -0,0 +1,130 @@
+"""deckgen.patch: in-place updates keep what was edited by hand."""
+
+import glob
+import io
+import os
+import zipfile
+
+import pytest
+from lxml import etree
+from pptx.oxml.ns import qn
+
+from deckgen.patch import PatchError, patch_deck, record_build
+from deckgen.spec import Deck, Field, Repeat, Slide, Text
+from deckgen.stream import write_deck
+
+DECK = Deck((
+    Slide("list", (
+        Text(0.8, 0.5, 6, 0.7, "Title"),
+        Repeat("items", ("text",), dy=0.5, children=(
+            Text(0.8, 1.5, 6, 0.4, Field("text")),
+        )),
+    )),
+))
+
+HAND_NOTE = (
+    '<p:sp xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+    '<p:nvSpPr><p:cNvPr id="{id}" name="TextBox {name}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr/><p:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r><a:t>hand note</a:t></a:r></a:p></p:txBody>'
+    '</p:sp>'
+)
+
+
+def _slide(path):
+    with zipfile.ZipFile(path) as zf:
+        return etree.fromstring(zf.read("ppt/slides/slide1.xml"))
+
+
+def _shapes(root):
+    return [(int(sp[0][0].get("id")), "".join(sp.itertext()))
+            for sp in root.find(qn("p:cSld")).find(qn("p:spTree")) if sp.tag == qn("p:sp")]
+
+
+def _edit(path, edit):
+    """Rewrite slide 1 of the deck at ``path`` with ``edit(root)``, as PowerPoint would."""
+    with zipfile.ZipFile(path) as zf:
+        entries = [(info, zf.read(info)) for info in zf.infolist()]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for info, data in entries:
+            if info.filename == "ppt/slides/slide1.xml":
+                root = etree.fromstring(data)
+                edit(root)
+                data = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+            zf.writestr(info, data)
+
+
+def _add_note(root):
+    # PowerPoint numbers a new shape past the highest id on the slide
+    next_id = max(int(v) for v in root.xpath("//p:cNvPr/@id", namespaces=root.nsmap)) + 1
+    root.find(qn("p:cSld")).find(qn("p:spTree")).append(
+        etree.fromstring(HAND_NOTE.format(id=next_id, name=next_id - 1)))
+
+
+@pytest.fixture
+def built(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    cache = str(tmp_path / "cache")
+    data = {"list": {"items": ["a", "b"]}}
+    write_deck(DECK, data, path)
+    record_build(path, cache)
+    return path, cache
+
+
+def test_new_shape_does_not_replace_hand_added_shape(built):
+    path, cache = built
+    _edit(path, _add_note)
+
+    summary = patch_deck(DECK, {"list": {"items": ["a", "b", "c"]}}, path, cache_dir=cache)
+
+    assert summary["patched"] == 1 and summary["rebuilt"] is None
+    shapes = _shapes(_slide(path))
+    texts = [text for _, text in shapes]
+    assert texts[:4] == ["Title", "a", "b", "c"]
+    assert "hand note" in texts and "1/1" in texts
+    ids = [shape_id for shape_id, _ in shapes]
+    assert len(ids) == len(set(ids))
+
+
+def test_dropped_shape_keeps_hand_added_shape(built):
+    path, cache = built
+    _edit(path, _add_note)
+
+    patch_deck(DECK, {"list": {"items": ["a"]}}, path, cache_dir=cache)
+
+    texts = [text for _, text in _shapes(_slide(path))]
+    assert "b" not in texts
+    assert "hand note" in texts and "a" in texts
+
+
+def test_unedited_patch_matches_full_build(built, tmp_path):
+    path, cache = built
+    data = {"list": {"items": ["a", "c"]}}
+    patch_deck(DECK, data, path, cache_dir=cache)
+    fresh = io.BytesIO()
+    write_deck(DECK, data, fresh)
+    with zipfile.ZipFile(path) as zf, zipfile.ZipFile(fresh) as ref:
+        assert zf.read("ppt/slides/slide1.xml") == ref.read("ppt/slides/slide1.xml")
+
+
+def test_unpatchable_edited_deck_is_left_alone(built):
+    path, cache = built
+    _edit(path, _add_note)
+    with open(path, "rb") as fh:
+        before = fh.read()
+    deck = Deck(DECK.slides + (Slide("end", (Text(1, 1, 4, 1, "End"),)),))
+
+    with pytest.raises(PatchError):
+        patch_deck(deck, {"list": {"items": ["a", "b"]}}, path, cache_dir=cache)
+    with open(path, "rb") as fh:
+        assert fh.read() == before
+
+    summary = patch_deck(deck, {"list": {"items": ["a", "b"]}}, path, cache_dir=cache, force=True)
+    assert summary["rebuilt"]
+
+
+def test_superseded_merge_bases_are_evicted(built):
+    path, cache = built
+    for items in (["a", "c"], ["a", "d"], ["a", "e"]):
+        patch_deck(DECK, {"list": {"items": items}}, path, cache_dir=cache)
+    assert len(glob.glob(os.path.join(cache, "slides", "*", "*.xml"))) == 1
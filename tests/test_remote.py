@@ -0,0 +1,10 @@
+"""deckgen.remote against the local stand-in Worker."""
+
+import io
+
+from deckgen.remote import selftest
+
+
+def test_selftest_passes():
+    log = io.StringIO()
+    assert selftest(latency=0.01, log=log) == 0, log.getvalue()
@@ -0,0 +1,49 @@
+"""deckgen.stream: serial, parallel and spilled builds write the same bytes."""
+
+import io
+
+import pytest
+
+import generate_ppt
+from deckgen.stream import write_deck
+
+
+def _build(deck, data, **kwargs):
+    buf = io.BytesIO()
+    write_deck(deck, data, buf, **kwargs)
+    return buf.getvalue()
+
+
+def _long_data(slides=80):
+    # Page the functional requirements (10 per slide) over many slides
+    data = generate_ppt.deck_data()
+    frs = data["functional"]["frs"]
+    data["functional"]["frs"] = [frs[i % len(frs)] for i in range(slides * 10)]
+    return data
+
+
+@pytest.mark.parametrize("master", [False, True])
+@pytest.mark.parametrize("data", [generate_ppt.deck_data(), _long_data()], ids=["project", "long"])
+def test_parallel_and_spill_match_serial(data, master, tmp_path):
+    serial = _build(generate_ppt.DECK, data, master=master)
+    assert _build(generate_ppt.DECK, data, master=master, workers=3) == serial
+    assert _build(generate_ppt.DECK, data, master=master, workers=2, chunk=7) == serial
+    assert _build(generate_ppt.DECK, data, master=master, spill=True) == serial
+    assert _build(generate_ppt.DECK, data, master=master, spill=str(tmp_path)) == serial
+
+
+def test_path_output_matches_file_object(tmp_path):
+    data = generate_ppt.deck_data()
+    path = tmp_path / "deck.pptx"
+    write_deck(generate_ppt.DECK, data, str(path))
+    assert path.read_bytes() == _build(generate_ppt.DECK, data)
+    assert [p.name for p in tmp_path.iterdir()] == ["deck.pptx"]
+
+
+def test_failed_build_keeps_previous_deck(tmp_path):
+    path = tmp_path / "deck.pptx"
+    path.write_bytes(b"previous")
+    with pytest.raises(KeyError):
+        write_deck(generate_ppt.DECK, {}, str(path))
+    assert path.read_bytes() == b"previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["deck.pptx"]